@@ -0,0 +1,6 @@
+"""pytest 설정
+
+test_page_structure.py는 실제 사이트를 브라우저로 여는 수동 확인 스크립트이므로 수집하지 않습니다.
+"""
+
+collect_ignore = ['test_page_structure.py', 'venv']
@@ -0,0 +1,433 @@
+"""
+K-Startup 공고 비동기 크롤링 모듈
+playwright.async_api 기반의 페이지 풀로 상세 페이지를 동시에 수집합니다.
+"""
+
+import asyncio
+from collections import Counter
+from typing import List, Dict, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from kstartup_attachments import AttachmentDownloader
+from kstartup_browser import connect_or_launch_async
+from kstartup_capture import default_capture
+from kstartup_crawl import (
+    DEFAULT_CATEGORIES,
+    USER_AGENT,
+    ListPager,
+    build_list_url,
+    links_from_records,
+    make_error_record,
+    mark_duplicates,
+)
+from kstartup_extract import (
+    extract_detail_async,
+    extract_list_async,
+    extract_page_count_async,
+    install_extractor_async,
+)
+from kstartup_http import HttpClient, fetch_detail_http
+from kstartup_metrics import default_metrics
+from kstartup_readiness import wait_until_ready_async
+from kstartup_recycle import RecyclePolicy, default_recycling, is_crash_error
+from kstartup_record import Announcement, scraped_at_now
+from kstartup_resources import ResourcePolicy
+from kstartup_sink import JsonlSink
+from kstartup_state import CrawlState
+from kstartup_throttle import default_scheduler
+
+
+class PagePool:
+    """상세 페이지 수집에 사용할 페이지를 빌려주고 돌려받는 풀
+
+    컨텍스트마다 이동 횟수를 세어 RecyclePolicy의 한도에 이르거나 브라우저 메모리가 한도를
+    넘으면 그 컨텍스트를 은퇴시킵니다. 은퇴한 컨텍스트와 렌더러가 죽은 페이지는 반납될 때
+    닫히고, 새 컨텍스트의 페이지가 대신 풀에 들어갑니다.
+    """
+
+    def __init__(self, browser, size: int = 4, pages_per_context: int = 4,
+                 resource_policy: Optional[ResourcePolicy] = None,
+                 policy: Optional[RecyclePolicy] = None):
+        """
+        Args:
+            browser: 실행 중인 Playwright 브라우저
+            size: 동시에 사용할 페이지 수 (동시성 한도)
+            pages_per_context: 컨텍스트 하나에 만들 페이지 수
+            resource_policy: 각 컨텍스트에 적용할 리소스 차단 정책
+            policy: 컨텍스트 재활용 정책 (기본값: default_recycling)
+        """
+        self.browser = browser
+        self.size = max(1, size)
+        self.pages_per_context = max(1, pages_per_context)
+        self.resource_policy = resource_policy
+        self.policy = policy or default_recycling
+        self.contexts = []
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._context_of: Dict = {}
+        self._navigations: Dict = {}
+        self._retiring = set()
+        self._crashed = set()
+        self._replacing = set()
+
+    async def _new_context(self):
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        if self.resource_policy:
+            await self.resource_policy.install_async(context)
+        await install_extractor_async(context)
+        default_capture.install(context)
+        self.contexts.append(context)
+        self._navigations[context] = 0
+        return context
+
+    async def _add_page(self):
+        """자리가 남은 (은퇴하지 않은) 컨텍스트에, 없으면 새 컨텍스트에 페이지를 만들어 풀에 넣습니다"""
+        pages = Counter(self._context_of.values())
+        context = next(
+            (c for c in self.contexts if c not in self._retiring and pages[c] < self.pages_per_context), None
+        )
+        if context is None:
+            context = await self._new_context()
+        page = await context.new_page()
+        page.on('crash', self._crashed.add)
+        self._context_of[page] = context
+        self._queue.put_nowait(page)
+
+    async def open(self):
+        """풀에 필요한 컨텍스트와 페이지를 미리 만듭니다"""
+        for _ in range(self.size):
+            await self._add_page()
+
+    async def acquire(self):
+        page = await self._queue.get()
+        if isinstance(page, Exception):
+            raise page
+        return page
+
+    def release(self, page):
+        context = self._context_of.get(page)
+        if page in self._crashed or context in self._retiring:
+            # 닫고 새로 만드는 동안 다른 작업은 나머지 페이지를 사용
+            task = asyncio.get_running_loop().create_task(self._replace(page))
+            self._replacing.add(task)
+            task.add_done_callback(self._replacing.discard)
+        else:
+            self._queue.put_nowait(page)
+
+    def _retire(self, context, reason: str):
+        if context is not None and context not in self._retiring:
+            self._retiring.add(context)
+            self.policy.record(reason)
+
+    async def _replace(self, page):
+        context = self._context_of.pop(page, None)
+        self._crashed.discard(page)
+        default_capture.reset(page)
+        try:
+            await page.close()
+            # 은퇴한 컨텍스트의 마지막 페이지였으면 컨텍스트도 닫음
+            if context in self._retiring and context not in self._context_of.values():
+                self._retiring.discard(context)
+                self._navigations.pop(context, None)
+                self.contexts.remove(context)
+                await context.close()
+        except Exception as e:
+            print(f"  컨텍스트 종료 중 오류 (무시): {e}")
+        try:
+            await self._add_page()
+        except Exception as e:
+            # 기다리는 쪽이 멈추지 않도록 예외를 대신 넣어 둠
+            self._queue.put_nowait(e)
+
+    async def _before_navigation(self, page):
+        context = self._context_of.get(page)
+        self._navigations[context] = self._navigations.get(context, 0) + 1
+        if self.policy.navigation_limit_reached(self._navigations[context]):
+            self._retire(context, 'navigations')
+        if await self.policy.memory_exceeded_async(self.browser):
+            # 지금 쓰고 있는 컨텍스트를 모두 반납되는 대로 교체
+            for live in list(self.contexts):
+                self._retire(live, 'memory')
+
+    async def run(self, func, *args):
+        """페이지를 빌려 await func(page, *args)를 실행하고 돌려줍니다
+
+        실행 중 렌더러가 죽으면 그 페이지를 교체하고 다른 페이지에서 같은 인자(같은 URL)로
+        한 번 더 실행합니다.
+        """
+        for attempt in (1, 2):
+            page = await self.acquire()
+            try:
+                await self._before_navigation(page)
+                result = await func(page, *args)
+            except Exception as e:
+                if attempt == 2 or not (page in self._crashed or is_crash_error(e)):
+                    raise
+                self._crashed.add(page)
+            else:
+                if attempt == 2 or page not in self._crashed:
+                    return result
+            finally:
+                if page in self._crashed:
+                    # 같은 렌더러를 쓰는 나머지 페이지도 믿을 수 없으므로 컨텍스트째 교체
+                    self.policy.record('crash')
+                    self._retiring.add(self._context_of.get(page))
+                self.release(page)
+            print("  브라우저 페이지가 비정상 종료되어 다른 페이지에서 다시 시도합니다...")
+
+    async def close(self):
+        if self._replacing:
+            await asyncio.gather(*self._replacing, return_exceptions=True)
+        for context in self.contexts:
+            await context.close()
+        self.contexts = []
+
+
+async def scrape_announcement_detail_async(page, url: str) -> Announcement:
+    """공고 상세 페이지에서 정보를 추출합니다 (비동기)"""
+    try:
+        default_capture.reset(page)
+        with default_metrics.time('navigate', 'detail'):
+            await default_scheduler.navigate_async(page, url, wait_until='domcontentloaded', timeout=30000)
+
+        records = await default_capture.take_async(page)
+        detail = default_capture.detail_record(records, url)
+        if detail is None:
+            with default_metrics.time('wait', 'detail'):
+                await wait_until_ready_async(page, 'detail')
+            records += await default_capture.take_async(page)
+            detail = default_capture.detail_record(records, url)
+
+        if detail is None:
+            default_capture.record_fallback('detail')
+            with default_metrics.time('extract', 'detail'):
+                detail = await extract_detail_async(page)
+            detail.url = url
+            detail.scraped_at = scraped_at_now()
+        default_metrics.increment('pages', page_type='detail', result='ok')
+
+        return detail
+
+    except Exception as e:
+        print(f"  상세 정보 추출 실패: {e}")
+        default_metrics.increment('pages', page_type='detail', result='error')
+        return make_error_record(url, e)
+
+
+async def collect_list_links_async(page, page_num: int, pbanc_clss_cd: str) -> List[Dict]:
+    """목록 페이지 하나에서 공고 링크를 수집합니다 (비동기)"""
+    try:
+        default_capture.reset(page)
+        with default_metrics.time('navigate', 'list'):
+            await default_scheduler.navigate_async(
+                page, build_list_url(page_num, pbanc_clss_cd), wait_until='domcontentloaded', timeout=30000
+            )
+        # 배경 요청으로 받은 공고 목록 JSON이 이 페이지/분류 코드의 목록이면 그대로 사용
+        matched, other = await default_capture.take_list_async(page, page_num, pbanc_clss_cd)
+        records = default_capture.list_records(matched)
+        if records is None:
+            with default_metrics.time('wait', 'list'):
+                await wait_until_ready_async(page, 'list')
+            more_matched, more_other = await default_capture.take_list_async(page, page_num, pbanc_clss_cd)
+            matched, other = matched + more_matched, other + more_other
+            records = default_capture.list_records(matched)
+
+        if records is not None:
+            links = links_from_records(records)
+        else:
+            with default_metrics.time('extract', 'list'):
+                links = await extract_list_async(page)
+            # 조건을 확인할 수 없는 응답은 DOM과 같은 공고들일 때만 사용 (위젯 응답 등은 버림)
+            confirmed = default_capture.confirm_list(other, links)
+            if confirmed is not None:
+                links = links_from_records(confirmed)
+            else:
+                default_capture.record_fallback('list')
+    except Exception:
+        default_metrics.increment('pages', page_type='list', result='error')
+        raise
+    default_metrics.increment('pages', page_type='list', result='ok')
+    return links
+
+
+async def collect_list_page_async(page, page_num: int, pbanc_clss_cd: str) -> Tuple[List[Dict], Optional[int]]:
+    """목록 페이지 하나의 공고 링크와 페이저의 마지막 페이지 번호를 수집합니다 (비동기)"""
+    links = await collect_list_links_async(page, page_num, pbanc_clss_cd)
+    try:
+        page_count = await extract_page_count_async(page)
+    except Exception as e:
+        print(f"  페이지 번호를 읽지 못했습니다: {e}")
+        page_count = None
+    return links, page_count
+
+
+async def scrape_details_concurrently(pool: PagePool, links: List[Dict],
+                                      http_client: Optional[HttpClient] = None,
+                                      crawl_state: Optional[CrawlState] = None,
+                                      sink: Optional[JsonlSink] = None,
+                                      positions: Optional[List[Tuple[int, int, int]]] = None,
+                                      downloader: Optional[AttachmentDownloader] = None) -> List[Dict]:
+    """페이지 풀을 사용해 상세 정보를 동시에 수집합니다
+
+    결과는 links와 같은 순서로 반환되며, 한 URL의 실패는 해당 항목의
+    error 기록으로만 남습니다. http_client가 주어지면 HTTP 수집을 먼저 시도하고
+    필드가 부족할 때만 페이지를 빌립니다. crawl_state에 최신 결과가 있는
+    공고는 방문하지 않습니다.
+
+    sink가 주어지면 앞선 공고가 모두 끝난 결과부터 links 순서대로 바로 기록하고
+    빈 리스트를 반환합니다. positions는 각 링크의 (목록 페이지, 페이지 내 순번, 분류 코드 순번)입니다.
+    positions와 crawl_state가 함께 주어지면 목록 페이지 하나의 공고가 모두 끝날 때마다
+    순차 크롤러처럼 상태를 저장합니다.
+    downloader가 주어지면 수집한 공고의 첨부파일을 받기 시작합니다.
+    """
+    total = len(links)
+    http_slots = asyncio.Semaphore(http_client.max_connections) if http_client else None
+    cached = crawl_state.prefill(links) if crawl_state else [None] * total
+
+    # 체크포인트가 순서대로 전진하도록, 앞쪽이 모두 끝난 결과만 기록
+    ready: Dict[int, Dict] = {}
+    next_index = 0
+
+    def emit(index: int, record: Dict) -> Optional[Dict]:
+        nonlocal next_index
+        if not sink:
+            return record
+        ready[index] = record
+        while next_index in ready:
+            sink.write(ready.pop(next_index), *positions[next_index])
+            next_index += 1
+        return None
+
+    # 목록 페이지별로 남은 공고 수 (중단되어도 끝난 페이지의 상태는 남도록)
+    pending = Counter((category, page_num) for page_num, _, category in positions) \
+        if crawl_state and positions else Counter()
+
+    def settle(index: int) -> None:
+        if not pending:
+            return
+        page_num, _, category = positions[index]
+        pending[(category, page_num)] -= 1
+        if pending[(category, page_num)] == 0:
+            crawl_state.save()
+
+    async def fetch(index: int, link_info: Dict) -> Dict:
+        if cached[index - 1] is not None:
+            print(f"  [{index}/{total}] {link_info['title'][:50]}... (이미 수집됨)")
+            if downloader:
+                await asyncio.to_thread(downloader.submit, cached[index - 1])
+            settle(index - 1)
+            return emit(index - 1, cached[index - 1])
+
+        # 목록 응답에 상세 필드까지 있었으면 방문하지 않음
+        detail = link_info.get('detail')
+        if detail is None and http_client:
+            async with http_slots:
+                detail = await asyncio.to_thread(fetch_detail_http, http_client, link_info['url'])
+            if detail is not None:
+                print(f"  [{index}/{total}] {link_info['title'][:50]}... (HTTP)")
+
+        if detail is None:
+            print(f"  [{index}/{total}] {link_info['title'][:50]}...")
+            detail = await pool.run(scrape_announcement_detail_async, link_info['url'])
+
+        detail['pbanc_sn'] = link_info.get('pbanc_sn')
+        if crawl_state:
+            crawl_state.update(detail['pbanc_sn'], detail)
+        if downloader:
+            # 대기 작업이 많으면 자리가 날 때까지 기다리므로 이벤트 루프 밖에서 호출
+            await asyncio.to_thread(downloader.submit, detail)
+        settle(index - 1)
+        return emit(index - 1, detail)
+
+    results = await asyncio.gather(*(fetch(i, link) for i, link in enumerate(links, 1)))
+    return [] if sink else results
+
+
+async def scrape_announcements_from_pages_async(start_page: int = 1, end_page: Optional[int] = None,
+                                                pbanc_clss_cds: Optional[List[str]] = None,
+                                                concurrency: int = 8,
+                                                resource_policy: Optional[ResourcePolicy] = None,
+                                                http_client: Optional[HttpClient] = None,
+                                                crawl_state: Optional[CrawlState] = None,
+                                                sink: Optional[JsonlSink] = None,
+                                                downloader: Optional[AttachmentDownloader] = None) -> List[Dict]:
+    """여러 분류 코드의 목록 페이지에서 공고를 모으고 상세 정보는 동시에 가져옵니다
+
+    목록 범위와 중복 제거는 순차 크롤러(scrape_announcements_from_pages)와 같습니다.
+    """
+    all_links = []
+    positions = []
+    all_announcements = []
+    pbanc_clss_cds = pbanc_clss_cds or DEFAULT_CATEGORIES
+    resource_policy = resource_policy or ResourcePolicy()
+    seen = sink.recorded_keys() if sink else set()
+
+    async with async_playwright() as p:
+        browser = await connect_or_launch_async(p)
+        pool = PagePool(browser, size=concurrency, resource_policy=resource_policy)
+
+        try:
+            await pool.open()
+            for category, pbanc_clss_cd in enumerate(pbanc_clss_cds):
+                if sink and sink.skips_category(category):
+                    continue
+                pager = ListPager(sink.resume_page(start_page, category) if sink else start_page, end_page)
+                for page_num in pager.pages():
+                    print(f"\n[{pbanc_clss_cd}] 페이지 {pager.label(page_num)} 크롤링 중...")
+                    try:
+                        links, page_count = await pool.run(collect_list_page_async, page_num, pbanc_clss_cd)
+                    except Exception as e:
+                        print(f"페이지 {page_num} 처리 중 오류: {e}")
+                        if crawl_state:
+                            crawl_state.mark_list_error()
+                        continue
+                    pager.update(page_num, links, page_count)
+
+                    print(f"  발견된 공고: {len(links)}개")
+                    if crawl_state:
+                        crawl_state.mark_listed(links)
+                    # 이어서 실행하는 경우 체크포인트 이전 공고와 다른 분류 코드에서 이미 나온 공고는 건너뜀
+                    duplicates = mark_duplicates(links, seen)
+                    for i, link_info in enumerate(links):
+                        if i in duplicates or (sink and sink.should_skip(page_num, i, category)):
+                            continue
+                        all_links.append(link_info)
+                        positions.append((page_num, i, category))
+                    if duplicates:
+                        print(f"  다른 분류에서 이미 나온 공고 {len(duplicates)}개는 건너뜁니다.")
+                    if crawl_state and crawl_state.all_known(links):
+                        print("  목록의 공고가 모두 이미 수집된 공고입니다. 이 분류 코드의 페이징을 중단합니다.")
+                        break
+
+                if crawl_state and pager.exhausted:
+                    crawl_state.mark_list_end(pbanc_clss_cd)
+
+            print(f"\n상세 정보 동시 수집 중 (동시성 {pool.size})...")
+            all_announcements = await scrape_details_concurrently(
+                pool, all_links, http_client, crawl_state, sink, positions, downloader
+            )
+            if crawl_state:
+                crawl_state.save()
+
+        except Exception as e:
+            print(f"크롤링 중 오류 발생: {e}")
+        finally:
+            await pool.close()
+            await browser.close()
+
+    return all_announcements
+
+
+def scrape_announcements_concurrently(start_page: int = 1, end_page: Optional[int] = None,
+                                      pbanc_clss_cds: Optional[List[str]] = None,
+                                      concurrency: int = 8,
+                                      resource_policy: Optional[ResourcePolicy] = None,
+                                      http_client: Optional[HttpClient] = None,
+                                      crawl_state: Optional[CrawlState] = None,
+                                      sink: Optional[JsonlSink] = None,
+                                      downloader: Optional[AttachmentDownloader] = None) -> List[Dict]:
+    """비동기 크롤러를 동기 코드에서 호출하기 위한 진입점"""
+    return asyncio.run(scrape_announcements_from_pages_async(
+        start_page, end_page, pbanc_clss_cds, concurrency, resource_policy, http_client, crawl_state, sink,
+        downloader
+    ))
@@ -0,0 +1,346 @@
+"""
+K-Startup 공고 첨부파일 다운로드 모듈
+상세 페이지에서 찾은 첨부파일(공고문 PDF/HWP 등)을 스레드 풀로 동시에 받습니다.
+
+- 파일은 청크 단위로 디스크에 바로 쓰고 SHA-256을 함께 계산하므로 파일 크기와 관계없이
+  메모리 사용량이 일정합니다.
+- 받다 만 파일은 <디렉터리>/.partial/에 남고, 다음 시도에서 Range 요청으로 이어 받습니다.
+- 요청 스케줄러(kstartup_throttle.py)는 요청을 보내고 응답 헤더를 받는 데까지만 거치므로,
+  큰 파일을 받는 동안에도 페이지 이동의 동시 요청 한도와 응답 시간 기준에 영향을 주지 않습니다.
+- 내용이 같은 파일은 <디렉터리>/store/<해시 앞 2자리>/<해시>.<확장자>에 한 번만 저장하고,
+  공고별 디렉터리(<디렉터리>/<pbanc_sn>/)에는 하드 링크를 만듭니다.
+- 이미 받은 URL은 manifest.json을 보고 다시 받지 않습니다 (manifest.json은 다운로드 도중에도
+  주기적으로 저장).
+
+사용 예:
+    python kstartup_attachments.py kstartup_all.jsonl --directory attachments --workers 4
+"""
+
+import argparse
+import hashlib
+import http.client
+import json
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from kstartup_http import HttpStatusError
+from kstartup_metrics import default_metrics
+from kstartup_throttle import default_scheduler
+
+
+CHUNK_SIZE = 64 * 1024
+MAX_REDIRECTS = 3
+# 본문 전송이 끊겼을 때 이어받기를 시도할 횟수
+MAX_RESUMES = 3
+# 이만큼 새로 기록할 때마다 manifest.json을 저장 (중간에 죽어도 중복 제거 정보를 잃지 않게)
+MANIFEST_SAVE_EVERY = 10
+
+FILENAME_STAR = re.compile(r"filename\*\s*=\s*([^']*)'[^']*'([^;]+)", re.I)
+FILENAME_PLAIN = re.compile(r'filename\s*=\s*"?([^";]+)"?', re.I)
+UNSAFE_CHARS = re.compile(r'[\\/:*?"<>|\x00-\x1f]')
+
+
+def _safe_name(name: str, fallback: str = 'attachment') -> str:
+    name = UNSAFE_CHARS.sub('_', name).strip(' .')
+    return name[:150] or fallback
+
+
+def _filename_from_headers(headers: Dict[str, str]) -> Optional[str]:
+    """Content-Disposition의 파일 이름 (RFC 5987 filename* 우선)"""
+    disposition = headers.get('content-disposition') or ''
+    match = FILENAME_STAR.search(disposition)
+    if match:
+        return unquote(match.group(2).strip(), encoding=match.group(1) or 'utf-8', errors='replace')
+    match = FILENAME_PLAIN.search(disposition)
+    if not match:
+        return None
+    raw = match.group(1).strip()
+    # 서버가 UTF-8 바이트를 latin-1 헤더로 보내는 경우가 많음
+    try:
+        return unquote(raw.encode('latin-1').decode('utf-8'))
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return unquote(raw)
+
+
+def _extension(name: str) -> str:
+    _, ext = os.path.splitext(name)
+    return ext.lower() if 1 < len(ext) <= 6 else ''
+
+
+class IncompleteDownload(ConnectionError):
+    """Content-Length만큼 받지 못함 (받은 부분은 남겨 두고 다시 시도)"""
+
+
+class AttachmentDownloader:
+    """첨부파일을 동시에 받아 내용 해시로 중복을 없애는 다운로더 (스레드 안전)"""
+
+    def __init__(self, directory: str = 'attachments', max_workers: int = 4,
+                 chunk_size: int = CHUNK_SIZE, timeout: float = 30.0,
+                 user_agent: str = 'Mozilla/5.0'):
+        """
+        Args:
+            directory: 저장 디렉터리
+            max_workers: 동시에 받을 파일 수
+            chunk_size: 한 번에 읽고 쓸 바이트 수
+            timeout: 연결/응답 타임아웃 (초)
+            user_agent: 요청에 사용할 User-Agent
+        """
+        self.directory = directory
+        self.max_workers = max(1, max_workers)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.partial_dir = os.path.join(directory, '.partial')
+        self.store_dir = os.path.join(directory, 'store')
+        self.manifest_path = os.path.join(directory, 'manifest.json')
+        os.makedirs(self.partial_dir, exist_ok=True)
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._manifest = self._load_manifest()
+        self._unsaved = 0
+        self._queued = set()
+        # 같은 URL을 두 공고가 동시에 받지 않도록 URL별 잠금
+        self._url_locks: Dict[str, threading.Lock] = {}
+        # 대기 중인 작업 수를 제한해 공고가 아무리 많아도 큐가 커지지 않게 함
+        self._slots = threading.BoundedSemaphore(self.max_workers * 2)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='attachment')
+        self.stats = {'downloaded': 0, 'deduplicated': 0, 'cached': 0, 'failed': 0, 'bytes': 0}
+
+    def _load_manifest(self) -> Dict:
+        manifest = {'files': {}, 'urls': {}}
+        if os.path.exists(self.manifest_path):
+            try:
+                with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                    manifest.update(json.load(f))
+            except (OSError, ValueError):
+                pass
+        return manifest
+
+    def _save_manifest(self):
+        with self._save_lock:
+            with self._lock:
+                data = json.dumps(self._manifest, ensure_ascii=False, indent=2)
+                self._unsaved = 0
+            tmp_path = self.manifest_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(tmp_path, self.manifest_path)
+
+    def submit(self, record: Dict):
+        """공고의 첨부파일을 다운로드 큐에 넣습니다 (대기 작업이 많으면 자리가 날 때까지 기다림)"""
+        pbanc_sn = str(record.get('pbanc_sn') or 'unknown')
+        for attachment in record.get('attachments') or []:
+            url = attachment.get('url')
+            if not url:
+                continue
+            key = (pbanc_sn, url)
+            with self._lock:
+                if key in self._queued:
+                    continue
+                self._queued.add(key)
+            self._slots.acquire()
+            future = self._executor.submit(self._download, pbanc_sn, url, attachment.get('name') or '')
+            future.add_done_callback(lambda _: self._slots.release())
+
+    def _open(self, url: str, offset: int) -> Tuple[http.client.HTTPConnection, http.client.HTTPResponse]:
+        """응답 본문을 읽기 전 상태의 연결과 응답을 돌려줍니다 (리다이렉트는 따라감)"""
+        for _ in range(MAX_REDIRECTS + 1):
+            parts = urlsplit(url)
+            connection_class = http.client.HTTPSConnection if parts.scheme == 'https' else http.client.HTTPConnection
+            conn = connection_class(parts.hostname, parts.port, timeout=self.timeout)
+            path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+            headers = {'User-Agent': self.user_agent, 'Accept': '*/*', 'Accept-Encoding': 'identity'}
+            if offset:
+                headers['Range'] = f'bytes={offset}-'
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+            except Exception:
+                conn.close()
+                raise
+            if response.status == 416 and offset:
+                # .part가 이미 끝까지 받은 파일이거나 서버 파일이 바뀜 - 처음부터 다시 받음
+                conn.close()
+                offset = 0
+                continue
+            location = response.getheader('location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                conn.close()
+                url = urljoin(url, location)
+                continue
+            if response.status not in (200, 206):
+                conn.close()
+                raise HttpStatusError(response.status, url)
+            return conn, response
+        raise http.client.HTTPException(f"리다이렉트가 너무 많습니다: {url}")
+
+    def _hash_file(self, path: str):
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(self.chunk_size), b''):
+                digest.update(chunk)
+        return digest
+
+    def _fetch(self, url: str, part_path: str) -> Tuple[str, int, Optional[str]]:
+        """URL을 part_path로 받습니다 (이어받기 지원)
+
+        Returns:
+            (SHA-256, 파일 크기, 응답 헤더의 파일 이름)
+        """
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        # 요청을 보내고 응답 헤더를 받는 데까지만 스케줄러를 거침 (본문 전송은 동시성 한도와
+        # 응답 시간 기준, 서킷 브레이커에 반영하지 않음)
+        conn, response = default_scheduler.call(self._open, url, offset)
+        try:
+            content_range = response.getheader('content-range') or ''
+            if offset and response.status == 206 and content_range.startswith(f'bytes {offset}-'):
+                mode, digest = 'ab', self._hash_file(part_path)
+            else:
+                # 서버가 Range를 무시했으면 처음부터 받음
+                mode, digest, offset = 'wb', hashlib.sha256(), 0
+
+            expected = response.getheader('content-length')
+            received = 0
+            with open(part_path, mode) as f:
+                while True:
+                    try:
+                        chunk = response.read(self.chunk_size)
+                    except http.client.IncompleteRead as e:
+                        raise IncompleteDownload(f"연결이 끊겼습니다: {url}") from e
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    digest.update(chunk)
+                    received += len(chunk)
+            with self._lock:
+                self.stats['bytes'] += received
+            default_metrics.increment('attachment_bytes', received)
+            if expected and expected.isdigit() and received < int(expected):
+                raise IncompleteDownload(f"{received}/{expected}바이트만 받았습니다: {url}")
+            return digest.hexdigest(), offset + received, _filename_from_headers(
+                {k.lower(): v for k, v in response.getheaders()}
+            )
+        finally:
+            conn.close()
+
+    def _fetch_resuming(self, url: str, part_path: str) -> Tuple[str, int, Optional[str]]:
+        """전송 도중 연결이 끊기면 받은 부분부터 이어서 다시 받습니다 (최대 MAX_RESUMES번)"""
+        for attempt in range(MAX_RESUMES + 1):
+            try:
+                return self._fetch(url, part_path)
+            except IncompleteDownload as e:
+                if attempt >= MAX_RESUMES:
+                    raise
+                print(f"  첨부파일 전송이 끊겨 이어서 받습니다 ({attempt + 1}/{MAX_RESUMES}): {e}")
+
+    def _link(self, stored_path: str, pbanc_sn: str, name: str):
+        """공고별 디렉터리에 저장본의 하드 링크를 만듭니다 (지원하지 않는 파일 시스템이면 건너뜀)"""
+        target_dir = os.path.join(self.directory, _safe_name(pbanc_sn))
+        target = os.path.join(target_dir, _safe_name(name))
+        if os.path.exists(target):
+            return
+        os.makedirs(target_dir, exist_ok=True)
+        try:
+            os.link(stored_path, target)
+        except OSError:
+            pass
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._url_locks.setdefault(url, threading.Lock())
+
+    def _download(self, pbanc_sn: str, url: str, name: str):
+        with self._url_lock(url):
+            self._download_locked(pbanc_sn, url, name)
+
+    def _download_locked(self, pbanc_sn: str, url: str, name: str):
+        try:
+            with self._lock:
+                digest = self._manifest['urls'].get(url)
+                entry = self._manifest['files'].get(digest) if digest else None
+            if entry and os.path.exists(entry['path']):
+                self._count('cached')
+                self._link(entry['path'], pbanc_sn, entry['name'])
+                return
+
+            part_path = os.path.join(self.partial_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.part')
+            with default_metrics.time('fetch', 'attachment'):
+                digest, size, header_name = self._fetch_resuming(url, part_path)
+            name = _safe_name(header_name or name or os.path.basename(urlsplit(url).path))
+
+            with self._lock:
+                # 확장자가 달라도 내용이 같으면 기존 저장본을 그대로 씀
+                existing = self._manifest['files'].get(digest)
+                duplicate = bool(existing) and os.path.exists(existing['path'])
+                if duplicate:
+                    stored_path = existing['path']
+                else:
+                    stored_path = os.path.join(self.store_dir, digest[:2], digest + _extension(name))
+                    os.makedirs(os.path.dirname(stored_path), exist_ok=True)
+                    os.replace(part_path, stored_path)
+                    self._manifest['files'][digest] = {'path': stored_path, 'name': name, 'size': size}
+                self._manifest['urls'][url] = digest
+                self._unsaved += 1
+                save = self._unsaved >= MANIFEST_SAVE_EVERY
+            if duplicate:
+                os.remove(part_path)
+            if save:
+                self._save_manifest()
+            self._count('deduplicated' if duplicate else 'downloaded')
+            self._link(stored_path, pbanc_sn, name)
+        except Exception as e:
+            print(f"  첨부파일 다운로드 실패 ({pbanc_sn}): {url} - {e}")
+            self._count('failed')
+
+    def _count(self, result: str):
+        with self._lock:
+            self.stats[result] += 1
+        default_metrics.increment('attachments', result=result)
+
+    def close(self):
+        """남은 다운로드를 기다린 뒤 manifest.json을 저장합니다"""
+        self._executor.shutdown(wait=True)
+        self._save_manifest()
+
+    def print_summary(self):
+        stats = self.stats
+        if not any(stats[key] for key in ('downloaded', 'deduplicated', 'cached', 'failed')):
+            return
+        print(f"\n첨부파일: 새로 받음 {stats['downloaded']}개, 중복 {stats['deduplicated']}개, "
+              f"이미 받음 {stats['cached']}개, 실패 {stats['failed']}개 "
+              f"({stats['bytes'] / 1_000_000:.1f}MB, {self.directory})")
+
+
+def download_all(records: Iterable[Dict], directory: str = 'attachments', max_workers: int = 4,
+                 user_agent: str = 'Mozilla/5.0') -> Dict[str, int]:
+    """저장된 공고들의 첨부파일을 받습니다"""
+    downloader = AttachmentDownloader(directory, max_workers, user_agent=user_agent)
+    try:
+        for record in records:
+            downloader.submit(record)
+    finally:
+        downloader.close()
+    downloader.print_summary()
+    return downloader.stats
+
+
+def main():
+    from kstartup_sink import iter_jsonl
+
+    parser = argparse.ArgumentParser(description='K-Startup 공고 첨부파일 다운로드')
+    parser.add_argument('source', help='첨부파일 목록이 들어 있는 공고 JSONL 파일 (예: kstartup_all.jsonl)')
+    parser.add_argument('--directory', default='attachments', help='저장 디렉터리 (기본값: attachments)')
+    parser.add_argument('--workers', type=int, default=4, help='동시에 받을 파일 수 (기본값: 4)')
+    args = parser.parse_args()
+
+    download_all(iter_jsonl(args.source), args.directory, args.workers)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""
+K-Startup 크롤러 벤치마크
+로컬 가상 사이트(kstartup_fixture_server.SyntheticSite)를 띄우고 크롤링 방식별로
+처리량(페이지/초), 단계별 지연 시간 백분위수, 최대 메모리(RSS), 브라우저 CPU 시간을 측정합니다.
+실제 사이트의 응답 편차 없이 같은 조건에서 반복해 비교할 수 있습니다.
+
+각 방식은 별도 프로세스에서 실행하므로 메모리와 CPU 측정이 서로 섞이지 않습니다.
+
+사용 예:
+    python kstartup_benchmark.py --announcements 3000 --pages 10 --latency-ms 50 --jitter-ms 30
+    python kstartup_benchmark.py --modes browser,http --error-rate 0.02 --output bench.json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+from kstartup_browser import ATTACH_ENV
+from kstartup_fixture_server import SyntheticSite, start_synthetic_server
+from kstartup_metrics import default_metrics, percentiles
+
+
+# 측정할 크롤링 방식
+MODES = ['browser', 'http', 'async', 'sharded']
+
+# 하위 프로세스가 결과를 출력할 때 붙이는 표식
+RESULT_MARKER = 'KSTARTUP_BENCHMARK_RESULT '
+
+
+class StageTimer:
+    """크롤러 단계 함수를 감싸 호출마다 걸린 시간을 모으는 기록기"""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {}
+
+    def wrap(self, stage: str, func: Callable) -> Callable:
+        samples = self.samples.setdefault(stage, [])
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def wrap_async(self, stage: str, func: Callable) -> Callable:
+        samples = self.samples.setdefault(stage, [])
+
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                samples.append((time.perf_counter() - start) * 1000)
+        return timed
+
+    def summary(self) -> Dict[str, Dict]:
+        return {stage: percentiles(values) for stage, values in self.samples.items() if values}
+
+
+def _usage() -> Dict[str, Optional[float]]:
+    """이 프로세스와 (종료된) 하위 프로세스의 최대 RSS(MB)와 CPU 시간(초)"""
+    if resource is None:
+        return {'peak_rss_mb': None, 'cpu_s': None, 'browser_peak_rss_mb': None, 'browser_cpu_s': None}
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    # Linux의 ru_maxrss는 KB, macOS는 바이트
+    scale = 1024 * 1024 if sys.platform == 'darwin' else 1024
+    return {
+        'peak_rss_mb': round(own.ru_maxrss / scale, 1),
+        'cpu_s': round(own.ru_utime + own.ru_stime, 2),
+        # 하위 프로세스(Playwright 드라이버, Chromium, 분산 워커)는 가장 큰 프로세스의 RSS
+        'browser_peak_rss_mb': round(children.ru_maxrss / scale, 1),
+        'browser_cpu_s': round(children.ru_utime + children.ru_stime, 2),
+    }
+
+
+def run_mode(mode: str, pages: int, concurrency: int, processes: int, http_workers: int,
+             rate: float = 0.0) -> Dict:
+    """크롤링 방식 하나를 이 프로세스에서 실행하고 측정값을 돌려줍니다
+
+    KSTARTUP_BASE_URL 환경 변수가 가상 사이트를 가리키고 있어야 합니다.
+    rate가 0이면 스케줄러의 초당 요청 제한을 끄고 동시 요청 한도를 처음부터 최대로 두어,
+    방식 사이의 차이가 요청 제한에 가려지지 않게 합니다.
+    """
+    import kstartup_crawl
+    import kstartup_http
+    import scrape_kstartup_filtered as scraper
+    from kstartup_resources import ResourcePolicy
+    from kstartup_throttle import default_scheduler
+
+    max_concurrency = max(concurrency, http_workers)
+    default_scheduler.configure(
+        rate=rate, burst=max(1, int(rate)), initial_concurrency=max_concurrency if not rate else 2,
+        max_concurrency=max_concurrency,
+    )
+
+    timer = StageTimer()
+    # collect_list_page는 kstartup_crawl 안에서 collect_list_links를 부르고, 순차 경로는
+    # scrape_announcement_detail을 스크립트에 가져온 이름으로 부름
+    kstartup_crawl.collect_list_links = timer.wrap('list', kstartup_crawl.collect_list_links)
+    scraper.scrape_announcement_detail = timer.wrap('detail_browser', kstartup_crawl.scrape_announcement_detail)
+    kstartup_http.fetch_detail_http = timer.wrap('detail_http', kstartup_http.fetch_detail_http)
+
+    # 기본 허용 호스트에 KSTARTUP_BASE_URL(가상 사이트)의 호스트가 들어 있음
+    resource_policy = ResourcePolicy()
+
+    start = time.perf_counter()
+    if mode == 'async':
+        import kstartup_async
+        kstartup_async.collect_list_links_async = timer.wrap_async('list', kstartup_async.collect_list_links_async)
+        kstartup_async.scrape_announcement_detail_async = timer.wrap_async(
+            'detail_browser', kstartup_async.scrape_announcement_detail_async
+        )
+        announcements = kstartup_async.scrape_announcements_concurrently(
+            start_page=1, end_page=pages, concurrency=concurrency, resource_policy=resource_policy
+        )
+    elif mode == 'sharded':
+        # 워커 프로세스 안의 단계 시간은 측정하지 않음
+        from kstartup_sharded import scrape_announcements_sharded
+        announcements = scrape_announcements_sharded(
+            start_page=1, end_page=pages, processes=processes, resource_policy=resource_policy,
+            scheduler_settings=default_scheduler.settings
+        )
+    elif mode == 'http':
+        client = kstartup_http.HttpClient(max_connections=http_workers)
+        try:
+            announcements = scraper.scrape_announcements_from_pages(
+                start_page=1, end_page=pages, resource_policy=resource_policy,
+                http_client=client, http_workers=http_workers
+            )
+        finally:
+            client.close()
+    else:
+        announcements = scraper.scrape_announcements_from_pages(
+            start_page=1, end_page=pages, resource_policy=resource_policy
+        )
+    elapsed = time.perf_counter() - start
+
+    errors = sum(1 for ann in announcements if ann.get('error'))
+    result = {
+        'mode': mode,
+        'announcements': len(announcements),
+        'errors': errors,
+        'list_pages': pages,
+        'elapsed_s': round(elapsed, 2),
+        'pages_per_s': round((pages + len(announcements)) / elapsed, 2) if elapsed else None,
+        'stages': timer.summary(),
+        # 크롤러 내부 계측 (이동/대기/추출 단계별)
+        'metrics': default_metrics.summary(),
+        'blocked_requests': resource_policy.blocked_requests,
+    }
+    result.update(_usage())
+    return result
+
+
+def benchmark_mode(mode: str, args: argparse.Namespace) -> Dict:
+    """가상 사이트를 새로 띄우고 하위 프로세스에서 방식 하나를 측정합니다"""
+    site = SyntheticSite(args.announcements, args.per_page, args.latency_ms, args.jitter_ms,
+                         args.error_rate, args.seed)
+    server = start_synthetic_server(site)
+    base_url = f'http://127.0.0.1:{server.server_address[1]}'
+    command = [
+        sys.executable, os.path.abspath(__file__), '--run-mode', mode,
+        '--pages', str(args.pages), '--concurrency', str(args.concurrency),
+        '--processes', str(args.processes), '--http-workers', str(args.http_workers),
+        '--rate', str(args.rate),
+    ]
+    env = dict(os.environ, KSTARTUP_BASE_URL=base_url, PYTHONUNBUFFERED='1', PYTHONIOENCODING='utf-8')
+    # 측정하는 프로세스가 브라우저를 직접 띄워야 브라우저 CPU/RSS가 하위 프로세스로 잡힘
+    env.pop(ATTACH_ENV, None)
+
+    print(f"\n[{mode}] 측정 중... ({base_url}, 목록 {args.pages}페이지)")
+    try:
+        completed = subprocess.run(
+            command, env=env, cwd=os.path.dirname(os.path.abspath(__file__)),
+            stdout=subprocess.PIPE, stderr=None if args.verbose else subprocess.DEVNULL,
+            text=True, encoding='utf-8', timeout=args.timeout
+        )
+    except subprocess.TimeoutExpired:
+        return {'mode': mode, 'error': f'{args.timeout}초 안에 끝나지 않았습니다'}
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    for line in completed.stdout.splitlines():
+        if args.verbose and not line.startswith(RESULT_MARKER):
+            print(f"  {line}")
+    results = [line[len(RESULT_MARKER):] for line in completed.stdout.splitlines()
+               if line.startswith(RESULT_MARKER)]
+    if not results:
+        return {'mode': mode, 'error': f'측정 결과가 없습니다 (종료 코드 {completed.returncode}, --verbose로 출력 확인)'}
+    return json.loads(results[-1])
+
+
+def _format_stage(stats: Optional[Dict]) -> str:
+    if not stats or not stats.get('count'):
+        return '-'
+    return f"{stats['p50']:.0f}/{stats['p90']:.0f}/{stats['p99']:.0f}"
+
+
+def print_report(results: List[Dict]):
+    print("\n" + "=" * 100)
+    print("벤치마크 결과 (단계 지연은 p50/p90/p99 ms)")
+    print("=" * 100)
+    print(f"{'방식':<8} {'공고':>6} {'오류':>5} {'시간(s)':>8} {'페이지/s':>9} "
+          f"{'list':>14} {'detail(browser)':>16} {'detail(http)':>14} "
+          f"{'RSS(MB)':>8} {'브라우저RSS':>11} {'CPU(s)':>7} {'브라우저CPU':>11}")
+    for r in results:
+        if r.get('error'):
+            print(f"{r['mode']:<8} 실패: {r['error']}")
+            continue
+        stages = r.get('stages', {})
+        print(f"{r['mode']:<8} {r['announcements']:>6} {r['errors']:>5} {r['elapsed_s']:>8} "
+              f"{r['pages_per_s']:>9} {_format_stage(stages.get('list')):>14} "
+              f"{_format_stage(stages.get('detail_browser')):>16} {_format_stage(stages.get('detail_http')):>14} "
+              f"{r['peak_rss_mb'] if r['peak_rss_mb'] is not None else '-':>8} "
+              f"{r['browser_peak_rss_mb'] if r['browser_peak_rss_mb'] is not None else '-':>11} "
+              f"{r['cpu_s'] if r['cpu_s'] is not None else '-':>7} "
+              f"{r['browser_cpu_s'] if r['browser_cpu_s'] is not None else '-':>11}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='로컬 가상 사이트로 K-Startup 크롤러 성능 측정')
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help=f"측정할 방식 (쉼표 구분, 기본값: {','.join(MODES)})")
+    parser.add_argument('--announcements', type=int, default=1000, help='가상 공고 수 (기본값: 1000)')
+    parser.add_argument('--per-page', type=int, default=15, help='목록 페이지당 공고 수 (기본값: 15)')
+    parser.add_argument('--pages', type=int, default=5, help='크롤링할 목록 페이지 수 (기본값: 5)')
+    parser.add_argument('--latency-ms', type=float, default=30.0, help='페이지 응답 지연 (기본값: 30ms)')
+    parser.add_argument('--jitter-ms', type=float, default=20.0, help='응답 지연 편차 최댓값 (기본값: 20ms)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='페이지 요청 실패 확률 (기본값: 0)')
+    parser.add_argument('--seed', type=int, default=1, help='가상 공고와 지연/오류 시드 (기본값: 1)')
+    parser.add_argument('--concurrency', type=int, default=8, help='async 방식의 동시성 (기본값: 8)')
+    parser.add_argument('--processes', type=int, default=4, help='sharded 방식의 프로세스 수 (기본값: 4)')
+    parser.add_argument('--http-workers', type=int, default=8, help='http 방식의 동시 요청 수 (기본값: 8)')
+    parser.add_argument('--rate', type=float, default=0.0,
+                        help='크롤러의 초당 최대 요청 수 (기본값: 0, 제한 없이 크롤러 자체 성능을 측정)')
+    parser.add_argument('--timeout', type=float, default=1800, help='방식별 최대 실행 시간 (초, 기본값: 1800)')
+    parser.add_argument('--output', default='kstartup_benchmark.json', help='결과 JSON 파일')
+    parser.add_argument('--verbose', action='store_true', help='크롤러 출력도 보여줍니다')
+    parser.add_argument('--run-mode', choices=MODES, help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+
+    # 하위 프로세스: 방식 하나를 실행하고 결과만 출력
+    if args.run_mode:
+        result = run_mode(args.run_mode, args.pages, args.concurrency, args.processes, args.http_workers,
+                          args.rate)
+        print(RESULT_MARKER + json.dumps(result, ensure_ascii=False), flush=True)
+        return
+
+    modes = [m.strip() for m in args.modes.split(',') if m.strip()]
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        print(f"알 수 없는 방식: {', '.join(unknown)} (가능한 값: {', '.join(MODES)})")
+        return
+
+    print(f"가상 공고 {args.announcements}개, 목록 {args.pages}페이지, "
+          f"지연 {args.latency_ms}±{args.jitter_ms}ms, 오류율 {args.error_rate}, 시드 {args.seed}, "
+          f"초당 요청 제한 {args.rate or '없음'}")
+    results = [benchmark_mode(mode, args) for mode in modes]
+    print_report(results)
+
+    config = {key: value for key, value in vars(args).items() if key not in ('run_mode', 'verbose')}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'config': config, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(f"\n결과가 {args.output}에 저장되었습니다.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,219 @@
+"""
+K-Startup 상주 브라우저 모듈
+크롤러를 실행할 때마다 Chromium을 새로 띄우지 않도록, 원격 디버깅 포트를 연
+Chromium을 데몬으로 계속 실행해 두고 크롤러는 여기에 CDP로 연결합니다.
+연결은 --attach-browser(또는 KSTARTUP_ATTACH_BROWSER=1)로 켤 때만 하며, 데몬이 없거나
+연결할 수 없으면 기존처럼 브라우저를 직접 실행합니다.
+
+사용 예:
+    python kstartup_browser.py serve                         # 데몬 실행 (Ctrl+C 또는 SIGTERM으로 종료)
+    python kstartup_browser.py status                        # 연결 정보 확인
+    python scrape_kstartup_filtered.py --attach-browser      # 데몬이 떠 있으면 연결
+"""
+
+import argparse
+import json
+import os
+import shutil
+import signal
+import subprocess
+import tempfile
+import time
+import urllib.request
+from datetime import datetime
+from typing import Dict, Optional
+
+
+# 데몬이 연결 정보를 남기는 파일
+DEFAULT_ENDPOINT_FILE = 'kstartup_browser.json'
+DEFAULT_PORT = 9222
+
+# 연결 시도 제한 시간 (밀리초) - 데몬이 죽었으면 빨리 직접 실행으로 넘어감
+CONNECT_TIMEOUT_MS = 3000
+
+# 상주 브라우저 연결을 켜는 환경 변수 (분산 워커, 벤치마크처럼 자기 브라우저가 필요한 곳은 쓰지 않음)
+ATTACH_ENV = 'KSTARTUP_ATTACH_BROWSER'
+_attach = [os.environ.get(ATTACH_ENV, '') not in ('', '0')]
+
+
+def set_attach(enabled: bool):
+    """connect_or_launch가 상주 브라우저에 연결할지 정합니다 (CLI 옵션 반영용)"""
+    _attach[0] = enabled
+
+
+def _endpoint_to_attach(endpoint_file: str, attach: Optional[bool]) -> Optional[Dict]:
+    if not (_attach[0] if attach is None else attach):
+        return None
+    return read_endpoint(endpoint_file)
+
+
+def read_endpoint(endpoint_file: str = DEFAULT_ENDPOINT_FILE) -> Optional[Dict]:
+    """데몬 연결 정보를 읽습니다 (파일이 없거나 깨졌으면 None)"""
+    if not endpoint_file or not os.path.exists(endpoint_file):
+        return None
+    try:
+        with open(endpoint_file, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if info.get('endpoint') else None
+
+
+def _write_endpoint(endpoint_file: str, info: Dict):
+    tmp_path = endpoint_file + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(info, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, endpoint_file)
+
+
+def connect_or_launch(playwright, endpoint_file: str = DEFAULT_ENDPOINT_FILE, attach: Optional[bool] = None):
+    """상주 브라우저에 연결하고, 없으면 브라우저를 직접 실행합니다 (동기 API)
+
+    attach가 None이면 set_attach/KSTARTUP_ATTACH_BROWSER 설정을 따르고, False면 항상 직접 실행합니다.
+    연결된 브라우저의 close()는 이 실행에서 만든 컨텍스트만 닫고 연결을 끊으므로
+    호출하는 쪽은 기존처럼 browser.close()로 정리하면 됩니다.
+    """
+    info = _endpoint_to_attach(endpoint_file, attach)
+    if info:
+        try:
+            browser = playwright.chromium.connect_over_cdp(info['endpoint'], timeout=CONNECT_TIMEOUT_MS)
+            print(f"상주 브라우저에 연결했습니다: {info['endpoint']}")
+            return browser
+        except Exception as e:
+            print(f"상주 브라우저 연결 실패, 브라우저를 직접 실행합니다: {e}")
+    return playwright.chromium.launch(headless=True)
+
+
+async def connect_or_launch_async(playwright, endpoint_file: str = DEFAULT_ENDPOINT_FILE,
+                                  attach: Optional[bool] = None):
+    """connect_or_launch의 비동기 버전"""
+    info = _endpoint_to_attach(endpoint_file, attach)
+    if info:
+        try:
+            browser = await playwright.chromium.connect_over_cdp(info['endpoint'], timeout=CONNECT_TIMEOUT_MS)
+            print(f"상주 브라우저에 연결했습니다: {info['endpoint']}")
+            return browser
+        except Exception as e:
+            print(f"상주 브라우저 연결 실패, 브라우저를 직접 실행합니다: {e}")
+    return await playwright.chromium.launch(headless=True)
+
+
+def _wait_for_devtools(endpoint: str, process: subprocess.Popen, timeout: float = 30.0):
+    """원격 디버깅 포트가 응답할 때까지 기다립니다"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Chromium이 종료되었습니다 (종료 코드 {process.returncode})")
+        try:
+            with urllib.request.urlopen(f'{endpoint}/json/version', timeout=1) as response:
+                return json.load(response)
+        except OSError:
+            time.sleep(0.2)
+    raise TimeoutError(f"{timeout:.0f}초 안에 {endpoint}에 연결할 수 없습니다")
+
+
+def _chromium_executable() -> str:
+    """Playwright가 설치한 Chromium 실행 파일 경로"""
+    from playwright.sync_api import sync_playwright
+
+    with sync_playwright() as p:
+        return p.chromium.executable_path
+
+
+def _launch_chromium(executable: str, port: int, user_data_dir: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [
+            executable,
+            '--headless=new',
+            f'--remote-debugging-port={port}',
+            '--remote-debugging-address=127.0.0.1',
+            f'--user-data-dir={user_data_dir}',
+            '--no-first-run',
+            '--no-default-browser-check',
+            '--disable-background-networking',
+            'about:blank',
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+
+def serve(port: int = DEFAULT_PORT, endpoint_file: str = DEFAULT_ENDPOINT_FILE,
+          check_interval: float = 5.0):
+    """상주 Chromium을 실행하고 종료 신호를 받을 때까지 유지합니다
+
+    Chromium이 비정상 종료되면 다시 실행합니다. 종료할 때 연결 정보 파일을 지웁니다.
+    """
+    executable = _chromium_executable()
+    endpoint = f'http://127.0.0.1:{port}'
+    user_data_dir = tempfile.mkdtemp(prefix='kstartup-browser-')
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    process = None
+    try:
+        while not stopping:
+            if process is None or process.poll() is not None:
+                if process is not None:
+                    print(f"Chromium이 종료되었습니다 (종료 코드 {process.returncode}). 다시 실행합니다...")
+                process = _launch_chromium(executable, port, user_data_dir)
+                version = _wait_for_devtools(endpoint, process)
+                _write_endpoint(endpoint_file, {
+                    'endpoint': endpoint,
+                    'pid': process.pid,
+                    'browser': version.get('Browser'),
+                    'started_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                })
+                print(f"상주 브라우저 실행 중: {endpoint} ({version.get('Browser')})")
+                print(f"연결 정보: {endpoint_file}")
+            time.sleep(check_interval)
+    finally:
+        if os.path.exists(endpoint_file):
+            os.remove(endpoint_file)
+        if process is not None and process.poll() is None:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+        print("상주 브라우저를 종료했습니다.")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='K-Startup 크롤러용 상주 브라우저')
+    parser.add_argument('--endpoint-file', default=DEFAULT_ENDPOINT_FILE,
+                        help=f'연결 정보 파일 (기본값: {DEFAULT_ENDPOINT_FILE})')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help='상주 브라우저를 실행합니다')
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT,
+                              help=f'원격 디버깅 포트 (기본값: {DEFAULT_PORT})')
+    subparsers.add_parser('status', help='상주 브라우저 연결 정보를 출력합니다')
+
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        serve(args.port, args.endpoint_file)
+        return
+
+    info = read_endpoint(args.endpoint_file)
+    if not info:
+        print("실행 중인 상주 브라우저가 없습니다.")
+        return
+    try:
+        with urllib.request.urlopen(f"{info['endpoint']}/json/version", timeout=2):
+            state = '응답함'
+    except OSError:
+        state = '응답 없음'
+    print(f"{info['endpoint']} ({info.get('browser')}, PID {info.get('pid')}, "
+          f"{info.get('started_at')} 시작): {state}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,306 @@
+"""
+K-Startup 응답 수집 모듈
+목록/상세 페이지가 배경 요청(XHR/fetch)으로 받아오는 JSON 응답을 가로채 공고 스키마로 바꿉니다.
+응답이 잡히면 렌더링 대기와 DOM 추출을 건너뛰고, 잡히지 않으면 호출한 쪽이 기존처럼
+DOM에서 추출합니다.
+
+목록 페이지에서는 요청 파라미터가 지금 읽는 페이지 번호와 분류 코드와 같은 응답만 목록으로
+믿습니다. 인기/최근 공고 위젯처럼 조건을 확인할 수 없는 응답은 DOM에서 찾은 공고와
+같은 공고들일 때만 사용합니다.
+
+필드 이름은 공공데이터포털 K-Startup 사업공고 API와 같은 이름(biz_pbanc_nm, supt_regin 등)과
+그 camelCase 형태를 인식합니다.
+"""
+
+import json
+import re
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from kstartup_metrics import default_metrics
+from kstartup_record import Announcement, scraped_at_now
+
+
+# 가로챌 응답 (요청 유형과 URL 일부)
+CAPTURE_TYPES = frozenset({'xhr', 'fetch'})
+CAPTURE_URL_PARTS = ('bizpbanc', 'pbanc')
+
+# 정규화한 키(소문자, 밑줄 제거) -> 공고 필드
+FIELD_ALIASES = {
+    'pbancsn': 'pbanc_sn',
+    'bizpbancnm': 'title', 'pbancnm': 'title', 'intgpbancbiznm': 'title', 'title': 'title',
+    'suptbizclsfc': 'support_field', 'supportfield': 'support_field',
+    'biztrgtage': 'age_range', 'agerange': 'age_range',
+    'aplytrgtctnt': 'target', 'aplytrgt': 'target', 'target': 'target',
+    'bizenyy': 'business_years', 'businessyears': 'business_years',
+    'suptregin': 'region', 'region': 'region',
+    'pbancntrpnm': 'organization', 'sprvinst': 'organization', 'organization': 'organization',
+    'prchcnplno': 'contact', 'contact': 'contact',
+    'pbancctnt': 'content', 'content': 'content',
+    'applicationperiod': 'application_period',
+}
+PERIOD_START_KEYS = ('pbancrcptbgngdt', 'rcptbgngdt')
+PERIOD_END_KEYS = ('pbancrcptenddt', 'rcptenddt')
+
+# 응답 레코드를 최종 결과로 쓰려면 있어야 하는 상세 수준 필드
+# (목록 응답은 보통 제목, 기관 정도만 담고 있어 이 필드가 없으면 상세 페이지를 방문)
+DETAIL_LEVEL_FIELDS = ('content', 'target', 'business_years')
+
+# 목록 요청의 페이지 번호와 분류 코드 파라미터 (정규화한 이름)
+PAGE_PARAMS = frozenset({'page', 'pageindex', 'pageno', 'pagenum', 'currentpage', 'cpage'})
+CATEGORY_PARAMS = frozenset({'pbancclsscd'})
+
+# JSON 안에서 공고 목록을 찾을 때 내려가는 최대 깊이
+MAX_DEPTH = 6
+
+TAG_PATTERN = re.compile(r'<[^>]+>')
+
+
+def _normalize_key(key: str) -> str:
+    return key.replace('_', '').lower()
+
+
+def _text(value: Any) -> str:
+    if value is None:
+        return ''
+    return TAG_PATTERN.sub(' ', str(value)).strip()
+
+
+def _format_date(value: str) -> str:
+    """20240131 -> 2024-01-31 (다른 형식은 그대로)"""
+    value = _text(value)
+    if len(value) == 8 and value.isdigit():
+        return f'{value[:4]}-{value[4:6]}-{value[6:]}'
+    return value
+
+
+def _is_announcement(item: Any) -> bool:
+    return isinstance(item, dict) and any(_normalize_key(key) == 'pbancsn' for key in item)
+
+
+def find_announcements(payload: Any, depth: int = 0) -> List[Dict]:
+    """JSON 응답에서 pbancSn을 가진 객체들을 찾습니다 (목록 배열 또는 단일 객체)"""
+    if depth > MAX_DEPTH:
+        return []
+    if _is_announcement(payload):
+        return [payload]
+    if isinstance(payload, list):
+        if any(_is_announcement(item) for item in payload):
+            return [item for item in payload if _is_announcement(item)]
+        children: Iterable = payload
+    elif isinstance(payload, dict):
+        children = payload.values()
+    else:
+        return []
+    found = []
+    for child in children:
+        found.extend(find_announcements(child, depth + 1))
+    return found
+
+
+def to_record(item: Dict) -> Announcement:
+    """API 필드 이름의 객체를 공고 스키마로 바꿉니다"""
+    record = Announcement()
+    start = end = ''
+    for key, value in item.items():
+        normalized = _normalize_key(key)
+        field = FIELD_ALIASES.get(normalized)
+        if field == 'pbanc_sn':
+            record['pbanc_sn'] = _text(value) or None
+        elif field and not record[field]:
+            record[field] = _text(value)
+        elif normalized in PERIOD_START_KEYS:
+            start = _format_date(value)
+        elif normalized in PERIOD_END_KEYS:
+            end = _format_date(value)
+    if not record['application_period'] and (start or end):
+        record['application_period'] = f'{start} ~ {end}'
+    record['content'] = record['content'][:500].strip()
+    return record
+
+
+def has_detail_fields(record: Announcement) -> bool:
+    """상세 페이지를 방문하지 않고 그대로 저장해도 될 만큼 필드가 채워졌는지 확인"""
+    return bool(record.get('title')) and all(record.get(field) for field in DETAIL_LEVEL_FIELDS)
+
+
+def request_params(request) -> Dict[str, List[str]]:
+    """요청 URL 쿼리와 본문(폼 또는 JSON 객체)의 파라미터 (이름은 정규화)"""
+    sources = [parse_qs(urlsplit(request.url).query)]
+    try:
+        body = request.post_data
+    except Exception:
+        body = None
+    if body:
+        try:
+            data = json.loads(body)
+        except ValueError:
+            sources.append(parse_qs(body))
+        else:
+            if isinstance(data, dict):
+                sources.append({key: [str(value)] for key, value in data.items()
+                                if not isinstance(value, (dict, list))})
+    params: Dict[str, List[str]] = {}
+    for source in sources:
+        for key, values in source.items():
+            params.setdefault(_normalize_key(key), []).extend(values)
+    return params
+
+
+def matches_list_query(request, page_num: int, pbanc_clss_cd: str) -> bool:
+    """요청이 지금 읽는 목록(페이지 번호, 분류 코드)을 요청한 것인지 확인"""
+    params = request_params(request)
+    pages = {value for key in PAGE_PARAMS for value in params.get(key, [])}
+    categories = {value for key in CATEGORY_PARAMS for value in params.get(key, [])}
+    return str(page_num) in pages and pbanc_clss_cd in categories
+
+
+def _pbanc_sn_from_url(url: str) -> Optional[str]:
+    return parse_qs(urlsplit(url).query).get('pbancSn', [None])[0]
+
+
+class ResponseCapture:
+    """페이지별로 공고 JSON 응답을 모아 두는 수집기
+
+    응답 이벤트에서는 Response 객체만 보관하고, 본문은 take/take_async에서 읽습니다.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._responses: Dict[Any, List] = {}
+        self.captured = {'list': 0, 'detail': 0}
+        self.fallbacks = {'list': 0, 'detail': 0}
+
+    def _on_response(self, response):
+        try:
+            request = response.request
+            if request.resource_type not in CAPTURE_TYPES:
+                return
+            url = response.url.lower()
+            if not any(part in url for part in CAPTURE_URL_PARTS):
+                return
+            if 'json' not in (response.headers.get('content-type') or ''):
+                return
+            page = response.frame.page
+        except Exception:
+            # 서비스 워커 등 페이지에 속하지 않는 응답
+            return
+        self._responses.setdefault(page, []).append(response)
+
+    def install(self, context):
+        """브라우저 컨텍스트의 응답을 수집합니다 (동기/비동기 API 공통)"""
+        if self.enabled:
+            context.on('response', self._on_response)
+
+    def reset(self, page):
+        """페이지 이동 전에 이전 페이지의 응답을 버립니다"""
+        self._responses.pop(page, None)
+
+    def _records(self, payloads: List[Any]) -> List[Announcement]:
+        records = []
+        seen = set()
+        for payload in payloads:
+            for item in find_announcements(payload):
+                record = to_record(item)
+                if record['pbanc_sn'] and record['pbanc_sn'] not in seen:
+                    seen.add(record['pbanc_sn'])
+                    records.append(record)
+        return records
+
+    def take(self, page) -> List[Announcement]:
+        """지금까지 잡힌 응답을 공고 레코드로 바꿔 돌려줍니다 (동기 API)"""
+        payloads = []
+        for response in self._responses.pop(page, []):
+            try:
+                payloads.append(response.json())
+            except Exception:
+                continue
+        return self._records(payloads)
+
+    async def take_async(self, page) -> List[Announcement]:
+        payloads = []
+        for response in self._responses.pop(page, []):
+            try:
+                payloads.append(await response.json())
+            except Exception:
+                continue
+        return self._records(payloads)
+
+    def _split_list(self, pairs: List[Tuple[Any, Any]], page_num: int,
+                    pbanc_clss_cd: str) -> Tuple[List[Announcement], List[Announcement]]:
+        matched, other = [], []
+        for request, payload in pairs:
+            (matched if matches_list_query(request, page_num, pbanc_clss_cd) else other).append(payload)
+        return self._records(matched), self._records(other)
+
+    def take_list(self, page, page_num: int,
+                  pbanc_clss_cd: str) -> Tuple[List[Announcement], List[Announcement]]:
+        """목록 페이지에서 잡힌 레코드를 (목록 요청 조건이 맞는 응답, 나머지 응답)으로 나눕니다"""
+        pairs = []
+        for response in self._responses.pop(page, []):
+            try:
+                pairs.append((response.request, response.json()))
+            except Exception:
+                continue
+        return self._split_list(pairs, page_num, pbanc_clss_cd)
+
+    async def take_list_async(self, page, page_num: int,
+                              pbanc_clss_cd: str) -> Tuple[List[Announcement], List[Announcement]]:
+        pairs = []
+        for response in self._responses.pop(page, []):
+            try:
+                pairs.append((response.request, await response.json()))
+            except Exception:
+                continue
+        return self._split_list(pairs, page_num, pbanc_clss_cd)
+
+    def _count_list(self):
+        self.captured['list'] += 1
+        default_metrics.increment('captured_pages', page_type='list')
+
+    def list_records(self, records: List[Announcement]) -> Optional[List[Announcement]]:
+        """목록 요청 조건이 맞는 응답의 레코드 (없으면 None - DOM 추출로 넘어감)"""
+        if not records:
+            return None
+        self._count_list()
+        return records
+
+    def confirm_list(self, records: List[Announcement], links: List[Dict]) -> Optional[List[Announcement]]:
+        """조건을 확인할 수 없는 응답의 레코드를 DOM에서 찾은 목록과 비교합니다
+
+        두 목록의 공고가 정확히 같을 때만 DOM 순서대로 돌려주고 (상세 필드 재사용), 아니면 None입니다.
+        """
+        dom = [link.get('pbanc_sn') for link in links]
+        by_sn = {record['pbanc_sn']: record for record in records}
+        if not dom or not all(dom) or len(set(dom)) != len(dom) or set(dom) != set(by_sn):
+            return None
+        self._count_list()
+        return [by_sn[pbanc_sn] for pbanc_sn in dom]
+
+    def detail_record(self, records: List[Announcement], url: str) -> Optional[Announcement]:
+        """상세 페이지 URL의 공고 레코드 (필드가 부족하면 None - DOM 추출로 넘어감)"""
+        pbanc_sn = _pbanc_sn_from_url(url)
+        for record in records:
+            if (pbanc_sn is None or record['pbanc_sn'] == pbanc_sn) and has_detail_fields(record):
+                self.captured['detail'] += 1
+                default_metrics.increment('captured_pages', page_type='detail')
+                record['url'] = url
+                record['scraped_at'] = scraped_at_now()
+                return record
+        return None
+
+    def record_fallback(self, page_type: str):
+        if self.enabled:
+            self.fallbacks[page_type] += 1
+
+    def print_summary(self):
+        if not self.enabled or not (any(self.captured.values()) or any(self.fallbacks.values())):
+            return
+        print("\n응답 수집 결과:")
+        for page_type in ('list', 'detail'):
+            print(f"  - {page_type}: 응답 사용 {self.captured[page_type]}회, "
+                  f"DOM 추출 {self.fallbacks[page_type]}회")
+
+
+# 별도로 지정하지 않으면 사용하는 기본 수집기
+default_capture = ResponseCapture()
@@ -0,0 +1,208 @@
+"""
+K-Startup 크롤링 공통 모듈
+목록/상세 페이지 URL, 목록 페이지 범위 관리(ListPager), 분류 코드 사이의 중복 확인,
+목록/상세 페이지 한 장을 수집하는 함수처럼 모든 실행 방식(순차, 비동기, 파이프라인,
+멀티 프로세스)이 함께 쓰는 부분을 모아 둡니다.
+"""
+
+import os
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from kstartup_capture import default_capture, has_detail_fields
+from kstartup_extract import extract_detail, extract_list, extract_page_count
+from kstartup_metrics import default_metrics
+from kstartup_readiness import wait_until_ready
+from kstartup_record import Announcement, FailedAnnouncement, scraped_at_now
+from kstartup_throttle import default_scheduler
+
+
+# KSTARTUP_BASE_URL로 로컬 대체 서버(kstartup_fixture_server.py)를 가리킬 수 있습니다
+BASE_URL = os.environ.get('KSTARTUP_BASE_URL', 'https://www.k-startup.go.kr').rstrip('/')
+LIST_URL_TEMPLATE = BASE_URL + '/web/contents/bizpbanc-ongoing.do?page={page}&pbancClssCd={pbanc_clss_cd}'
+DETAIL_URL_TEMPLATE = BASE_URL + '/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn={pbanc_sn}'
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+# 기본 공고 분류 코드
+DEFAULT_CATEGORIES = ['PBC010']
+# 페이저에서 페이지 수를 읽지 못하고 --end-page도 없을 때 읽을 최대 페이지 수 (빈 페이지가 나오면 먼저 멈춤)
+AUTO_MAX_PAGES = 200
+
+
+def build_list_url(page_num: int, pbanc_clss_cd: str = 'PBC010') -> str:
+    """목록 페이지 URL을 생성합니다"""
+    return LIST_URL_TEMPLATE.format(page=page_num, pbanc_clss_cd=pbanc_clss_cd)
+
+
+def build_detail_url(pbanc_sn: str) -> str:
+    """상세 페이지 URL을 생성합니다"""
+    return DETAIL_URL_TEMPLATE.format(pbanc_sn=pbanc_sn)
+
+
+class ListPager:
+    """분류 코드 하나의 목록을 어디까지 읽을지 정하는 페이지 번호 관리자
+
+    목록 페이지를 읽을 때마다 페이저의 마지막 페이지 번호를 다시 읽어 갱신합니다
+    (10페이지 단위 블록만 보여 주는 페이저는 뒤 블록으로 갈수록 번호가 늘어남).
+    end_page가 주어지면 그 페이지를 넘지 않으며, 빈 페이지가 나오면 바로 멈춥니다.
+    """
+
+    def __init__(self, start_page: int = 1, end_page: Optional[int] = None):
+        self.start_page = start_page
+        self.end_page = end_page
+        self.page_count: Optional[int] = None
+        self.exhausted = False
+
+    @property
+    def last_page(self) -> int:
+        limits = [limit for limit in (self.page_count, self.end_page) if limit]
+        return min(limits) if limits else self.start_page + AUTO_MAX_PAGES - 1
+
+    def label(self, page_num: int) -> str:
+        """진행 표시용 페이지 번호 (마지막 페이지를 알면 '3/12')"""
+        return f"{page_num}/{self.last_page}" if self.page_count or self.end_page else str(page_num)
+
+    def pages(self) -> Iterator[int]:
+        """읽을 페이지 번호 (순회 중 update로 늘어나거나 줄어든 범위를 따름)"""
+        page_num = self.start_page
+        while not self.exhausted and page_num <= self.last_page:
+            yield page_num
+            page_num += 1
+
+    def update(self, page_num: int, links: List[Dict], page_count: Optional[int]):
+        """읽은 목록 페이지의 결과로 범위를 갱신합니다"""
+        if page_count:
+            self.page_count = max(self.page_count or 0, page_count)
+        # 빈 페이지이거나 페이저의 마지막 페이지까지 읽었으면 목록 끝
+        if not links or (self.page_count and page_num >= self.page_count):
+            self.exhausted = True
+
+
+def link_key(link: Dict) -> Optional[str]:
+    """공고 중복 확인 키 (pbanc_sn이 없으면 URL)"""
+    return link.get('pbanc_sn') or link.get('url')
+
+
+def mark_duplicates(links: List[Dict], seen: Set[str]) -> Set[int]:
+    """다른 분류 코드나 앞 페이지에서 이미 나온 공고의 순번을 돌려주고, 처음 나온 공고는 seen에 추가합니다
+
+    목록 순번은 그대로 두므로 체크포인트 위치는 중복 공고를 건너뛰어도 바뀌지 않습니다.
+    """
+    duplicates = set()
+    for i, link in enumerate(links):
+        key = link_key(link)
+        if key in seen:
+            duplicates.add(i)
+        else:
+            seen.add(key)
+    return duplicates
+
+
+def links_from_records(records: List[Announcement]) -> List[Dict]:
+    """응답에서 얻은 공고 레코드를 목록 링크로 바꿉니다
+
+    본문, 지원대상, 업력 같은 상세 필드까지 들어 있는 레코드만 'detail'에 담아 두어 상세 페이지를
+    방문하지 않게 합니다 (제목, 기관 정도만 있는 목록 레코드로 필터링하지 않도록).
+    """
+    links = []
+    scraped_at = scraped_at_now()
+    for record in records:
+        if not record.title:
+            continue
+        url = build_detail_url(record.pbanc_sn)
+        link = {'title': record.title, 'url': url, 'pbanc_sn': record.pbanc_sn}
+        if has_detail_fields(record):
+            record.url = url
+            record.scraped_at = scraped_at
+            link['detail'] = record
+        links.append(link)
+    return links
+
+
+def make_error_record(url: str, error: Exception) -> FailedAnnouncement:
+    """상세 정보 추출에 실패한 공고의 기록을 만듭니다"""
+    return FailedAnnouncement(error=str(error), url=url, scraped_at=scraped_at_now())
+
+
+def scrape_announcement_detail(page, url: str) -> Announcement:
+    """공고 상세 페이지에서 정보를 추출합니다"""
+    try:
+        default_capture.reset(page)
+        with default_metrics.time('navigate', 'detail'):
+            default_scheduler.navigate(page, url, wait_until='domcontentloaded', timeout=30000)
+        
+        # 배경 요청으로 받은 JSON이 이미 있으면 렌더링을 기다리지 않음
+        records = default_capture.take(page)
+        detail = default_capture.detail_record(records, url)
+        if detail is None:
+            with default_metrics.time('wait', 'detail'):
+                wait_until_ready(page, 'detail')
+            records += default_capture.take(page)
+            detail = default_capture.detail_record(records, url)
+        
+        if detail is None:
+            # 컨텍스트에 주입해 둔 추출 모듈로 상세 정보 추출
+            default_capture.record_fallback('detail')
+            with default_metrics.time('extract', 'detail'):
+                detail = extract_detail(page)
+            detail.url = url
+            detail.scraped_at = scraped_at_now()
+        
+        default_metrics.increment('pages', page_type='detail', result='ok')
+        
+        return detail
+        
+    except Exception as e:
+        print(f"  상세 정보 추출 실패: {e}")
+        default_metrics.increment('pages', page_type='detail', result='error')
+        return make_error_record(url, e)
+
+
+def collect_list_links(page, page_num: int, pbanc_clss_cd: str = 'PBC010') -> List[Dict]:
+    """목록 페이지 하나에서 공고 링크를 수집합니다"""
+    try:
+        default_capture.reset(page)
+        with default_metrics.time('navigate', 'list'):
+            default_scheduler.navigate(
+                page, build_list_url(page_num, pbanc_clss_cd), wait_until='domcontentloaded', timeout=30000
+            )
+        
+        # 배경 요청으로 받은 공고 목록 JSON이 이 페이지/분류 코드의 목록이면 그대로 사용
+        matched, other = default_capture.take_list(page, page_num, pbanc_clss_cd)
+        records = default_capture.list_records(matched)
+        if records is None:
+            # 공고 목록이 로드되고 DOM이 안정될 때까지 대기 (스크롤로 동적 로드 유도)
+            with default_metrics.time('wait', 'list'):
+                wait_until_ready(page, 'list')
+            more_matched, more_other = default_capture.take_list(page, page_num, pbanc_clss_cd)
+            matched, other = matched + more_matched, other + more_other
+            records = default_capture.list_records(matched)
+        
+        if records is not None:
+            links = links_from_records(records)
+        else:
+            # 공고 목록 영역의 링크 추출
+            with default_metrics.time('extract', 'list'):
+                links = extract_list(page)
+            # 조건을 확인할 수 없는 응답은 DOM과 같은 공고들일 때만 사용 (위젯 응답 등은 버림)
+            confirmed = default_capture.confirm_list(other, links)
+            if confirmed is not None:
+                links = links_from_records(confirmed)
+            else:
+                default_capture.record_fallback('list')
+    except Exception:
+        default_metrics.increment('pages', page_type='list', result='error')
+        raise
+    default_metrics.increment('pages', page_type='list', result='ok')
+    return links
+
+
+def collect_list_page(page, page_num: int, pbanc_clss_cd: str = 'PBC010') -> Tuple[List[Dict], Optional[int]]:
+    """목록 페이지 하나의 공고 링크와 페이저의 마지막 페이지 번호를 수집합니다"""
+    links = collect_list_links(page, page_num, pbanc_clss_cd)
+    try:
+        page_count = extract_page_count(page)
+    except Exception as e:
+        # 페이지 수를 못 읽어도 빈 페이지가 나올 때까지 읽으면 되므로 링크는 그대로 사용
+        print(f"  페이지 번호를 읽지 못했습니다: {e}")
+        page_count = None
+    return links, page_count
@@ -0,0 +1,299 @@
+"""
+K-Startup 페이지 추출 모듈
+목록/상세 페이지 추출 함수를 한 번 컴파일해 컨텍스트의 init script로 넣어 두고,
+페이지마다 짧은 호출 스크립트만 평가합니다.
+
+- 목록 페이지: 공고 목록 영역 안의 링크만 한 번 훑어 [제목, URL, pbancSn] 배열로 돌려줍니다.
+- 상세 페이지: 정보 영역의 li 행만 훑고, 본문은 앞부분 500자까지만 읽어
+  DETAIL_FIELDS 순서의 값 배열(마지막에 첨부파일 [이름, URL] 목록)로 돌려줍니다.
+- 페이저: 목록 페이지 번호 영역에서 가장 큰 페이지 번호를 돌려줍니다 (없으면 null).
+"""
+
+import json
+from typing import List, Dict, Optional
+
+from kstartup_http import ATTACHMENT_HREF
+from kstartup_record import DETAIL_FIELDS, Announcement
+
+
+# 컨텍스트마다 한 번 주입하는 추출 모듈 (window.__kstartupExtract)
+EXTRACT_MODULE_SCRIPT = """
+(() => {
+    if (window.__kstartupExtract) {
+        return;
+    }
+
+    const DETAIL_FIELDS = __DETAIL_FIELDS__;
+    const FIELD_INDEX = Object.fromEntries(DETAIL_FIELDS.map((field, i) => [field, i]));
+    const CONTENT_LIMIT = 500;
+
+    // 공고 목록 영역 후보 (pbancSn 링크가 있는 첫 영역만 훑음, 없으면 문서 전체)
+    const LIST_CONTAINERS = ['.link_box-list', '.board_list-wrap', '.text_list', '#contents', 'main'];
+    const SN_LINK = 'a[href*="pbancSn"], a[onclick*="pbancSn"]';
+    const CARD = '.basic_item, .list_item, li';
+    const CARD_TITLE = '.tit, .title, h3, h4, h5, [class*="title"], [class*="subject"]';
+    const SKIP_TITLES = ['더보기', '목록', '이전', '다음', '페이스북', '트위터'];
+
+    // 상세 페이지 정보 영역 후보 (없으면 문서 전체의 li)
+    const INFO_BLOCKS = '.bg_box, [class*="information_list"], [class*="info_list"], .view_info';
+    const CONTENT = '.ann_cont, .content, [class*="content"]';
+
+    // 첨부파일 영역 후보와 링크 패턴 (kstartup_http.ATTACHMENT_HREF)
+    const FILE_BLOCKS = '.board_file, [class*="file"], .ann_cont, ' + INFO_BLOCKS;
+    const ATTACHMENT_HREF = new RegExp(__ATTACHMENT_HREF__, 'i');
+
+    // 페이지 번호 영역 후보와 번호를 읽을 곳 (href의 page=N, onclick의 fn_egov_link_page(N), 번호 텍스트)
+    const PAGERS = '.paginate, .pagination, .page_wrap, .paging, [class*="paginat"], [class*="paging"]';
+    const PAGE_PARAM = /[?&]page=(\\d+)/;
+    const PAGE_CALL = /\\(\\s*['"]?(\\d+)['"]?\\s*\\)/;
+
+    const QUOTED_URL = /['"]([^'"]*pbancSn=[^'"]*)['"]/;
+    const SN_PARAM = /pbancSn=([^&'"]+)/;
+
+    // 라벨 -> 필드 (kstartup_http.label_to_field와 같은 검사 순서)
+    const LABEL_RULES = [
+        [['지원분야'], 'support_field'],
+        [['대상연령'], 'age_range'],
+        [['대상'], 'target'],
+        [['창업업력', '업력'], 'business_years'],
+        [['지역'], 'region'],
+        [['접수기간'], 'application_period'],
+        [['주관기관', '기관명'], 'organization'],
+        [['연락처'], 'contact'],
+    ];
+
+    const labelIndex = (label) => {
+        for (const [words, field] of LABEL_RULES) {
+            if (words.some(word => label.includes(word))) {
+                return FIELD_INDEX[field];
+            }
+        }
+        return -1;
+    };
+
+    const linkHref = (link) => {
+        const href = link.getAttribute('href') || '';
+        if (href && !href.startsWith('javascript:')) {
+            return href;
+        }
+        const onclick = link.getAttribute('onclick') || '';
+        if (!onclick.includes('pbancSn')) {
+            return href;
+        }
+        const quoted = onclick.match(QUOTED_URL);
+        if (quoted) {
+            return quoted[1];
+        }
+        const sn = onclick.match(SN_PARAM);
+        return sn ? '/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn=' + sn[1] : href;
+    };
+
+    const absoluteUrl = (href) => {
+        if (href.startsWith('http')) {
+            return href;
+        }
+        if (href.startsWith('/')) {
+            return location.origin + href;
+        }
+        if (href.includes('bizpbanc-ongoing.do')) {
+            return location.origin + '/web/contents/' + href;
+        }
+        return location.origin + '/' + href;
+    };
+
+    const listRoot = () => {
+        for (const selector of LIST_CONTAINERS) {
+            const container = document.querySelector(selector);
+            if (container && container.querySelector(SN_LINK)) {
+                return container;
+            }
+        }
+        return document.body || document.documentElement;
+    };
+
+    const list = () => {
+        const rows = [];
+        const seenUrls = new Set();
+        for (const link of listRoot().getElementsByTagName('a')) {
+            const href = linkHref(link);
+            if (!href.includes('pbancSn=')) {
+                continue;
+            }
+            const url = absoluteUrl(href);
+            if (seenUrls.has(url)) {
+                continue;
+            }
+
+            // 링크 텍스트가 짧으면 감싸는 카드의 제목 요소 사용
+            let title = link.textContent.trim();
+            if (title.length < 5) {
+                const titleEl = link.closest(CARD)?.querySelector(CARD_TITLE);
+                if (titleEl) {
+                    title = titleEl.textContent.trim();
+                }
+            }
+            if (title.length < 5 || SKIP_TITLES.some(word => title.includes(word))) {
+                continue;
+            }
+
+            seenUrls.add(url);
+            const sn = href.match(SN_PARAM);
+            rows.push([title, url, sn ? sn[1] : null]);
+        }
+        return rows;
+    };
+
+    // 요소의 텍스트를 앞에서부터 limit자까지만 모음 (긴 본문 전체를 읽지 않음)
+    const leadingText = (element, limit) => {
+        const walker = document.createTreeWalker(element, NodeFilter.SHOW_TEXT);
+        let text = '';
+        while (text.length < limit && walker.nextNode()) {
+            text += walker.currentNode.nodeValue;
+        }
+        return text.substring(0, limit).trim();
+    };
+
+    const detail = () => {
+        const values = DETAIL_FIELDS.map(() => '');
+
+        const titleEl = document.querySelector('h3');
+        if (titleEl) {
+            values[FIELD_INDEX.title] = titleEl.textContent.trim();
+        }
+
+        // 라벨 p와 값 p로 된 li 행 (같은 라벨이 여러 번 나오면 마지막 값)
+        const readRows = (roots) => {
+            let found = 0;
+            for (const root of roots) {
+                for (const item of root.getElementsByTagName('li')) {
+                    const paragraphs = item.getElementsByTagName('p');
+                    if (!paragraphs.length) {
+                        continue;
+                    }
+                    const index = labelIndex(paragraphs[0].textContent.trim());
+                    if (index >= 0) {
+                        values[index] = paragraphs[paragraphs.length - 1].textContent.trim();
+                        found++;
+                    }
+                }
+            }
+            return found;
+        };
+        const blocks = document.querySelectorAll(INFO_BLOCKS);
+        if (!blocks.length || !readRows(blocks)) {
+            readRows([document]);
+        }
+
+        const contentEl = document.querySelector(CONTENT);
+        if (contentEl) {
+            values[FIELD_INDEX.content] = leadingText(contentEl, CONTENT_LIMIT);
+        }
+
+        // 마지막 항목: 첨부파일 [이름, 절대 URL] 목록
+        const files = [];
+        const seenFiles = new Set();
+        const fileRoots = document.querySelectorAll(FILE_BLOCKS);
+        for (const root of (fileRoots.length ? fileRoots : [document])) {
+            for (const link of root.querySelectorAll('a[href]')) {
+                const href = link.getAttribute('href');
+                if (href.startsWith('javascript:') || !ATTACHMENT_HREF.test(href) || seenFiles.has(link.href)) {
+                    continue;
+                }
+                seenFiles.add(link.href);
+                files.push([link.textContent.replace(/\\s+/g, ' ').trim(), link.href]);
+            }
+        }
+        values.push(files);
+        return values;
+    };
+
+    // 마지막 페이지 번호 ('마지막' 링크가 있으면 그 번호, 블록 단위 페이저면 현재 블록의 끝)
+    const pages = () => {
+        let last = 0;
+        for (const pager of document.querySelectorAll(PAGERS)) {
+            for (const el of pager.querySelectorAll('a, button, strong, span')) {
+                const source = (el.getAttribute('href') || '') + ' ' + (el.getAttribute('onclick') || '');
+                const match = source.match(PAGE_PARAM) || source.match(PAGE_CALL);
+                const text = el.textContent.trim();
+                const number = match ? parseInt(match[1], 10) : (/^\\d+$/.test(text) ? parseInt(text, 10) : 0);
+                last = Math.max(last, number);
+            }
+        }
+        return last || null;
+    };
+
+    window.__kstartupExtract = {list, detail, pages};
+})()
+""".replace('__DETAIL_FIELDS__', json.dumps(DETAIL_FIELDS)).replace(
+    '__ATTACHMENT_HREF__', json.dumps(ATTACHMENT_HREF.pattern))
+
+# 페이지마다 평가하는 호출 스크립트 (모듈이 없으면 null)
+LIST_CALL_SCRIPT = "() => window.__kstartupExtract ? window.__kstartupExtract.list() : null"
+DETAIL_CALL_SCRIPT = "() => window.__kstartupExtract ? window.__kstartupExtract.detail() : null"
+# pages()는 페이저가 없으면 null이므로 모듈이 없을 때는 false로 구분
+PAGES_CALL_SCRIPT = "() => window.__kstartupExtract ? window.__kstartupExtract.pages() : false"
+
+
+def install_extractor(context):
+    """동기 브라우저 컨텍스트의 모든 페이지에 추출 모듈을 주입합니다"""
+    context.add_init_script(EXTRACT_MODULE_SCRIPT)
+
+
+async def install_extractor_async(context):
+    """비동기 브라우저 컨텍스트의 모든 페이지에 추출 모듈을 주입합니다"""
+    await context.add_init_script(EXTRACT_MODULE_SCRIPT)
+
+
+def _list_records(rows: List[List]) -> List[Dict]:
+    return [{'title': title, 'url': url, 'pbanc_sn': pbanc_sn} for title, url, pbanc_sn in rows]
+
+
+def _detail_record(values: List) -> Announcement:
+    record = Announcement(**dict(zip(DETAIL_FIELDS, values)))
+    files = values[len(DETAIL_FIELDS)] if len(values) > len(DETAIL_FIELDS) else []
+    record.attachments = [{'name': name, 'url': url} for name, url in files]
+    return record
+
+
+def _evaluate(page, call_script: str, missing=None):
+    result = page.evaluate(call_script)
+    if result is missing:
+        # 주입하지 않은 컨텍스트의 페이지면 이 페이지에만 모듈을 넣고 다시 호출
+        page.evaluate(EXTRACT_MODULE_SCRIPT)
+        result = page.evaluate(call_script)
+    return result
+
+
+async def _evaluate_async(page, call_script: str, missing=None):
+    result = await page.evaluate(call_script)
+    if result is missing:
+        await page.evaluate(EXTRACT_MODULE_SCRIPT)
+        result = await page.evaluate(call_script)
+    return result
+
+
+def extract_list(page) -> List[Dict]:
+    """목록 페이지의 공고 링크 (title, url, pbanc_sn)"""
+    return _list_records(_evaluate(page, LIST_CALL_SCRIPT))
+
+
+async def extract_list_async(page) -> List[Dict]:
+    return _list_records(await _evaluate_async(page, LIST_CALL_SCRIPT))
+
+
+def extract_detail(page) -> Announcement:
+    """상세 페이지 정보 (DETAIL_FIELDS 필드를 채운 Announcement)"""
+    return _detail_record(_evaluate(page, DETAIL_CALL_SCRIPT))
+
+
+async def extract_detail_async(page) -> Announcement:
+    return _detail_record(await _evaluate_async(page, DETAIL_CALL_SCRIPT))
+
+
+def extract_page_count(page) -> Optional[int]:
+    """목록 페이지 페이저의 마지막 페이지 번호 (페이저가 없으면 None)"""
+    return _evaluate(page, PAGES_CALL_SCRIPT, missing=False)
+
+
+async def extract_page_count_async(page) -> Optional[int]:
+    return await _evaluate_async(page, PAGES_CALL_SCRIPT, missing=False)
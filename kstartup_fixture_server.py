@@ -0,0 +1,311 @@
+"""
+K-Startup 로컬 대체 서버
+저장해 둔 목록/상세 페이지 HTML을 실제 사이트와 같은 경로로 제공합니다.
+HTTP 수집 경로(kstartup_http.py)를 실제 사이트에 요청하지 않고 확인할 때 사용합니다.
+--synthetic N을 주면 저장된 파일 대신 같은 마크업 구조의 가상 공고 N개를 만들어 제공하며,
+응답 지연과 오류를 주입할 수 있습니다 (kstartup_benchmark.py에서 사용).
+
+디렉터리 구성:
+    <pages_dir>/list_<page>.html      목록 페이지 (bizpbanc-ongoing.do?page=<page>)
+    <pages_dir>/detail_<pbancSn>.html 상세 페이지 (bizpbanc-ongoing.do?schM=view&pbancSn=<pbancSn>)
+
+사용 예:
+    python kstartup_fixture_server.py saved_pages --port 8000
+    python kstartup_http.py "http://127.0.0.1:8000/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn=175799"
+    python kstartup_fixture_server.py --synthetic 3000 --latency-ms 50 --error-rate 0.01
+"""
+
+import argparse
+import html
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit, parse_qs
+
+
+LIST_PATH = '/web/contents/bizpbanc-ongoing.do'
+
+# 가상 공고의 첫 pbancSn (실제 사이트와 비슷한 범위)
+SYNTHETIC_FIRST_SN = 170000
+
+SYNTHETIC_FIELDS = ['사업화', '기술개발(R&D)', '멘토링ㆍ컨설팅ㆍ교육', '시설ㆍ공간ㆍ보육', '판로ㆍ해외진출', '융자']
+SYNTHETIC_TOPICS = ['헬스케어', '바이오', 'AI', '핀테크', '친환경', '콘텐츠', '제조', '모빌리티', '로봇', '푸드테크']
+SYNTHETIC_YEARS = ['전체', '1년미만', '3년미만', '7년미만', '3년미만,7년미만', '7년이상']
+SYNTHETIC_REGIONS = ['전국', '서울', '경기', '부산', '대전', '광주', '강원']
+SYNTHETIC_TARGETS = ['일반인, 대학생, 청년', '예비창업자', '중소기업, 1인 창조기업', '대학, 연구기관']
+SYNTHETIC_AGES = ['전체', '만 39세 이하', '만 20세 이상 ~ 만 39세 이하']
+SYNTHETIC_ORGS = ['중소벤처기업부', '창업진흥원', '서울경제진흥원', '한국보건산업진흥원', '정보통신산업진흥원']
+
+# 정적 리소스 (리소스 차단 효과를 재기 위해 페이지마다 참조)
+SYNTHETIC_ASSETS = {
+    '/css/common.css': ('text/css', b'body{margin:0}' * 200),
+    '/js/common.js': ('application/javascript', b'window.kstartup={};'),
+    '/images/logo.png': ('image/png', b'\x89PNG\r\n\x1a\n' + b'\0' * 4000),
+}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """요청 경로를 저장된 HTML 파일로 연결하는 핸들러"""
+
+    protocol_version = 'HTTP/1.1'  # keep-alive 연결 재사용 확인용
+    pages_dir = '.'
+
+    def resolve_page(self) -> Optional[str]:
+        parts = urlsplit(self.path)
+        if parts.path != LIST_PATH:
+            return None
+        query = parse_qs(parts.query)
+        if query.get('schM', [''])[0] == 'view':
+            return f"detail_{query.get('pbancSn', [''])[0]}.html"
+        return f"list_{query.get('page', ['1'])[0]}.html"
+
+    def do_GET(self):
+        filename = self.resolve_page()
+        path = os.path.join(self.pages_dir, filename) if filename else None
+        if not path or not os.path.isfile(path):
+            self.send_error(404)
+            return
+
+        with open(path, 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class SyntheticSite:
+    """목록/상세 페이지를 실제 사이트와 같은 마크업으로 만들어 내는 가상 사이트
+
+    같은 seed이면 같은 공고와 같은 오류 순서를 만들어 벤치마크를 반복할 수 있습니다.
+    """
+
+    def __init__(self, count: int = 1000, per_page: int = 15, latency_ms: float = 0.0,
+                 jitter_ms: float = 0.0, error_rate: float = 0.0, seed: int = 1):
+        """
+        Args:
+            count: 공고 수
+            per_page: 목록 페이지당 공고 수
+            latency_ms: 페이지 응답마다 더할 지연 시간
+            jitter_ms: 지연 시간에 더할 무작위 편차의 최댓값
+            error_rate: 페이지 요청이 500 오류로 실패할 확률 (같은 URL의 다음 요청은 다시 추첨)
+            seed: 공고 내용과 지연/오류 추첨에 쓸 시드
+        """
+        self.count = count
+        self.per_page = max(1, per_page)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.seed = seed
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def page_count(self) -> int:
+        return (self.count + self.per_page - 1) // self.per_page
+
+    def _rng(self, *key) -> random.Random:
+        return random.Random(':'.join(str(k) for k in (self.seed,) + key))
+
+    def announcement(self, index: int) -> Dict[str, str]:
+        """index번째 가상 공고 (0부터)"""
+        rng = self._rng('ann', index)
+        topic = rng.choice(SYNTHETIC_TOPICS)
+        start = (index % 28) + 1
+        body = f"{topic} 분야 창업기업을 대상으로 사업화 자금과 전문가 멘토링을 지원합니다. " * 12
+        return {
+            'pbanc_sn': str(SYNTHETIC_FIRST_SN + index),
+            'title': f"2026년 {topic} 창업기업 지원사업 {index + 1}차 모집 공고",
+            'support_field': rng.choice(SYNTHETIC_FIELDS),
+            'age_range': rng.choice(SYNTHETIC_AGES),
+            'target': rng.choice(SYNTHETIC_TARGETS),
+            'business_years': rng.choice(SYNTHETIC_YEARS),
+            'region': rng.choice(SYNTHETIC_REGIONS),
+            'application_period': f"2026-11-{start:02d} ~ 2026-12-{start:02d} 18:00",
+            'organization': rng.choice(SYNTHETIC_ORGS),
+            'contact': f"02-{1000 + index % 9000}-{rng.randint(1000, 9999)}",
+            'content': body,
+        }
+
+    def list_html(self, page_num: int) -> str:
+        """목록 페이지 (.basic_item 카드 안의 pbancSn 링크)"""
+        first = (page_num - 1) * self.per_page
+        items = []
+        for index in range(max(first, 0), min(first + self.per_page, self.count)):
+            ann = self.announcement(index)
+            items.append(
+                '<li class="notice"><div class="basic_item">'
+                f'<span class="flag">{html.escape(ann["support_field"])}</span>'
+                f'<a href="{LIST_PATH}?schM=view&amp;pbancSn={ann["pbanc_sn"]}&amp;page={page_num}">'
+                f'<p class="tit">{html.escape(ann["title"])}</p></a>'
+                f'<span class="list">{html.escape(ann["organization"])}</span>'
+                '</div></li>'
+            )
+        return self._document(
+            '사업공고 | K-Startup',
+            '<div class="board_list-wrap"><ul class="link_box-list">' + ''.join(items) + '</ul></div>'
+            + self.pager_html(page_num)
+        )
+
+    def pager_html(self, page_num: int) -> str:
+        """실제 사이트처럼 10페이지 단위 번호 블록과 다음/마지막 링크로 된 페이저"""
+        last = self.page_count
+        block_start = (max(page_num, 1) - 1) // 10 * 10 + 1
+        links = []
+        for number in range(block_start, min(block_start + 9, last) + 1):
+            if number == page_num:
+                links.append(f'<strong class="on">{number}</strong>')
+            else:
+                links.append(f'<a href="{LIST_PATH}?page={number}">{number}</a>')
+        if page_num < last:
+            links.append(f'<a class="next" href="{LIST_PATH}?page={page_num + 1}">다음</a>')
+            links.append(f'<a class="last" href="{LIST_PATH}?page={last}">마지막</a>')
+        return '<div class="paginate">' + ''.join(links) + '</div>'
+
+    def detail_html(self, pbanc_sn: str) -> Optional[str]:
+        """상세 페이지 (h3 제목, 라벨/값 p 두 개로 된 정보 li 행, .ann_cont 본문)"""
+        if not pbanc_sn.isdigit() or not 0 <= int(pbanc_sn) - SYNTHETIC_FIRST_SN < self.count:
+            return None
+        ann = self.announcement(int(pbanc_sn) - SYNTHETIC_FIRST_SN)
+        rows = [
+            ('지원분야', 'support_field'), ('대상연령', 'age_range'), ('대상', 'target'),
+            ('창업업력', 'business_years'), ('지역', 'region'), ('접수기간', 'application_period'),
+            ('주관기관명', 'organization'), ('연락처', 'contact'),
+        ]
+        info = ''.join(
+            f'<li><p class="tit">{label}</p><p class="txt">{html.escape(ann[field])}</p></li>'
+            for label, field in rows
+        )
+        return self._document(
+            ann['title'],
+            f'<div class="title"><h3>{html.escape(ann["title"])}</h3></div>'
+            f'<ul class="bg_box">{info}</ul>'
+            f'<div class="ann_cont"><p>{html.escape(ann["content"])}</p></div>'
+        )
+
+    @staticmethod
+    def _document(title: str, body: str) -> str:
+        return (
+            '<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8">'
+            f'<title>{html.escape(title)}</title>'
+            '<link rel="stylesheet" href="/css/common.css">'
+            '<script src="/js/common.js"></script></head>'
+            '<body><header><img src="/images/logo.png" alt="K-Startup">'
+            '<ul class="gnb"><li><a href="/">홈</a></li><li><a href="/web/contents/bizpbanc-ongoing.do">사업공고</a></li></ul>'
+            f'</header><main id="contents">{body}</main></body></html>'
+        )
+
+    def delay_and_fail(self, path: str) -> bool:
+        """요청 경로에 지연을 주고, 오류를 낼 차례이면 True를 돌려줍니다"""
+        with self._lock:
+            attempt = self._attempts.get(path, 0)
+            self._attempts[path] = attempt + 1
+        rng = self._rng('req', path, attempt)
+        delay = self.latency_ms + rng.random() * self.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return rng.random() < self.error_rate
+
+    def render(self, path: str) -> Optional[Tuple[str, bytes]]:
+        """요청 경로의 (Content-Type, 본문), 없는 경로면 None"""
+        parts = urlsplit(path)
+        if parts.path in SYNTHETIC_ASSETS:
+            return SYNTHETIC_ASSETS[parts.path]
+        if parts.path != LIST_PATH:
+            return None
+        query = parse_qs(parts.query)
+        if query.get('schM', [''])[0] == 'view':
+            body = self.detail_html(query.get('pbancSn', [''])[0])
+        else:
+            page = query.get('page', ['1'])[0]
+            body = self.list_html(int(page)) if page.isdigit() else None
+        return ('text/html; charset=utf-8', body.encode('utf-8')) if body is not None else None
+
+
+class SyntheticHandler(BaseHTTPRequestHandler):
+    """SyntheticSite가 만든 페이지를 제공하는 핸들러"""
+
+    protocol_version = 'HTTP/1.1'
+    site: SyntheticSite = None
+
+    def do_GET(self):
+        rendered = self.site.render(self.path)
+        if rendered is None:
+            self.send_error(404)
+            return
+        content_type, body = rendered
+        # 정적 리소스에는 지연/오류를 주입하지 않음
+        if content_type.startswith('text/html') and self.site.delay_and_fail(self.path):
+            self.send_error(500)
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_synthetic_server(site: SyntheticSite, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 가상 사이트 서버를 시작합니다 (port=0이면 빈 포트 사용)"""
+    handler = type('BoundSyntheticHandler', (SyntheticHandler,), {'site': site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_fixture_server(pages_dir: str, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """백그라운드 스레드에서 대체 서버를 시작합니다 (port=0이면 빈 포트 사용)"""
+    handler = type('BoundFixtureHandler', (FixtureHandler,), {'pages_dir': pages_dir})
+    server = ThreadingHTTPServer((host, port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description='저장된 K-Startup 페이지를 제공하는 로컬 서버')
+    parser.add_argument('pages_dir', nargs='?', help='list_<page>.html, detail_<pbancSn>.html 파일이 있는 디렉터리')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--synthetic', type=int, metavar='N', help='저장된 파일 대신 가상 공고 N개를 제공합니다')
+    parser.add_argument('--per-page', type=int, default=15, help='가상 목록 페이지당 공고 수 (기본값: 15)')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='가상 페이지 응답 지연 (밀리초)')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='응답 지연에 더할 무작위 편차 최댓값 (밀리초)')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='가상 페이지 요청이 500 오류로 실패할 확률')
+    parser.add_argument('--seed', type=int, default=1, help='가상 공고와 지연/오류 추첨 시드 (기본값: 1)')
+    args = parser.parse_args()
+
+    if args.synthetic:
+        site = SyntheticSite(args.synthetic, args.per_page, args.latency_ms, args.jitter_ms,
+                             args.error_rate, args.seed)
+        handler = type('BoundSyntheticHandler', (SyntheticHandler,), {'site': site})
+        source = f"가상 공고 {site.count}개 ({site.page_count}페이지)"
+    elif args.pages_dir:
+        handler = type('BoundFixtureHandler', (FixtureHandler,), {'pages_dir': args.pages_dir})
+        source = args.pages_dir
+    else:
+        parser.error('pages_dir 또는 --synthetic 중 하나가 필요합니다')
+
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"http://{args.host}:{args.port}{LIST_PATH} 에서 {source} 제공 중 (Ctrl+C로 종료)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,354 @@
+"""
+K-Startup 공고 상세 페이지 HTTP 수집 모듈
+브라우저 없이 keep-alive HTTP 연결 풀로 상세 페이지를 받아 HTML을 직접 파싱합니다.
+서버 렌더링 HTML에 필요한 필드가 없으면 None을 돌려주어 Playwright 경로로 넘깁니다.
+
+사용 예 (로컬 서버에 저장된 페이지로 확인):
+    python kstartup_http.py http://127.0.0.1:8000/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn=175799
+"""
+
+import gzip
+import http.client
+import json
+import queue
+import re
+import sys
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from html.parser import HTMLParser
+from typing import List, Dict, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+from kstartup_metrics import default_metrics
+from kstartup_record import DETAIL_FIELDS, Announcement, scraped_at_now
+from kstartup_throttle import default_scheduler
+
+# 이 중 하나라도 채워져 있어야 서버 렌더링 HTML을 신뢰합니다
+INFO_FIELDS = [
+    'support_field', 'target', 'business_years', 'region',
+    'application_period', 'organization'
+]
+
+# 첨부파일 링크로 보는 href (다운로드 경로 또는 문서 확장자, 추출 모듈에서도 같은 패턴 사용)
+ATTACHMENT_HREF = re.compile(r'download|filedown|atchfile|\.(?:pdf|hwpx?|docx?|xlsx?|pptx?|zip)(?:$|[?#])', re.I)
+
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+})
+
+
+def label_to_field(label: str) -> Optional[str]:
+    """정보 항목 라벨을 필드명으로 바꿉니다 (검사 순서는 추출 스크립트와 동일)"""
+    if '지원분야' in label:
+        return 'support_field'
+    if '대상연령' in label:
+        return 'age_range'
+    if '대상' in label:
+        return 'target'
+    if '창업업력' in label or '업력' in label:
+        return 'business_years'
+    if '지역' in label:
+        return 'region'
+    if '접수기간' in label:
+        return 'application_period'
+    if '주관기관' in label or '기관명' in label:
+        return 'organization'
+    if '연락처' in label:
+        return 'contact'
+    return None
+
+
+class DetailHTMLParser(HTMLParser):
+    """상세 페이지 HTML에서 제목, 정보 li 행, 본문을 한 번에 추출하는 파서"""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.info = {field: '' for field in DETAIL_FIELDS}
+
+        self._title_parts: Optional[List[str]] = None
+        self._title_done = False
+        self._title_depth = 0
+
+        self._content_parts: Optional[List[str]] = None
+        self._content_done = False
+        self._content_tag = ''
+        self._content_depth = 0
+
+        # 열린 li마다 그 안의 p 텍스트 목록을 쌓습니다
+        self._li_stack: List[List[List[str]]] = []
+        self._open_p: Optional[List[str]] = None
+
+        # 첨부파일 링크 (href, 링크 텍스트)
+        self.attachments: List[Tuple[str, str]] = []
+        self._open_link: Optional[Tuple[str, List[str]]] = None
+
+    @staticmethod
+    def _is_content_element(attrs) -> bool:
+        classes = dict(attrs).get('class') or ''
+        return 'ann_cont' in classes.split() or 'content' in classes
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'h3' and not self._title_done:
+            if self._title_parts is None:
+                self._title_parts = []
+            self._title_depth += 1
+
+        if self._content_parts is not None and tag == self._content_tag and tag not in VOID_ELEMENTS:
+            self._content_depth += 1
+        elif (not self._content_done and self._content_parts is None
+              and tag not in VOID_ELEMENTS and self._is_content_element(attrs)):
+            self._content_parts = []
+            self._content_tag = tag
+            self._content_depth = 1
+
+        if tag == 'a':
+            href = (dict(attrs).get('href') or '').strip()
+            if href and not href.startswith('javascript:') and ATTACHMENT_HREF.search(href):
+                self._open_link = (href, [])
+
+        if tag == 'li':
+            self._open_p = None
+            self._li_stack.append([])
+        elif tag == 'p' and self._li_stack:
+            self._open_p = []
+            self._li_stack[-1].append(self._open_p)
+
+    def handle_endtag(self, tag):
+        if tag == 'h3' and self._title_parts is not None and not self._title_done:
+            self._title_depth -= 1
+            if self._title_depth <= 0:
+                self.info['title'] = ''.join(self._title_parts).strip()
+                self._title_done = True
+
+        if self._content_parts is not None and tag == self._content_tag:
+            self._content_depth -= 1
+            if self._content_depth <= 0:
+                self.info['content'] = ''.join(self._content_parts)[:500].strip()
+                self._content_parts = None
+                self._content_done = True
+
+        if tag == 'a' and self._open_link is not None:
+            href, parts = self._open_link
+            self.attachments.append((href, ' '.join(''.join(parts).split())))
+            self._open_link = None
+
+        if tag == 'p':
+            self._open_p = None
+        elif tag == 'li' and self._li_stack:
+            self._open_p = None
+            self._finish_li(self._li_stack.pop())
+
+    def handle_data(self, data):
+        if self._title_parts is not None and not self._title_done:
+            self._title_parts.append(data)
+        if self._content_parts is not None:
+            self._content_parts.append(data)
+        if self._open_p is not None:
+            self._open_p.append(data)
+        if self._open_link is not None:
+            self._open_link[1].append(data)
+
+    def _finish_li(self, paragraphs: List[List[str]]):
+        if not paragraphs:
+            return
+        label = ''.join(paragraphs[0]).strip()
+        value = ''.join(paragraphs[-1]).strip()
+        field = label_to_field(label)
+        if field:
+            self.info[field] = value
+
+    def close(self):
+        super().close()
+        if self._content_parts is not None:
+            self.info['content'] = ''.join(self._content_parts)[:500].strip()
+            self._content_parts = None
+
+
+def parse_detail_html(html: str) -> Dict:
+    """상세 페이지 HTML을 추출 스크립트와 같은 형태의 dict로 바꿉니다"""
+    parser = DetailHTMLParser()
+    parser.feed(html)
+    parser.close()
+    info = parser.info
+    if parser.attachments:
+        seen = set()
+        info['attachments'] = []
+        for href, name in parser.attachments:
+            if href not in seen:
+                seen.add(href)
+                info['attachments'].append({'name': name, 'url': href})
+    return info
+
+
+def has_required_fields(detail: Dict) -> bool:
+    """서버 렌더링 HTML만으로 충분한 정보가 추출되었는지 확인"""
+    return bool(detail.get('title')) and any(detail.get(field) for field in INFO_FIELDS)
+
+
+class HttpStatusError(http.client.HTTPException):
+    """2xx가 아닌 응답 (status로 재시도 여부를 판단)"""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+
+
+class HttpClient:
+    """호스트별 keep-alive 연결을 재사용하는 간단한 HTTP 클라이언트 (스레드 안전)"""
+
+    def __init__(self, max_connections: int = 8, timeout: float = 15.0,
+                 user_agent: str = 'Mozilla/5.0', max_redirects: int = 3):
+        """
+        Args:
+            max_connections: 호스트별로 유지할 최대 유휴 연결 수
+            timeout: 연결/응답 타임아웃 (초)
+            user_agent: 요청에 사용할 User-Agent
+            max_redirects: 따라갈 최대 리다이렉트 횟수
+        """
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.max_redirects = max_redirects
+        self._pools: Dict[Tuple[str, str, int], queue.LifoQueue] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, key) -> queue.LifoQueue:
+        with self._lock:
+            if key not in self._pools:
+                self._pools[key] = queue.LifoQueue(maxsize=self.max_connections)
+            return self._pools[key]
+
+    def _new_connection(self, scheme: str, host: str, port: int):
+        if scheme == 'https':
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key):
+        try:
+            return self._pool(key).get_nowait(), True
+        except queue.Empty:
+            return self._new_connection(*key), False
+
+    def _release(self, key, conn):
+        try:
+            self._pool(key).put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _request_once(self, url: str) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        key = (scheme, parts.hostname, port)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = {
+            'User-Agent': self.user_agent,
+            'Accept': 'text/html,application/xhtml+xml',
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        }
+
+        # 재사용한 연결이 서버 쪽에서 끊겼을 수 있으므로 새 연결로 한 번 더 시도
+        for attempt in range(2):
+            conn, reused = self._acquire(key)
+            try:
+                conn.request('GET', path, headers=headers)
+                response = conn.getresponse()
+                body = response.read()
+            except (http.client.HTTPException, ConnectionError, OSError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            response_headers = {k.lower(): v for k, v in response.getheaders()}
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+            return response.status, response_headers, body
+        raise ConnectionError(f"요청 실패: {url}")
+
+    @staticmethod
+    def _decode(headers: Dict[str, str], body: bytes) -> str:
+        encoding = headers.get('content-encoding', '')
+        if encoding == 'gzip':
+            body = gzip.decompress(body)
+        elif encoding == 'deflate':
+            body = zlib.decompress(body)
+        charset = 'utf-8'
+        content_type = headers.get('content-type', '')
+        if 'charset=' in content_type:
+            charset = content_type.split('charset=')[-1].split(';')[0].strip() or charset
+        return body.decode(charset, errors='replace')
+
+    def get_text(self, url: str) -> str:
+        """URL의 본문을 문자열로 받습니다 (2xx가 아니면 예외)"""
+        for _ in range(self.max_redirects + 1):
+            status, headers, body = self._request_once(url)
+            if status in (301, 302, 303, 307, 308) and headers.get('location'):
+                url = urljoin(url, headers['location'])
+                continue
+            if not 200 <= status < 300:
+                raise HttpStatusError(status, url)
+            return self._decode(headers, body)
+        raise http.client.HTTPException(f"리다이렉트가 너무 많습니다: {url}")
+
+    def close(self):
+        with self._lock:
+            pools = list(self._pools.values())
+            self._pools = {}
+        for pool in pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+
+def fetch_detail_http(client: HttpClient, url: str) -> Optional[Announcement]:
+    """HTTP로 상세 정보를 추출합니다
+
+    Returns:
+        추출한 공고. 요청이 실패했거나 서버 렌더링 HTML에 필드가 없으면 None
+        (이 경우 호출한 쪽에서 Playwright로 다시 수집합니다)
+    """
+    try:
+        with default_metrics.time('fetch', 'detail'):
+            html = default_scheduler.call(client.get_text, url)
+        with default_metrics.time('extract', 'detail_http'):
+            detail = parse_detail_html(html)
+    except Exception as e:
+        print(f"  HTTP 수집 실패, 브라우저로 재시도: {e}")
+        default_metrics.increment('http_details', result='error')
+        return None
+
+    if not has_required_fields(detail):
+        default_metrics.increment('http_details', result='fallback')
+        return None
+
+    default_metrics.increment('http_details', result='ok')
+    for attachment in detail.get('attachments', []):
+        attachment['url'] = urljoin(url, attachment['url'])
+    return Announcement(url=url, scraped_at=scraped_at_now(), **detail)
+
+
+def fetch_details_http(client: HttpClient, urls: List[str], max_workers: int = 8) -> List[Optional[Announcement]]:
+    """여러 상세 페이지를 스레드 풀로 동시에 수집합니다 (결과는 urls 순서)"""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(lambda url: fetch_detail_http(client, url), urls))
+
+
+if __name__ == '__main__':
+    client = HttpClient()
+    try:
+        for url in sys.argv[1:]:
+            result = fetch_detail_http(client, url)
+            print(json.dumps(result.to_dict() if result else None, ensure_ascii=False, indent=2))
+    finally:
+        client.close()
@@ -0,0 +1,273 @@
+"""
+K-Startup 공고 매칭 도구 모듈
+여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤과
+업력 문자열("3년미만", "7년이상", "전체" 등)을 숫자 범위로 바꾸는 파서,
+여러 회사 프로필을 한 번에 매칭하는 ProfileMatcher를 제공합니다.
+"""
+
+import math
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+class FilterResult(NamedTuple):
+    """공고 하나에 대한 필터 판정 결과"""
+    matched: bool
+    keywords: List[str]   # 제목/지원분야/본문/대상에서 찾은 지원분야 키워드
+    reasons: List[str]    # 판정 근거
+
+
+# 업력 범위: [하한, 상한) 반개구간 (년 단위, 상한 없음은 math.inf)
+YearsRange = Tuple[float, float]
+
+ANY_YEARS: YearsRange = (0.0, math.inf)
+
+# "3-7년", "3~7년", "3년~7년"
+_SPAN_PATTERN = re.compile(r'(\d+)\s*년?\s*[-~]\s*(\d+)\s*년')
+# "3년미만", "7년 이상", "5년"
+_YEARS_PATTERN = re.compile(r'(\d+)\s*년\s*(미만|이하|이상|초과)?')
+
+
+@lru_cache(maxsize=4096)
+def parse_years_range(text: Optional[str]) -> Optional[YearsRange]:
+    """공고의 업력 조건을 [하한, 상한) 범위로 바꿉니다
+
+    여러 조건이 나열되어 있으면("1년미만,3년미만,7년미만") 전체를 감싸는 범위를 돌려줍니다.
+    같은 문자열은 한 번만 파싱합니다.
+
+    Returns:
+        "전체"이면 ANY_YEARS, 숫자 조건이 없으면 None (판단 불가)
+    """
+    if not text:
+        return None
+    if '전체' in text:
+        return ANY_YEARS
+
+    ranges: List[YearsRange] = []
+    for start, end in _SPAN_PATTERN.findall(text):
+        ranges.append((float(start), float(end) + 1))
+    remaining = _SPAN_PATTERN.sub(' ', text)
+
+    for number, qualifier in _YEARS_PATTERN.findall(remaining):
+        n = float(number)
+        if qualifier == '미만':
+            ranges.append((0.0, n))
+        elif qualifier == '이하':
+            ranges.append((0.0, n + 1))
+        elif qualifier == '이상':
+            ranges.append((n, math.inf))
+        elif qualifier == '초과':
+            ranges.append((n + 1, math.inf))
+        else:
+            ranges.append((n, n + 1))
+
+    if not ranges:
+        return None
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+
+def parse_company_years(text: Optional[str]) -> Optional[YearsRange]:
+    """회사 업력 조건("5-7년", "5년 이상", "3년")을 범위로 바꿉니다 (없으면 None)"""
+    if not text or '전체' in text:
+        return None
+    return parse_years_range(text)
+
+
+def ranges_overlap(a: YearsRange, b: YearsRange) -> bool:
+    return a[0] < b[1] and b[0] < a[1]
+
+
+class KeywordAutomaton:
+    """여러 키워드를 텍스트 한 번 훑기로 찾는 Aho-Corasick 오토마톤 (대소문자 무시)"""
+
+    def __init__(self, keywords: Sequence[str]):
+        self.keywords = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+
+        for index, keyword in enumerate(self.keywords):
+            node = 0
+            for char in keyword.lower():
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(set())
+                node = nxt
+            if keyword:
+                self._out[node].add(index)
+
+        # 너비 우선으로 실패 링크 계산
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child] |= self._out[self._fail[child]]
+
+    def find(self, text: str) -> Set[int]:
+        """텍스트에 나타나는 키워드의 인덱스 집합"""
+        found: Set[int] = set()
+        if not self.keywords:
+            return found
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for char in text.lower():
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if out[node]:
+                found |= out[node]
+        return found
+
+    def find_keywords(self, text: str) -> List[str]:
+        """텍스트에 나타나는 키워드 (등록 순서)"""
+        return [self.keywords[i] for i in sorted(self.find(text))]
+
+
+def search_text(announcement: Dict) -> str:
+    """키워드를 찾을 텍스트 (제목, 지원분야, 본문, 대상)"""
+    return ' '.join((
+        announcement.get('title') or '',
+        announcement.get('support_field') or '',
+        announcement.get('content') or '',
+        announcement.get('target') or '',
+    ))
+
+
+# 업력 버킷의 마지막 칸 (이 값 이상은 모두 같은 칸)
+MAX_YEARS_BUCKET = 50
+
+
+def _buckets(years_range: YearsRange) -> range:
+    low = min(int(years_range[0]), MAX_YEARS_BUCKET)
+    high = min(math.ceil(years_range[1]) if years_range[1] != math.inf else MAX_YEARS_BUCKET + 1,
+               MAX_YEARS_BUCKET + 1)
+    return range(low, max(high, low + 1))
+
+
+class ProfileMatcher:
+    """여러 회사 프로필(CompanyFilter)을 공고 목록과 한 번에 매칭하는 클래스
+
+    모든 프로필의 키워드를 하나의 오토마톤으로 합쳐 공고마다 한 번만 훑고,
+    키워드 → 프로필, 업력 버킷 → 프로필 인덱스로 후보를 좁혀
+    매칭될 수 있는 프로필만 판정합니다.
+
+    키워드 인덱스는 require_keywords인 프로필만 걸러 냅니다. 키워드가 필수가 아닌 프로필은
+    업력만 맞으면 매칭되므로 업력 버킷으로만 좁혀지고, 이런 프로필이 많으면 매칭 결과 자체가
+    공고 수 × 프로필 수에 가까워집니다 (CompanyFilter에는 업력과 키워드 외의 판정 조건이 없음).
+    optional_profiles로 이런 프로필의 이름을 알 수 있습니다.
+    """
+
+    def __init__(self, profiles: Dict[str, object]):
+        """
+        Args:
+            profiles: {프로필 이름: CompanyFilter} (support_fields, business_years,
+                require_keywords 속성을 가진 객체)
+        """
+        self.names = list(profiles)
+        self.profiles = [profiles[name] for name in self.names]
+        all_ids = set(range(len(self.profiles)))
+
+        # 키워드 인덱스: 합친 오토마톤의 키워드 번호 → 프로필 번호
+        keywords: List[str] = []
+        keyword_ids: Dict[str, int] = {}
+        self._keyword_profiles: List[Set[int]] = []
+        self._profile_keywords: List[Dict[int, str]] = []
+        self._keyword_optional: Set[int] = set()
+        for pid, profile in enumerate(self.profiles):
+            fields = list(getattr(profile, 'support_fields', None) or [])
+            if not fields or not getattr(profile, 'require_keywords', False):
+                self._keyword_optional.add(pid)
+            own = {}
+            for keyword in fields:
+                key = keyword.lower()
+                if key not in keyword_ids:
+                    keyword_ids[key] = len(keywords)
+                    keywords.append(keyword)
+                    self._keyword_profiles.append(set())
+                self._keyword_profiles[keyword_ids[key]].add(pid)
+                own[keyword_ids[key]] = keyword
+            self._profile_keywords.append(own)
+        self._automaton = KeywordAutomaton(keywords)
+
+        # 업력 인덱스: 버킷 → 그 업력을 허용하는 프로필 번호
+        self._profile_years: List[Optional[YearsRange]] = []
+        self._years_free: Set[int] = set()
+        self._year_buckets: List[Set[int]] = [set() for _ in range(MAX_YEARS_BUCKET + 1)]
+        for pid, profile in enumerate(self.profiles):
+            years = parse_company_years(getattr(profile, 'business_years', None))
+            self._profile_years.append(years)
+            if years is None:
+                self._years_free.add(pid)
+                continue
+            for bucket in _buckets(years):
+                self._year_buckets[bucket].add(pid)
+        self._all_ids = all_ids
+        self._years_candidates_cache: Dict[YearsRange, Set[int]] = {}
+        self._optional_cache: Dict[YearsRange, Set[int]] = {}
+
+    @property
+    def optional_profiles(self) -> List[str]:
+        """키워드 인덱스로 걸러지지 않는 (키워드가 필수가 아닌) 프로필 이름"""
+        return [self.names[pid] for pid in sorted(self._keyword_optional)]
+
+    def _years_candidates(self, years_range: Optional[YearsRange]) -> Set[int]:
+        """공고의 업력 범위를 통과하는 프로필 (같은 범위는 한 번만 계산)"""
+        if years_range is None or years_range == ANY_YEARS:
+            return self._all_ids
+        cached = self._years_candidates_cache.get(years_range)
+        if cached is None:
+            cached = set(self._years_free)
+            for bucket in _buckets(years_range):
+                cached |= self._year_buckets[bucket]
+            self._years_candidates_cache[years_range] = cached
+        return cached
+
+    def _optional_candidates(self, years_range: Optional[YearsRange], years_ok: Set[int]) -> Set[int]:
+        """키워드가 필수가 아니면서 업력 범위를 통과하는 프로필 (같은 범위는 한 번만 계산)"""
+        key = years_range or ANY_YEARS
+        cached = self._optional_cache.get(key)
+        if cached is None:
+            cached = self._optional_cache[key] = self._keyword_optional & years_ok
+        return cached
+
+    def match(self, announcements: List[Dict]) -> Dict[str, List[Tuple[Dict, FilterResult]]]:
+        """모든 프로필에 대해 공고를 한 번에 매칭합니다
+
+        Returns:
+            {프로필 이름: [(공고, 판정 결과), ...]} - 공고 순서 유지, 매칭된 공고만 포함
+        """
+        results: Dict[str, List[Tuple[Dict, FilterResult]]] = {name: [] for name in self.names}
+        for ann in announcements:
+            hit_ids = self._automaton.find(search_text(ann)) if self._automaton.keywords else set()
+
+            years_text = ann.get('business_years') or ''
+            years_range = parse_years_range(years_text)
+            years_ok = self._years_candidates(years_range)
+
+            # 키워드가 필수가 아닌 프로필 + 찾은 키워드를 가진 프로필 중 업력이 맞는 것
+            candidates = self._optional_candidates(years_range, years_ok)
+            for keyword_id in hit_ids:
+                matched_ids = self._keyword_profiles[keyword_id] & years_ok
+                if matched_ids:
+                    candidates = candidates | matched_ids
+
+            for pid in sorted(candidates):
+                own = self._profile_keywords[pid]
+                hits = [own[k] for k in sorted(hit_ids) if k in own]
+                reasons = [f"키워드: {', '.join(hits)}"] if hits else []
+                if self._profile_years[pid] is not None and years_range is not None:
+                    reasons.append(f"업력 조건 일치: {years_text}")
+                results[self.names[pid]].append((ann, FilterResult(True, hits, reasons)))
+        return results
@@ -0,0 +1,265 @@
+"""
+K-Startup 크롤링 단계별 계측 모듈
+이동(navigate), 대기(wait), 추출(extract), HTTP 수집(fetch), 필터(filter), 저장(save) 단계의
+소요 시간을 페이지 유형별 히스토그램으로, 처리 건수를 카운터로 기록하고
+실행이 끝나면 JSON과 Prometheus 텍스트 형식 파일로 남깁니다.
+느린 페이지 N개의 Playwright 트레이스를 남기는 SlowPageTracer도 제공합니다.
+"""
+
+import heapq
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+
+
+# 히스토그램 버킷 상한 (초)
+BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# 백분위수 계산용으로 (단계, 페이지 유형)마다 남기는 표본 수
+RESERVOIR_SIZE = 1024
+
+METRIC_PREFIX = 'kstartup'
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """횟수와 p50/p90/p99/최댓값 (nearest-rank)"""
+    if not values:
+        return {'count': 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        index = max(0, min(len(ordered) - 1, math.ceil(p / 100 * len(ordered)) - 1))
+        return round(ordered[index], 1)
+
+    return {'count': len(ordered), 'p50': rank(50), 'p90': rank(90), 'p99': rank(99),
+            'max': round(ordered[-1], 1)}
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+class DurationSeries:
+    """한 (단계, 페이지 유형)의 소요 시간 집계 (메모리 사용량 고정)
+
+    횟수, 합계, 최댓값과 히스토그램 버킷은 모든 관측값으로 정확히 세고,
+    백분위수는 크기가 고정된 균등 표본(reservoir sampling)에서 계산합니다.
+    """
+
+    def __init__(self, size: int = RESERVOIR_SIZE):
+        self.size = size
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        # BUCKETS 상한별 누적 횟수
+        self.buckets = [0] * len(BUCKETS)
+        self.samples: List[float] = []
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        if len(self.samples) < self.size:
+            self.samples.append(seconds)
+        else:
+            # 지금까지 본 값들이 모두 같은 확률로 표본에 남도록 교체
+            slot = random.randrange(self.count)
+            if slot < self.size:
+                self.samples[slot] = seconds
+
+    def copy(self) -> 'DurationSeries':
+        series = DurationSeries(self.size)
+        series.count, series.total, series.max = self.count, self.total, self.max
+        series.buckets = list(self.buckets)
+        series.samples = list(self.samples)
+        return series
+
+
+class Metrics:
+    """단계별 지연 시간 히스토그램과 카운터 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (단계, 페이지 유형) -> 소요 시간 집계 (초)
+        self.durations: Dict[Tuple[str, str], DurationSeries] = {}
+        # (이름, 레이블) -> 값
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], int] = {}
+
+    def observe(self, stage: str, page_type: str, seconds: float):
+        with self._lock:
+            series = self.durations.get((stage, page_type))
+            if series is None:
+                series = self.durations[(stage, page_type)] = DurationSeries()
+            series.add(seconds)
+
+    def increment(self, name: str, amount: int = 1, **labels: str):
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    @contextmanager
+    def time(self, stage: str, page_type: str = 'all'):
+        """with 블록의 소요 시간을 기록합니다 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, page_type, time.perf_counter() - start)
+
+    def summary(self) -> Dict:
+        """JSON으로 남길 요약: 단계/페이지 유형별 횟수, 합계, 백분위수(ms)와 카운터"""
+        with self._lock:
+            durations = {key: series.copy() for key, series in self.durations.items()}
+            counters = dict(self.counters)
+
+        stages = {}
+        for (stage, page_type), series in sorted(durations.items()):
+            stats = percentiles([v * 1000 for v in series.samples])
+            # 횟수와 최댓값은 표본이 아니라 전체 관측값 기준
+            stats['count'] = series.count
+            stats['max'] = round(series.max * 1000, 1)
+            stats['total_ms'] = round(series.total * 1000, 1)
+            stats['avg_ms'] = round(series.total * 1000 / series.count, 1)
+            stages.setdefault(stage, {})[page_type] = stats
+
+        return {
+            'stages': stages,
+            'counters': [
+                {'name': name, 'labels': dict(labels), 'value': value}
+                for (name, labels), value in sorted(counters.items())
+            ],
+        }
+
+    def to_prometheus(self) -> str:
+        """Prometheus 텍스트 형식 (node_exporter textfile collector로 수집 가능)"""
+        with self._lock:
+            durations = {key: series.copy() for key, series in self.durations.items()}
+            counters = dict(self.counters)
+
+        lines = []
+        name = f'{METRIC_PREFIX}_stage_duration_seconds'
+        lines.append(f'# HELP {name} Time spent per crawl stage and page type.')
+        lines.append(f'# TYPE {name} histogram')
+        for (stage, page_type), series in sorted(durations.items()):
+            labels = (('page_type', page_type), ('stage', stage))
+            for bound, count in zip(BUCKETS, series.buckets):
+                lines.append(f'{name}_bucket{_label_text(labels + (("le", repr(bound)),))} {count}')
+            lines.append(f'{name}_bucket{_label_text(labels + (("le", "+Inf"),))} {series.count}')
+            lines.append(f'{name}_sum{_label_text(labels)} {series.total:.6f}')
+            lines.append(f'{name}_count{_label_text(labels)} {series.count}')
+
+        declared = set()
+        for (counter, labels), value in sorted(counters.items()):
+            metric = f"{METRIC_PREFIX}_{re.sub(r'[^a-zA-Z0-9_]', '_', counter)}_total"
+            if metric not in declared:
+                lines.append(f'# TYPE {metric} counter')
+                declared.add(metric)
+            lines.append(f'{metric}{_label_text(labels)} {value}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, prefix: str = 'kstartup_metrics'):
+        """<prefix>.json과 <prefix>.prom 파일로 저장합니다"""
+        with open(f'{prefix}.json', 'w', encoding='utf-8') as f:
+            json.dump(self.summary(), f, ensure_ascii=False, indent=2)
+        # 수집기가 쓰다 만 파일을 읽지 않도록 바꿔치기
+        tmp_path = f'{prefix}.prom.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_path, f'{prefix}.prom')
+        print(f"단계별 계측 결과가 {prefix}.json, {prefix}.prom에 저장되었습니다.")
+
+    def print_summary(self):
+        stages = self.summary()['stages']
+        if not stages:
+            return
+        print("\n단계별 소요 시간:")
+        for stage, by_type in stages.items():
+            for page_type, stats in by_type.items():
+                print(f"  - {stage}/{page_type}: {stats['count']}회, 합계 {stats['total_ms'] / 1000:.1f}초, "
+                      f"p50 {stats['p50']}ms, p90 {stats['p90']}ms, 최대 {stats['max']}ms")
+
+
+# 별도로 지정하지 않으면 사용하는 기본 기록기
+default_metrics = Metrics()
+
+
+class SlowPageTracer:
+    """가장 느린 페이지 N개의 Playwright 트레이스만 남기는 기록기 (동기 API)
+
+    컨텍스트 트레이싱을 한 번 시작해 두고 페이지마다 청크를 나누어 저장한 뒤,
+    느린 순서로 N개 안에 들지 못한 청크 파일은 바로 지웁니다.
+    """
+
+    def __init__(self, slowest: int = 5, directory: str = 'traces'):
+        self.slowest = max(1, slowest)
+        self.directory = directory
+        self._kept: List[Tuple[float, int, str]] = []  # (소요 시간, 순번, 경로) 최소 힙
+        self._sequence = 0
+        self._context = None
+
+    def start(self, context):
+        os.makedirs(self.directory, exist_ok=True)
+        context.tracing.start(screenshots=True, snapshots=True)
+        self._context = context
+
+    @contextmanager
+    def capture(self, page_type: str, label: str):
+        """with 블록 동안의 트레이스 청크를 기록합니다"""
+        context = self._context
+        if context is None:
+            yield
+            return
+        context.tracing.start_chunk(title=f'{page_type} {label}')
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            # 기록 중에 컨텍스트가 바뀌었으면(페이지 재활용) 이 청크는 남기지 않음
+            if self._context is context:
+                self._save_chunk(page_type, label, time.perf_counter() - start)
+
+    def _save_chunk(self, page_type: str, label: str, elapsed: float):
+        self._sequence += 1
+        safe_label = re.sub(r'[^0-9A-Za-z_-]', '_', label)[-40:]
+        path = os.path.join(self.directory, f'{page_type}_{self._sequence:05d}_{safe_label}.zip')
+        self._context.tracing.stop_chunk(path=path)
+        self._keep(elapsed, path)
+
+    def _keep(self, elapsed: float, path: str):
+        entry = (elapsed, self._sequence, path)
+        if len(self._kept) < self.slowest:
+            heapq.heappush(self._kept, entry)
+            return
+        evicted = heapq.heappushpop(self._kept, entry)
+        if os.path.exists(evicted[2]):
+            os.remove(evicted[2])
+
+    def stop(self):
+        if self._context is None:
+            return
+        try:
+            self._context.tracing.stop()
+        finally:
+            self._context = None
+
+    def print_summary(self):
+        if not self._kept:
+            return
+        print(f"\n가장 느린 페이지 {len(self._kept)}개의 트레이스 ({self.directory}):")
+        for elapsed, _, path in sorted(self._kept, reverse=True):
+            print(f"  - {elapsed:.2f}초: {path} (playwright show-trace {path})")
@@ -0,0 +1,225 @@
+"""
+K-Startup 파이프라인 크롤링 모듈
+목록 수집, 상세 수집, 필터/저장을 동시에 진행하는 단계로 나누어 큐로 잇고, 처리 중인 공고 수를 제한합니다.
+
+    목록 단계 ──(작업 큐)──> 상세 워커 N개 ──(결과 큐)──> 출력 단계 (순서 정렬, JSONL 기록, 필터)
+
+- 목록 단계는 상세 워커가 앞 페이지의 공고를 처리하는 동안 다음 목록 페이지를 미리 읽습니다.
+  분류 코드마다 페이저의 마지막 페이지까지 읽고, 여러 분류 코드에 함께 올라온 공고는 한 번만 넘깁니다.
+- 처리 중인 공고 수(작업 큐 + 워커 + 정렬 대기)는 max_in_flight개로 제한되어, 상세 수집이나
+  출력이 밀리면 목록 단계가 기다립니다.
+- 출력 단계는 목록 순서대로 JSONL에 기록하고, 조건에 맞는 공고는 바로
+  kstartup_filtered.json/csv에 이어 씁니다. 다운로더가 주어지면 첨부파일 받기를 맡깁니다.
+"""
+
+import asyncio
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from playwright.async_api import async_playwright
+
+from kstartup_attachments import AttachmentDownloader
+from kstartup_async import PagePool, collect_list_page_async, scrape_announcement_detail_async
+from kstartup_browser import connect_or_launch_async
+from kstartup_crawl import DEFAULT_CATEGORIES, ListPager, mark_duplicates
+from kstartup_http import HttpClient, fetch_detail_http
+from kstartup_metrics import default_metrics
+from kstartup_resources import ResourcePolicy
+from kstartup_sink import JsonlSink, StreamingExport
+from kstartup_state import CrawlState
+
+
+async def _supervise(tasks: List[asyncio.Task]):
+    """모든 단계가 끝날 때까지 기다리고, 한 단계라도 실패하면 나머지를 취소합니다"""
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in done:
+            if not task.cancelled() and task.exception():
+                raise task.exception()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def crawl_pipelined_async(start_page: int, end_page: Optional[int], sink: JsonlSink,
+                                pbanc_clss_cds: Optional[List[str]] = None,
+                                concurrency: int = 4,
+                                max_in_flight: int = 32,
+                                resource_policy: Optional[ResourcePolicy] = None,
+                                http_client: Optional[HttpClient] = None,
+                                crawl_state: Optional[CrawlState] = None,
+                                matches: Optional[Callable[[Dict], bool]] = None,
+                                filtered_prefix: str = 'kstartup_filtered',
+                                downloader: Optional[AttachmentDownloader] = None) -> Tuple[int, List[Dict]]:
+    """목록/상세/출력 단계를 겹쳐 실행합니다
+
+    Returns:
+        (이번 실행에서 기록한 공고 수, 조건에 맞는 공고 목록)
+    """
+    resource_policy = resource_policy or ResourcePolicy()
+    pbanc_clss_cds = pbanc_clss_cds or DEFAULT_CATEGORIES
+    concurrency = max(1, concurrency)
+
+    # 큐 길이는 in_flight 세마포어가 제한하므로 큐 자체는 크기 제한 없이 둠 (종료 신호가 막히지 않게)
+    jobs: asyncio.Queue = asyncio.Queue()
+    results: asyncio.Queue = asyncio.Queue()
+    max_in_flight = max(concurrency, max_in_flight)
+    in_flight = asyncio.Semaphore(max_in_flight)
+    started = time.perf_counter()
+    filtered: List[Dict] = []
+    written = 0
+    # 목록 페이지마다 마지막 작업의 순번 (출력 단계가 이 순번을 기록하면 상태 저장)
+    page_ends = set()
+
+    async with async_playwright() as p:
+        browser = await connect_or_launch_async(p)
+        # 목록 단계용 페이지 하나 + 상세 워커마다 하나
+        pool = PagePool(browser, size=concurrency + 1, resource_policy=resource_policy)
+        filtered_export = StreamingExport(f'{filtered_prefix}.json', f'{filtered_prefix}.csv') if matches else None
+
+        async def list_stage():
+            sequence = 0
+            seen = sink.recorded_keys()
+            try:
+                for category, pbanc_clss_cd in enumerate(pbanc_clss_cds):
+                    if sink.skips_category(category):
+                        continue
+                    pager = ListPager(sink.resume_page(start_page, category), end_page)
+                    for page_num in pager.pages():
+                        print(f"\n[{pbanc_clss_cd}] 페이지 {pager.label(page_num)} 목록 수집 중...")
+                        try:
+                            links, page_count = await pool.run(collect_list_page_async, page_num, pbanc_clss_cd)
+                        except Exception as e:
+                            print(f"페이지 {page_num} 처리 중 오류: {e}")
+                            if crawl_state:
+                                crawl_state.mark_list_error()
+                            continue
+                        pager.update(page_num, links, page_count)
+
+                        print(f"  발견된 공고: {len(links)}개")
+                        if crawl_state:
+                            crawl_state.mark_listed(links)
+                        duplicates = mark_duplicates(links, seen)
+                        cached = crawl_state.prefill(links) if crawl_state else [None] * len(links)
+                        page_start = sequence
+                        for index, link_info in enumerate(links):
+                            # 이어서 실행하는 경우 체크포인트 이전 공고와 다른 분류 코드에서 이미 나온 공고는 건너뜀
+                            if index in duplicates or sink.should_skip(page_num, index, category):
+                                continue
+                            # 출력 단계가 밀려 있으면 여기서 기다림 (역압)
+                            await in_flight.acquire()
+                            jobs.put_nowait((sequence, (page_num, index, category), link_info, cached[index]))
+                            sequence += 1
+                        # 마지막 put_nowait 뒤로는 await가 없어 출력 단계가 이 순번을 지나치기 전에 표시됨
+                        if crawl_state and sequence > page_start:
+                            page_ends.add(sequence - 1)
+
+                        if crawl_state and crawl_state.all_known(links):
+                            print("  목록의 공고가 모두 이미 수집된 공고입니다. 이 분류 코드의 페이징을 중단합니다.")
+                            break
+
+                    if crawl_state and pager.exhausted:
+                        crawl_state.mark_list_end(pbanc_clss_cd)
+            finally:
+                for _ in range(concurrency):
+                    jobs.put_nowait(None)
+
+        remaining_workers = concurrency
+
+        async def detail_worker():
+            nonlocal remaining_workers
+            try:
+                while True:
+                    job = await jobs.get()
+                    if job is None:
+                        return
+                    sequence, position, link_info, cached = job
+                    if cached is not None:
+                        results.put_nowait((sequence, position, cached, True))
+                        continue
+
+                    # 목록 응답에 상세 필드까지 있었으면 방문하지 않음
+                    detail = link_info.get('detail')
+                    if detail is None and http_client:
+                        detail = await asyncio.to_thread(fetch_detail_http, http_client, link_info['url'])
+                    if detail is None:
+                        detail = await pool.run(scrape_announcement_detail_async, link_info['url'])
+                    detail['pbanc_sn'] = link_info.get('pbanc_sn')
+                    results.put_nowait((sequence, position, detail, False))
+            finally:
+                remaining_workers -= 1
+                if remaining_workers == 0:
+                    results.put_nowait(None)
+
+        async def output_stage():
+            nonlocal written
+            # 목록 순서대로 기록해 체크포인트가 앞으로만 움직이게 함
+            ready: Dict[int, Tuple] = {}
+            next_sequence = 0
+            while True:
+                item = await results.get()
+                if item is None:
+                    return
+                ready[item[0]] = item
+                while next_sequence in ready:
+                    _, position, record, reused = ready.pop(next_sequence)
+                    next_sequence += 1
+                    in_flight.release()
+
+                    if crawl_state and not reused:
+                        crawl_state.update(record.get('pbanc_sn'), record)
+                    sink.write(record, *position)
+                    written += 1
+                    if downloader:
+                        # 첨부파일 대기 작업이 많으면 여기서 기다림 (역압)
+                        await asyncio.to_thread(downloader.submit, record)
+                    suffix = ' (이미 수집됨)' if reused else ''
+                    page_num, index, _ = position
+                    print(f"  [{page_num}-{index + 1}] {record.get('title', '')[:50]}...{suffix}")
+
+                    if filtered_export and matches(record):
+                        if not filtered:
+                            elapsed = time.perf_counter() - started
+                            default_metrics.observe('first_match', 'pipeline', elapsed)
+                            print(f"  -> 첫 번째 조건 일치 공고를 {elapsed:.1f}초 만에 기록했습니다.")
+                        filtered_export.write(record)
+                        filtered_export.flush()
+                        filtered.append(record)
+
+                    # 순차 크롤러처럼 목록 페이지 하나가 끝날 때마다 상태 저장
+                    if next_sequence - 1 in page_ends:
+                        page_ends.discard(next_sequence - 1)
+                        crawl_state.save()
+
+        try:
+            await pool.open()
+            print(f"\n파이프라인 크롤링 시작 (상세 워커 {concurrency}개, 처리 중 최대 {max_in_flight}개)...")
+            tasks = [asyncio.create_task(list_stage()), asyncio.create_task(output_stage())]
+            tasks += [asyncio.create_task(detail_worker()) for _ in range(concurrency)]
+            await _supervise(tasks)
+        finally:
+            if filtered_export:
+                filtered_export.close()
+            if crawl_state:
+                crawl_state.save()
+            await pool.close()
+            await browser.close()
+
+    return written, filtered
+
+
+def crawl_pipelined(start_page: int, end_page: Optional[int], sink: JsonlSink,
+                    pbanc_clss_cds: Optional[List[str]] = None,
+                    concurrency: int = 4,
+                    max_in_flight: int = 32,
+                    resource_policy: Optional[ResourcePolicy] = None,
+                    http_client: Optional[HttpClient] = None,
+                    crawl_state: Optional[CrawlState] = None,
+                    matches: Optional[Callable[[Dict], bool]] = None,
+                    downloader: Optional[AttachmentDownloader] = None) -> Tuple[int, List[Dict]]:
+    """파이프라인 크롤러를 동기 코드에서 호출하기 위한 진입점"""
+    return asyncio.run(crawl_pipelined_async(
+        start_page, end_page, sink, pbanc_clss_cds, concurrency, max_in_flight,
+        resource_policy, http_client, crawl_state, matches, downloader=downloader
+    ))
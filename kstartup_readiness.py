@@ -0,0 +1,164 @@
+"""
+K-Startup 페이지 준비 상태 대기 모듈
+고정된 wait_for_timeout 대신, 페이지 유형별 표식 요소가 나타나고
+DOM 변경이 잠잠해질 때까지만 기다립니다.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import List, Dict, Optional
+
+
+@dataclass
+class ReadinessProfile:
+    """페이지 유형별 대기 조건"""
+    markers: List[str]        # 하나라도 나타나면 준비된 것으로 보는 선택자
+    quiet_ms: int = 300       # 마지막 DOM 변경 이후 이만큼 조용하면 완료
+    deadline_ms: int = 10000  # 최대 대기 시간
+    scroll: bool = False      # 동적 로드를 유도하기 위해 끝까지 스크롤할지 여부
+
+
+READINESS_PROFILES: Dict[str, ReadinessProfile] = {
+    # 메인 페이지: "신규 사업 공고" 섹션의 공고 링크
+    'main': ReadinessProfile(
+        markers=['a[href*="pbancSn="]'],
+        quiet_ms=300,
+        deadline_ms=10000,
+    ),
+    # 목록 페이지: 공고 카드 또는 pbancSn 링크
+    'list': ReadinessProfile(
+        markers=['.basic_item', 'a[href*="pbancSn"]', '.list_item', '.link_box-list a', '.text_list a'],
+        quiet_ms=500,
+        deadline_ms=15000,
+        scroll=True,
+    ),
+    # 상세 페이지: 정보 li 행 또는 본문
+    'detail': ReadinessProfile(
+        markers=['li p:last-child', '.ann_cont'],
+        quiet_ms=200,
+        deadline_ms=8000,
+    ),
+}
+
+# 페이지 안에서 표식 요소와 DOM 안정화를 기다리는 스크립트
+WAIT_SCRIPT = """
+    async ({markers, quietMs, deadlineMs, scroll}) => {
+        const start = performance.now();
+        const findMarker = () => markers.find(selector => document.querySelector(selector)) || null;
+
+        let lastMutation = performance.now();
+        const observer = new MutationObserver(() => { lastMutation = performance.now(); });
+        observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+
+        if (scroll && document.body) {
+            window.scrollTo(0, document.body.scrollHeight);
+        }
+
+        let marker = null;
+        try {
+            while (performance.now() - start < deadlineMs) {
+                marker = marker || findMarker();
+                if (marker && performance.now() - lastMutation >= quietMs) {
+                    break;
+                }
+                await new Promise(resolve => setTimeout(resolve, 50));
+            }
+        } finally {
+            observer.disconnect();
+            if (scroll) {
+                window.scrollTo(0, 0);
+            }
+        }
+
+        marker = marker || findMarker();
+        const elapsed = performance.now() - start;
+        return {
+            marker: marker,
+            page_elapsed_ms: Math.round(elapsed),
+            timed_out: elapsed >= deadlineMs
+        };
+    }
+"""
+
+
+class ReadinessTracker:
+    """페이지 유형별로 실제 대기 시간을 기록하는 클래스"""
+
+    def __init__(self):
+        self.waits: Dict[str, List[Dict]] = {}
+
+    def record(self, page_type: str, result: Dict):
+        self.waits.setdefault(page_type, []).append(result)
+
+    def summary(self) -> Dict[str, Dict]:
+        """페이지 유형별 대기 횟수, 평균/최대 대기 시간, 시간 초과 횟수"""
+        summary = {}
+        for page_type, results in self.waits.items():
+            elapsed = [r['elapsed_ms'] for r in results]
+            summary[page_type] = {
+                'count': len(results),
+                'total_ms': round(sum(elapsed)),
+                'avg_ms': round(sum(elapsed) / len(elapsed)),
+                'max_ms': round(max(elapsed)),
+                'timeouts': sum(1 for r in results if r.get('timed_out')),
+            }
+        return summary
+
+    def print_summary(self):
+        summary = self.summary()
+        if not summary:
+            return
+        print("\n페이지 대기 시간 요약:")
+        for page_type, stats in summary.items():
+            print(f"  - {page_type}: {stats['count']}회, 평균 {stats['avg_ms']}ms, "
+                  f"최대 {stats['max_ms']}ms, 시간 초과 {stats['timeouts']}회")
+
+
+# 별도로 지정하지 않으면 사용하는 기본 기록기
+default_tracker = ReadinessTracker()
+
+
+def _wait_args(profile: ReadinessProfile) -> Dict:
+    return {
+        'markers': profile.markers,
+        'quietMs': profile.quiet_ms,
+        'deadlineMs': profile.deadline_ms,
+        'scroll': profile.scroll,
+    }
+
+
+def _finish(page_type: str, result: Optional[Dict], started: float,
+            tracker: Optional[ReadinessTracker]) -> Dict:
+    result = dict(result or {})
+    result['page_type'] = page_type
+    result['elapsed_ms'] = (time.perf_counter() - started) * 1000
+    (tracker or default_tracker).record(page_type, result)
+    return result
+
+
+def wait_until_ready(page, page_type: str, tracker: Optional[ReadinessTracker] = None) -> Dict:
+    """페이지가 준비될 때까지 기다리고 대기 결과를 반환합니다
+
+    시간 초과가 나도 예외를 던지지 않습니다. 추출은 그대로 진행하고,
+    결과의 timed_out 값으로 확인할 수 있습니다.
+    """
+    profile = READINESS_PROFILES[page_type]
+    started = time.perf_counter()
+    try:
+        result = page.evaluate(WAIT_SCRIPT, _wait_args(profile))
+    except Exception as e:
+        # 대기 도중 페이지가 이동하면 컨텍스트가 사라질 수 있음
+        result = {'marker': None, 'timed_out': True, 'error': str(e)}
+    return _finish(page_type, result, started, tracker)
+
+
+async def wait_until_ready_async(page, page_type: str,
+                                 tracker: Optional[ReadinessTracker] = None) -> Dict:
+    """wait_until_ready의 비동기 버전"""
+    profile = READINESS_PROFILES[page_type]
+    started = time.perf_counter()
+    try:
+        result = await page.evaluate(WAIT_SCRIPT, _wait_args(profile))
+    except Exception as e:
+        result = {'marker': None, 'timed_out': True, 'error': str(e)}
+    return _finish(page_type, result, started, tracker)
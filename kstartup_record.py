@@ -0,0 +1,145 @@
+"""
+K-Startup 공고 레코드 모듈
+수집 경로(브라우저 추출, HTTP, 응답 수집, 메인 페이지)가 모두 같은 고정 스키마의 Announcement를
+만들고, 저장 함수는 스키마를 미리 알고 있으므로 레코드를 한 번만 훑으며 씁니다.
+
+- __slots__로 레코드마다 dict를 두지 않아 많은 공고를 메모리에 둘 때 크기가 줄어듭니다.
+- 지역, 주관기관, 지원분야처럼 같은 값이 반복되는 필드는 문자열을 intern 하여 한 벌만 둡니다.
+- 상세 정보 추출에 실패한 공고는 error 필드를 가진 FailedAnnouncement로 구분합니다.
+- 기존 dict 레코드를 다루던 코드(get, [], dict(record))가 그대로 동작하도록 매핑처럼도 읽힙니다.
+"""
+
+import csv
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Union
+
+
+# 상세 페이지 정보 항목 (브라우저 추출, HTTP 수집, 응답 수집이 모두 같은 순서로 채움)
+DETAIL_FIELDS = [
+    'title', 'support_field', 'age_range', 'target', 'business_years',
+    'region', 'application_period', 'organization', 'contact', 'content'
+]
+
+# 같은 값이 여러 공고에 반복되는 필드 (문자열을 intern 하여 공유)
+INTERNED_FIELDS = frozenset({'support_field', 'age_range', 'target', 'business_years', 'region', 'organization'})
+
+# JSON 저장 순서 (attachments, error는 값이 있을 때만 씀)
+RECORD_FIELDS = DETAIL_FIELDS + ['url', 'scraped_at', 'pbanc_sn', 'attachments']
+
+# CSV 열 (이름순, 첨부파일 목록은 CSV에 쓰지 않음)
+CSV_FIELDS = sorted(DETAIL_FIELDS + ['url', 'scraped_at', 'pbanc_sn', 'error'])
+
+_timestamp = [0, '']
+
+
+def scraped_at_now() -> str:
+    """수집 시각 문자열 (같은 초 안에서는 한 번 만든 문자열을 재사용)"""
+    second = int(time.time())
+    if _timestamp[0] != second:
+        _timestamp[0] = second
+        _timestamp[1] = sys.intern(datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S'))
+    return _timestamp[1]
+
+
+class Announcement:
+    """공고 하나 (고정 스키마)"""
+
+    __slots__ = tuple(RECORD_FIELDS)
+
+    def __init__(self, **fields):
+        for field in DETAIL_FIELDS:
+            self[field] = fields.pop(field, '')
+        self.url = fields.pop('url', '') or ''
+        self.scraped_at = fields.pop('scraped_at', '') or ''
+        self.pbanc_sn = fields.pop('pbanc_sn', None)
+        self.attachments = fields.pop('attachments', None) or []
+        if fields:
+            raise TypeError(f"알 수 없는 공고 필드: {', '.join(sorted(fields))}")
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Announcement':
+        """JSON/JSONL에서 읽은 dict를 레코드로 바꿉니다 (스키마에 없는 키는 버림)"""
+        if isinstance(data, Announcement):
+            return data
+        fields = {field: data[field] for field in RECORD_FIELDS if data.get(field) is not None}
+        if data.get('error'):
+            return FailedAnnouncement(error=data['error'], **fields)
+        return cls(**fields)
+
+    # dict 레코드를 다루던 코드와 호환되는 매핑 인터페이스
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: str, value: Any):
+        if key in INTERNED_FIELDS and isinstance(value, str):
+            value = sys.intern(value)
+        try:
+            setattr(self, key, value)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def keys(self) -> List[str]:
+        keys = DETAIL_FIELDS + ['url', 'scraped_at', 'pbanc_sn']
+        if self.attachments:
+            keys = keys + ['attachments']
+        return keys
+
+    def to_dict(self) -> Dict:
+        return {key: getattr(self, key) for key in self.keys()}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Announcement):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(pbanc_sn={self.pbanc_sn!r}, title={self.title[:30]!r})"
+
+
+class FailedAnnouncement(Announcement):
+    """상세 정보 추출에 실패한 공고 (error에 실패 사유)"""
+
+    __slots__ = ('error',)
+
+    def __init__(self, error: str = '', **fields):
+        super().__init__(**fields)
+        self.error = error
+
+    def keys(self) -> List[str]:
+        return super().keys() + ['error']
+
+
+Record = Union[Announcement, Dict]
+
+
+def to_dict(record: Record) -> Dict:
+    """JSON으로 쓸 수 있는 dict (이미 dict면 그대로)"""
+    return record.to_dict() if isinstance(record, Announcement) else record
+
+
+def csv_row(record: Record, fields: List[str] = CSV_FIELDS) -> List:
+    """고정 열 순서의 CSV 행"""
+    get = record.get
+    return [_csv_value(get(field)) for field in fields]
+
+
+def _csv_value(value: Any) -> Any:
+    return '' if value is None else value
+
+
+def write_csv(f, records, fields: List[str] = CSV_FIELDS):
+    """열을 미리 정해 두고 레코드를 한 번만 훑으며 CSV로 씁니다"""
+    writer = csv.writer(f)
+    writer.writerow(fields)
+    writer.writerows(csv_row(record, fields) for record in records)
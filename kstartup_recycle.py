@@ -0,0 +1,237 @@
+"""
+K-Startup 페이지/컨텍스트 재활용 모듈
+긴 크롤링에서 같은 페이지로 계속 이동하면 Chromium 렌더러 메모리가 계속 늘어나므로,
+일정 횟수만큼 이동한 컨텍스트나 브라우저 메모리(RSS)가 한도를 넘었을 때 컨텍스트를 닫고
+새로 만듭니다. 렌더러가 비정상 종료(crash)되면 새 컨텍스트에서 같은 URL을 한 번 더 시도합니다.
+
+- PageRecycler: 동기 크롤러(순차 실행, 분산 워커)가 쓰는 페이지 하나를 관리합니다.
+- 비동기 크롤러의 PagePool(kstartup_async.py)은 같은 RecyclePolicy로 풀의 페이지를 교체합니다.
+- 메모리는 CDP SystemInfo.getProcessInfo로 브라우저/렌더러 프로세스 ID를 얻어
+  /proc/<pid>/statm의 RSS를 합산합니다 (같은 호스트의 Linux에서만, 그 밖에는 횟수 기준만 사용).
+"""
+
+import os
+from typing import Any, Callable, Dict, Optional
+
+from kstartup_capture import default_capture
+from kstartup_metrics import default_metrics
+
+
+MB = 1024 * 1024
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+# 렌더러/컨텍스트가 죽었을 때 Playwright 예외 메시지에 들어 있는 문구
+CRASH_MESSAGES = ('Target crashed', 'Page crashed', 'has been closed', 'Target closed')
+
+
+def is_crash_error(error: Exception) -> bool:
+    message = str(error)
+    return any(text in message for text in CRASH_MESSAGES)
+
+
+def process_rss_mb(pid: int) -> Optional[float]:
+    """프로세스의 RSS (MB, 읽을 수 없으면 None)"""
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            return int(f.read().split()[1]) * PAGE_SIZE / MB
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class BrowserMemory:
+    """브라우저와 렌더러 프로세스의 RSS 합계를 읽는 측정기"""
+
+    def __init__(self):
+        self.available = True
+        self.samples = 0
+        self.last_mb = 0.0
+        self.peak_mb = 0.0
+        self._session = None
+
+    def _disable(self, reason: str):
+        self.available = False
+        print(f"브라우저 메모리를 측정할 수 없어 이동 횟수 기준으로만 재활용합니다: {reason}")
+
+    def _total(self, info: Dict) -> Optional[float]:
+        sizes = [process_rss_mb(process['id']) for process in info.get('processInfo', [])]
+        sizes = [size for size in sizes if size is not None]
+        if not sizes:
+            self._disable('프로세스 RSS를 읽지 못했습니다 (원격 브라우저이거나 Linux가 아님)')
+            return None
+        self.samples += 1
+        self.last_mb = sum(sizes)
+        self.peak_mb = max(self.peak_mb, self.last_mb)
+        return self.last_mb
+
+    def sample(self, browser) -> Optional[float]:
+        """현재 RSS 합계 (MB, 동기 API)"""
+        if not self.available:
+            return None
+        try:
+            if self._session is None:
+                self._session = browser.new_browser_cdp_session()
+            info = self._session.send('SystemInfo.getProcessInfo')
+        except Exception as e:
+            self._disable(str(e))
+            return None
+        return self._total(info)
+
+    async def sample_async(self, browser) -> Optional[float]:
+        if not self.available:
+            return None
+        try:
+            if self._session is None:
+                self._session = await browser.new_browser_cdp_session()
+            info = await self._session.send('SystemInfo.getProcessInfo')
+        except Exception as e:
+            self._disable(str(e))
+            return None
+        return self._total(info)
+
+
+class RecyclePolicy:
+    """컨텍스트를 언제 새로 만들지 정하고 재활용 횟수를 모으는 정책"""
+
+    def __init__(self, max_navigations: int = 200, max_rss_mb: float = 0.0, check_every: int = 20):
+        self.memory = BrowserMemory()
+        self.recycled = {'navigations': 0, 'memory': 0, 'crash': 0}
+        self.navigations = 0
+        self.configure(max_navigations, max_rss_mb, check_every)
+
+    def configure(self, max_navigations: int = 200, max_rss_mb: float = 0.0, check_every: int = 20):
+        """
+        Args:
+            max_navigations: 컨텍스트 하나로 이동할 최대 횟수 (0이면 횟수로는 재활용하지 않음)
+            max_rss_mb: 브라우저 전체 RSS가 이 값(MB)을 넘으면 재활용 (0이면 사용 안 함)
+            check_every: 이동 이 횟수마다 메모리를 측정 (0이면 측정 안 함)
+        """
+        self.max_navigations = max(0, max_navigations)
+        self.max_rss_mb = max(0.0, max_rss_mb)
+        self.check_every = max(0, check_every)
+
+    @property
+    def settings(self) -> Dict:
+        """다른 프로세스에서 같은 정책을 만들 때 쓰는 configure 인자"""
+        return {
+            'max_navigations': self.max_navigations,
+            'max_rss_mb': self.max_rss_mb,
+            'check_every': self.check_every,
+        }
+
+    def navigation_limit_reached(self, navigations: int) -> bool:
+        return bool(self.max_navigations) and navigations >= self.max_navigations
+
+    def _sample_due(self) -> bool:
+        self.navigations += 1
+        return bool(self.check_every) and self.navigations % self.check_every == 0
+
+    def _over_memory(self, rss: Optional[float]) -> bool:
+        return rss is not None and bool(self.max_rss_mb) and rss > self.max_rss_mb
+
+    def memory_exceeded(self, browser) -> bool:
+        """이동하기 전에 호출합니다. 측정 주기가 되면 RSS를 읽어 한도를 넘었는지 알려줍니다"""
+        return self._sample_due() and self._over_memory(self.memory.sample(browser))
+
+    async def memory_exceeded_async(self, browser) -> bool:
+        return self._sample_due() and self._over_memory(await self.memory.sample_async(browser))
+
+    def record(self, reason: str):
+        self.recycled[reason] += 1
+        default_metrics.increment('context_recycles', reason=reason)
+
+    def print_summary(self):
+        if not any(self.recycled.values()) and not self.memory.samples:
+            return
+        print("\n페이지/컨텍스트 재활용:")
+        labels = {'navigations': '이동 횟수', 'memory': '메모리 한도', 'crash': '렌더러 종료'}
+        for reason, label in labels.items():
+            print(f"  - {label}: {self.recycled[reason]}회")
+        if self.memory.samples:
+            print(f"  - 브라우저 RSS: 마지막 {self.memory.last_mb:.0f}MB, 최대 {self.memory.peak_mb:.0f}MB "
+                  f"({self.memory.samples}회 측정)")
+
+
+class PageRecycler:
+    """동기 크롤러의 페이지 하나를 주기적으로 새 컨텍스트의 페이지로 바꿔 주는 관리자
+
+    open_context는 리소스 정책, 추출 모듈 등을 설치한 새 컨텍스트를 돌려주는 함수이고,
+    close_context는 컨텍스트를 닫기 전에 할 일(트레이스 종료 등)을 포함해 닫는 함수입니다.
+    """
+
+    def __init__(self, browser, open_context: Callable[[], Any],
+                 close_context: Optional[Callable[[Any], None]] = None,
+                 policy: Optional[RecyclePolicy] = None):
+        self.browser = browser
+        self.open_context = open_context
+        self.close_context = close_context or (lambda context: context.close())
+        self.policy = policy or default_recycling
+        self.context = None
+        self.navigations = 0
+        self._page = None
+        self._crashed = False
+
+    @property
+    def page(self):
+        """현재 페이지 (없으면 새 컨텍스트를 만들어 엶)"""
+        if self._page is None:
+            self.context = self.open_context()
+            self._page = self.context.new_page()
+            self._page.on('crash', self._on_crash)
+            self.navigations = 0
+            self._crashed = False
+        return self._page
+
+    def _on_crash(self, page):
+        self._crashed = True
+
+    def _discard(self):
+        page, context = self._page, self.context
+        self._page = self.context = None
+        if page is None:
+            return
+        default_capture.reset(page)
+        try:
+            self.close_context(context)
+        except Exception as e:
+            # 렌더러가 죽은 컨텍스트는 닫다가 실패할 수 있음
+            print(f"  컨텍스트 종료 중 오류 (무시): {e}")
+
+    def recycle(self, reason: str):
+        """현재 컨텍스트를 닫습니다 (다음 page 접근 때 새로 만듦)"""
+        if self._page is not None:
+            self.policy.record(reason)
+            self._discard()
+
+    def run(self, func: Callable, *args):
+        """func(page, *args)를 실행합니다
+
+        이동 횟수나 메모리 한도에 걸리면 먼저 컨텍스트를 바꾸고, 실행 중 렌더러가 죽으면
+        새 컨텍스트에서 같은 인자(같은 URL)로 한 번 더 실행합니다.
+        """
+        if self._crashed:
+            self.recycle('crash')
+        elif self.policy.navigation_limit_reached(self.navigations):
+            self.recycle('navigations')
+        elif self.policy.memory_exceeded(self.browser):
+            self.recycle('memory')
+
+        for attempt in (1, 2):
+            page = self.page
+            self.navigations += 1
+            try:
+                result = func(page, *args)
+            except Exception as e:
+                if attempt == 2 or not (self._crashed or is_crash_error(e)):
+                    raise
+            else:
+                if attempt == 2 or not self._crashed:
+                    return result
+            print("  브라우저 페이지가 비정상 종료되어 새 컨텍스트에서 다시 시도합니다...")
+            self.recycle('crash')
+
+    def close(self):
+        self._discard()
+
+
+# 별도로 지정하지 않으면 사용하는 기본 정책
+default_recycling = RecyclePolicy()
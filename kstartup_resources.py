@@ -0,0 +1,143 @@
+"""
+K-Startup 크롤링용 리소스 차단 정책 모듈
+추출에 필요 없는 이미지, 폰트, 스타일시트, 외부 추적 스크립트 요청을
+브라우저 컨텍스트 단계에서 차단하고 절감량을 집계합니다.
+"""
+
+import os
+from typing import Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+
+# 추출에 필요한 리소스 유형 (목록은 스크립트/XHR로 동적 로드됨)
+DEFAULT_ALLOWED_TYPES = frozenset({'document', 'script', 'xhr', 'fetch'})
+
+# 요청을 허용할 호스트 (하위 도메인 포함)
+# KSTARTUP_BASE_URL로 대체 서버(kstartup_fixture_server.py)를 가리키면 그 호스트도 허용
+_BASE_HOST = urlparse(os.environ.get('KSTARTUP_BASE_URL', '')).hostname
+DEFAULT_ALLOWED_HOSTS = frozenset({'k-startup.go.kr'} | ({_BASE_HOST} if _BASE_HOST else set()))
+
+# 차단한 요청의 대략적인 크기 (절감 바이트 추정용)
+ESTIMATED_SIZES = {
+    'image': 40_000,
+    'font': 60_000,
+    'stylesheet': 30_000,
+    'media': 500_000,
+    'script': 50_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+DEFAULT_ESTIMATED_SIZE = 10_000
+
+
+class ResourcePolicy:
+    """리소스 유형과 호스트 허용 목록으로 요청을 걸러내는 정책"""
+
+    def __init__(self,
+                 allowed_types: Optional[Iterable[str]] = None,
+                 allowed_hosts: Optional[Iterable[str]] = None,
+                 enabled: bool = True):
+        """
+        Args:
+            allowed_types: 허용할 Playwright resource_type 목록
+            allowed_hosts: 허용할 호스트 목록 (하위 도메인도 허용)
+            enabled: False이면 모든 요청을 허용하고 집계만 합니다
+        """
+        self.allowed_types = frozenset(allowed_types or DEFAULT_ALLOWED_TYPES)
+        self.allowed_hosts = frozenset(h.lower() for h in (allowed_hosts or DEFAULT_ALLOWED_HOSTS))
+        self.enabled = enabled
+
+        self.allowed_requests = 0
+        self.loaded_bytes = 0
+        self.blocked_by_type: Dict[str, int] = {}
+        self.blocked_by_host: Dict[str, int] = {}
+        self.estimated_saved_bytes = 0
+
+    def _host_allowed(self, host: str) -> bool:
+        host = host.lower()
+        return any(host == allowed or host.endswith('.' + allowed) for allowed in self.allowed_hosts)
+
+    def allows(self, resource_type: str, url: str) -> bool:
+        """요청을 통과시킬지 판단합니다"""
+        if not self.enabled:
+            return True
+        parsed = urlparse(url)
+        if parsed.scheme in ('data', 'blob'):
+            return True
+        return resource_type in self.allowed_types and self._host_allowed(parsed.hostname or '')
+
+    def _decide(self, request) -> bool:
+        resource_type = request.resource_type
+        if self.allows(resource_type, request.url):
+            self.allowed_requests += 1
+            return True
+
+        host = urlparse(request.url).hostname or ''
+        self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+        self.blocked_by_host[host] = self.blocked_by_host.get(host, 0) + 1
+        self.estimated_saved_bytes += ESTIMATED_SIZES.get(resource_type, DEFAULT_ESTIMATED_SIZE)
+        return False
+
+    def _on_response(self, response):
+        length = response.headers.get('content-length')
+        if length and length.isdigit():
+            self.loaded_bytes += int(length)
+
+    def _handle_route(self, route):
+        if self._decide(route.request):
+            route.continue_()
+        else:
+            route.abort()
+
+    async def _handle_route_async(self, route):
+        if self._decide(route.request):
+            await route.continue_()
+        else:
+            await route.abort()
+
+    def install(self, context):
+        """동기 브라우저 컨텍스트에 정책을 적용합니다"""
+        context.on('response', self._on_response)
+        if self.enabled:
+            context.route('**/*', self._handle_route)
+
+    async def install_async(self, context):
+        """비동기 브라우저 컨텍스트에 정책을 적용합니다"""
+        context.on('response', self._on_response)
+        if self.enabled:
+            await context.route('**/*', self._handle_route_async)
+
+    @property
+    def blocked_requests(self) -> int:
+        return sum(self.blocked_by_type.values())
+
+    def summary(self) -> Dict:
+        return {
+            'allowed_requests': self.allowed_requests,
+            'loaded_bytes': self.loaded_bytes,
+            'blocked_requests': self.blocked_requests,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'blocked_by_host': dict(self.blocked_by_host),
+            'estimated_saved_bytes': self.estimated_saved_bytes,
+        }
+
+    def print_summary(self):
+        if not self.enabled:
+            print(f"\n리소스 차단 비활성화: 수신 {self.loaded_bytes / 1024:.0f}KB")
+            return
+        print("\n리소스 차단 요약:")
+        print(f"  - 허용 요청: {self.allowed_requests}개 (수신 {self.loaded_bytes / 1024:.0f}KB)")
+        print(f"  - 차단 요청: {self.blocked_requests}개 "
+              f"(약 {self.estimated_saved_bytes / 1024:.0f}KB 절감 추정)")
+        for resource_type, count in sorted(self.blocked_by_type.items(), key=lambda x: -x[1]):
+            print(f"    · {resource_type}: {count}개")
+        top_hosts = sorted(self.blocked_by_host.items(), key=lambda x: -x[1])[:5]
+        if top_hosts:
+            print("  - 차단이 많은 호스트: " + ", ".join(f"{h} ({c})" for h, c in top_hosts))
+
+
+def parse_csv_option(value: Optional[str]) -> Optional[list]:
+    """쉼표로 구분한 명령행 값을 목록으로 바꿉니다"""
+    if not value:
+        return None
+    return [item.strip() for item in value.split(',') if item.strip()]
@@ -0,0 +1,231 @@
+"""
+K-Startup 공고 전문 검색 모듈
+공백으로 형태소가 나뉘지 않는 한국어에 맞게 문자 2-gram/3-gram으로 토큰화한
+역색인을 SQLite에 두고, 새 pbanc_sn 공고가 들어올 때마다 증분으로 갱신하며
+BM25로 순위를 매겨 검색합니다.
+
+사용 예:
+    python kstartup_search.py index kstartup_all.jsonl
+    python kstartup_search.py query "헬스케어 임상 지원" --limit 10
+"""
+
+import argparse
+import math
+import re
+import sqlite3
+import unicodedata
+from collections import Counter
+from typing import Dict, Iterable, List
+
+from kstartup_state import content_hash
+from kstartup_storage import load_announcements
+
+
+# BM25 매개변수
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 색인에 넣는 필드와 가중치 (가중치만큼 토큰을 반복)
+INDEXED_FIELDS = [('title', 2), ('support_field', 1), ('target', 1), ('content', 1)]
+
+_RUN_PATTERN = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc_id INTEGER PRIMARY KEY,
+    pbanc_sn TEXT UNIQUE NOT NULL,
+    title TEXT,
+    url TEXT,
+    length INTEGER NOT NULL,
+    content_hash TEXT
+);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    tf INTEGER NOT NULL,
+    PRIMARY KEY (term, doc_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_postings_doc_id ON postings(doc_id);
+CREATE TABLE IF NOT EXISTS stats (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+
+def tokenize(text: str) -> List[str]:
+    """문자 2-gram과 3-gram 토큰 목록 (한 글자 단어는 그대로)
+
+    예: "헬스케어" -> ["헬스", "스케", "케어", "헬스케", "스케어"]
+    """
+    tokens = []
+    normalized = unicodedata.normalize('NFKC', text or '').lower()
+    for run in _RUN_PATTERN.findall(normalized):
+        if len(run) == 1:
+            tokens.append(run)
+            continue
+        for n in (2, 3):
+            tokens.extend(run[i:i + n] for i in range(len(run) - n + 1))
+    return tokens
+
+
+def document_tokens(record: Dict) -> List[str]:
+    tokens = []
+    for field, weight in INDEXED_FIELDS:
+        field_tokens = tokenize(record.get(field) or '')
+        tokens.extend(field_tokens * weight)
+    return tokens
+
+
+class SearchIndex:
+    """SQLite에 저장되는 BM25 역색인"""
+
+    def __init__(self, path: str = 'kstartup_search.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def _stat(self, key: str) -> int:
+        row = self.conn.execute('SELECT value FROM stats WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else 0
+
+    def _add_stat(self, key: str, delta: int):
+        self.conn.execute(
+            'INSERT INTO stats (key, value) VALUES (?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET value = value + excluded.value',
+            (key, delta)
+        )
+
+    @property
+    def doc_count(self) -> int:
+        return self._stat('doc_count')
+
+    def _remove(self, doc_id: int, length: int):
+        self.conn.execute('DELETE FROM postings WHERE doc_id = ?', (doc_id,))
+        self.conn.execute('DELETE FROM docs WHERE doc_id = ?', (doc_id,))
+        self._add_stat('doc_count', -1)
+        self._add_stat('total_length', -length)
+
+    def add_many(self, records: Iterable[Dict]) -> Dict[str, int]:
+        """공고를 색인에 추가하거나 갱신합니다 (내용 해시가 같은 공고는 건너뜀)
+
+        Returns:
+            {'added': 새로 색인한 수, 'updated': 다시 색인한 수, 'skipped': 변경 없음}
+        """
+        stats = {'added': 0, 'updated': 0, 'skipped': 0}
+        with self.conn:
+            for record in records:
+                pbanc_sn = record.get('pbanc_sn')
+                if not pbanc_sn or record.get('error'):
+                    continue
+                digest = content_hash(record)
+                existing = self.conn.execute(
+                    'SELECT doc_id, length, content_hash FROM docs WHERE pbanc_sn = ?', (str(pbanc_sn),)
+                ).fetchone()
+                if existing and existing[2] == digest:
+                    stats['skipped'] += 1
+                    continue
+                if existing:
+                    self._remove(existing[0], existing[1])
+
+                counts = Counter(document_tokens(record))
+                length = sum(counts.values())
+                cursor = self.conn.execute(
+                    'INSERT INTO docs (pbanc_sn, title, url, length, content_hash) VALUES (?, ?, ?, ?, ?)',
+                    (str(pbanc_sn), record.get('title') or '', record.get('url') or '', length, digest)
+                )
+                self.conn.executemany(
+                    'INSERT INTO postings (term, doc_id, tf) VALUES (?, ?, ?)',
+                    [(term, cursor.lastrowid, tf) for term, tf in counts.items()]
+                )
+                self._add_stat('doc_count', 1)
+                self._add_stat('total_length', length)
+                stats['updated' if existing else 'added'] += 1
+        return stats
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """BM25 점수 순으로 공고를 찾습니다"""
+        doc_count = self.doc_count
+        if not doc_count:
+            return []
+        avg_length = self._stat('total_length') / doc_count
+
+        scores: Dict[int, float] = {}
+        for term, query_tf in Counter(tokenize(query)).items():
+            postings = self.conn.execute(
+                'SELECT p.doc_id, p.tf, d.length FROM postings p JOIN docs d ON d.doc_id = p.doc_id '
+                'WHERE p.term = ?', (term,)
+            ).fetchall()
+            if not postings:
+                continue
+            idf = math.log(1 + (doc_count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf, length in postings:
+                norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * length / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + query_tf * idf * tf * (BM25_K1 + 1) / norm
+
+        top = sorted(scores.items(), key=lambda item: -item[1])[:limit]
+        if not top:
+            return []
+        placeholders = ','.join('?' * len(top))
+        docs = {
+            row[0]: row for row in self.conn.execute(
+                f'SELECT doc_id, pbanc_sn, title, url FROM docs WHERE doc_id IN ({placeholders})',
+                [doc_id for doc_id, _ in top]
+            )
+        }
+        return [
+            {'pbanc_sn': docs[doc_id][1], 'title': docs[doc_id][2], 'url': docs[doc_id][3],
+             'score': round(score, 4)}
+            for doc_id, score in top
+        ]
+
+    def close(self):
+        self.conn.close()
+
+
+def update_search_index(records: Iterable[Dict], filename: str = 'kstartup_search.db'):
+    """공고를 검색 색인에 반영합니다"""
+    index = SearchIndex(filename)
+    try:
+        stats = index.add_many(records)
+        total = index.doc_count
+    finally:
+        index.close()
+    print(f"검색 색인 {filename} 갱신: 추가 {stats['added']}개, 갱신 {stats['updated']}개, "
+          f"변경 없음 {stats['skipped']}개 (전체 {total}개)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='K-Startup 공고 전문 검색')
+    parser.add_argument('--db', default='kstartup_search.db', help='검색 색인 파일 (기본값: kstartup_search.db)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    index_parser = subparsers.add_parser('index', help='저장된 공고를 색인에 추가합니다')
+    index_parser.add_argument('sources', nargs='+', help='공고 파일 (.jsonl, .json, SQLite .db)')
+
+    query_parser = subparsers.add_parser('query', help='공고를 검색합니다')
+    query_parser.add_argument('query', help='검색어')
+    query_parser.add_argument('--limit', type=int, default=10, help='최대 결과 수 (기본값: 10)')
+
+    args = parser.parse_args()
+
+    if args.command == 'index':
+        for source in args.sources:
+            update_search_index(load_announcements(source), args.db)
+        return
+
+    index = SearchIndex(args.db)
+    try:
+        results = index.search(args.query, args.limit)
+    finally:
+        index.close()
+    print(f"'{args.query}' 검색 결과: {len(results)}개")
+    for i, result in enumerate(results, 1):
+        print(f"{i}. [{result['score']}] {result['title']}")
+        print(f"   {result['url']}")
+
+
+if __name__ == '__main__':
+    main()
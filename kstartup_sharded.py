@@ -0,0 +1,200 @@
+"""
+K-Startup 다중 프로세스 분산 크롤링 모듈
+(분류 코드, 목록 페이지) 작업과 상세 페이지 묶음 작업을 프로세스 풀에 나누어 맡기고,
+각 워커 프로세스는 자기 브라우저를 한 번 띄워 계속 재사용합니다.
+
+- 분류 코드마다 첫 목록 페이지의 페이저에서 마지막 페이지를 읽은 뒤 나머지 페이지를 한꺼번에 맡깁니다.
+- 부모 프로세스가 목록 결과가 도착하는 대로 pbanc_sn 기준으로 중복을 제거하고, 처음 나온
+  공고만 상세 작업으로 보내므로 여러 분류 코드에 올라온 공고도 상세 페이지는 한 번만 방문합니다.
+"""
+
+import multiprocessing
+import queue
+from multiprocessing.util import Finalize
+from typing import List, Dict, Optional, Tuple
+
+from kstartup_browser import connect_or_launch
+from kstartup_capture import default_capture
+from kstartup_crawl import (
+    DEFAULT_CATEGORIES,
+    USER_AGENT,
+    ListPager,
+    collect_list_page,
+    make_error_record,
+    mark_duplicates,
+    scrape_announcement_detail,
+)
+from kstartup_extract import install_extractor
+from kstartup_recycle import PageRecycler, default_recycling
+from kstartup_resources import ResourcePolicy
+from kstartup_throttle import default_scheduler
+
+
+# 상세 작업 하나에 묶는 공고 수
+DETAIL_BATCH = 10
+
+
+# 워커 프로세스마다 하나씩 유지하는 브라우저 상태
+_worker = {}
+
+
+def _shutdown_worker():
+    recycler = _worker.pop('recycler', None)
+    browser = _worker.pop('browser', None)
+    playwright = _worker.pop('playwright', None)
+    try:
+        if recycler:
+            recycler.close()
+        if browser:
+            browser.close()
+    finally:
+        if playwright:
+            playwright.stop()
+
+
+def _init_worker(allowed_types: Optional[List[str]], allowed_hosts: Optional[List[str]], block_resources: bool,
+                 scheduler_settings: Optional[Dict], capture_enabled: bool, recycle_settings: Optional[Dict]):
+    """워커 프로세스 시작 시 브라우저를 띄웁니다"""
+    if scheduler_settings:
+        default_scheduler.configure(**scheduler_settings)
+    if recycle_settings:
+        default_recycling.configure(**recycle_settings)
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    # 워커마다 자기 브라우저를 띄움 (상주 브라우저 하나를 나눠 쓰지 않음)
+    browser = connect_or_launch(playwright, attach=False)
+    resource_policy = ResourcePolicy(allowed_types, allowed_hosts, enabled=block_resources)
+    default_capture.enabled = capture_enabled
+
+    def open_context():
+        context = browser.new_context(user_agent=USER_AGENT)
+        resource_policy.install(context)
+        install_extractor(context)
+        default_capture.install(context)
+        return context
+
+    _worker.update(playwright=playwright, browser=browser, recycler=PageRecycler(browser, open_context))
+    # 풀이 정상 종료될 때 브라우저도 닫음
+    Finalize(None, _shutdown_worker, exitpriority=10)
+
+
+def _crawl_list_page(task: Tuple[str, int]) -> Tuple[str, int, List[Dict], Optional[int], Optional[str]]:
+    """목록 페이지 하나의 공고 링크와 마지막 페이지 번호를 수집합니다 (워커 프로세스에서 실행)"""
+    pbanc_clss_cd, page_num = task
+    try:
+        links, page_count = _worker['recycler'].run(collect_list_page, page_num, pbanc_clss_cd)
+    except Exception as e:
+        return pbanc_clss_cd, page_num, [], None, str(e)
+    return pbanc_clss_cd, page_num, links, page_count, None
+
+
+def _crawl_details(batch: List[Tuple[Tuple[int, int, int], Dict]]) -> List[Tuple[Tuple[int, int, int], Dict]]:
+    """상세 페이지 묶음을 수집합니다 (워커 프로세스에서 실행, 위치는 그대로 돌려줌)
+
+    한 공고에서 예외가 나도 묶음 전체를 버리지 않고
+    순차 크롤러처럼 그 위치에 error 기록을 남깁니다.
+    """
+    recycler = _worker['recycler']
+    details = []
+    for position, link_info in batch:
+        try:
+            detail = link_info.get('detail') or recycler.run(scrape_announcement_detail, link_info['url'])
+        except Exception as e:
+            detail = make_error_record(link_info['url'], e)
+        detail['pbanc_sn'] = link_info.get('pbanc_sn')
+        details.append((position, detail))
+    return details
+
+
+def scrape_announcements_sharded(start_page: int = 1, end_page: Optional[int] = None,
+                                 pbanc_clss_cds: Optional[List[str]] = None,
+                                 processes: int = 4,
+                                 resource_policy: Optional[ResourcePolicy] = None,
+                                 scheduler_settings: Optional[Dict] = None,
+                                 recycle_settings: Optional[Dict] = None) -> List[Dict]:
+    """여러 프로세스로 목록 페이지와 상세 페이지를 나누어 크롤링합니다
+
+    결과는 (분류 코드 순서, 페이지, 페이지 내 순서)로 정렬되며 같은 pbanc_sn은 한 번만 수집합니다.
+    페이저에서 페이지 수를 읽지 못한 분류 코드는 빈 페이지가 나올 때까지 한 페이지씩 맡깁니다.
+    scheduler_settings(PolitenessScheduler.configure 인자)의 초당 요청 수는 워커 수로 나누어
+    프로세스 전체 합계가 설정값을 넘지 않게 합니다.
+    recycle_settings(RecyclePolicy.configure 인자)는 워커마다 그대로 적용되며, 메모리 한도는
+    각 워커가 연결한 브라우저 전체 기준입니다.
+    """
+    pbanc_clss_cds = pbanc_clss_cds or DEFAULT_CATEGORIES
+    resource_policy = resource_policy or ResourcePolicy()
+    processes = max(1, processes)
+    if scheduler_settings:
+        scheduler_settings = dict(scheduler_settings, rate=scheduler_settings.get('rate', 0) / processes)
+
+    pagers = {code: ListPager(start_page, end_page) for code in pbanc_clss_cds}
+    next_page = {code: start_page for code in pbanc_clss_cds}
+    code_order = {code: i for i, code in enumerate(pbanc_clss_cds)}
+    listed: Dict[Tuple[int, int], List[Dict]] = {}
+    seen = set()
+    merged: Dict[Tuple[int, int, int], Dict] = {}
+    # 워커 결과는 풀의 결과 스레드가 콜백으로 넣음
+    arrivals: queue.Queue = queue.Queue()
+    outstanding = 0
+
+    print(f"\n{len(pbanc_clss_cds)}개 분류 코드를 {processes}개 프로세스로 나누어 크롤링합니다...")
+    # 워커마다 브라우저를 따로 띄우므로 fork 대신 spawn 사용
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(
+        processes,
+        initializer=_init_worker,
+        initargs=(sorted(resource_policy.allowed_types), sorted(resource_policy.allowed_hosts),
+                  resource_policy.enabled, scheduler_settings, default_capture.enabled, recycle_settings),
+    ) as pool:
+
+        def submit(kind: str, func, task):
+            nonlocal outstanding
+            outstanding += 1
+            pool.apply_async(func, (task,), callback=lambda result: arrivals.put((kind, result)),
+                             error_callback=lambda error: arrivals.put(('error', error)))
+
+        def schedule_pages(code: str):
+            # 페이지 수를 알면 남은 페이지를 한꺼번에, 모르면 앞 페이지 결과를 본 뒤 한 페이지씩
+            pager = pagers[code]
+            while not pager.exhausted and next_page[code] <= pager.last_page:
+                submit('list', _crawl_list_page, (code, next_page[code]))
+                next_page[code] += 1
+                if not pager.page_count:
+                    break
+
+        for code in pbanc_clss_cds:
+            schedule_pages(code)
+
+        while outstanding:
+            kind, result = arrivals.get()
+            outstanding -= 1
+            if kind == 'error':
+                print(f"워커 작업 중 오류: {result}")
+            elif kind == 'details':
+                for position, detail in result:
+                    merged[position] = detail
+                print(f"상세 {len(result)}개 완료 (누적 {len(merged)}개)")
+            else:
+                pbanc_clss_cd, page_num, links, page_count, error = result
+                if error:
+                    print(f"[{pbanc_clss_cd}] 페이지 {page_num} 처리 중 오류: {error}")
+                else:
+                    pagers[pbanc_clss_cd].update(page_num, links, page_count)
+                    listed[(code_order[pbanc_clss_cd], page_num)] = links
+                    print(f"[{pbanc_clss_cd}] 페이지 {pagers[pbanc_clss_cd].label(page_num)} 목록: {len(links)}개")
+                schedule_pages(pbanc_clss_cd)
+
+                # 도착하는 대로 중복을 제거하고 처음 나온 공고만 상세 작업으로 보냄
+                # (목록 페이지가 도착 순서대로 처리되므로 같은 공고라도 어느 분류 코드에 남을지는 달라질 수 있음)
+                category = code_order[pbanc_clss_cd]
+                duplicates = mark_duplicates(links, seen)
+                batch = [((category, page_num, i), link_info) for i, link_info in enumerate(links)
+                         if i not in duplicates]
+                for offset in range(0, len(batch), DETAIL_BATCH):
+                    submit('details', _crawl_details, batch[offset:offset + DETAIL_BATCH])
+        pool.close()
+        pool.join()
+
+    print(f"목록 {len(listed)}페이지에서 중복을 제외한 공고 {len(merged)}개를 수집했습니다.")
+    return [merged[position] for position in sorted(merged)]
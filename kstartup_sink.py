@@ -0,0 +1,230 @@
+"""
+K-Startup 수집 결과 스트리밍 저장 모듈
+상세 정보를 추출하는 즉시 JSONL에 추가하고 일정 개수마다 fsync 하며,
+(분류 코드 순번, 목록 페이지, 인덱스) 체크포인트를 남겨 중단된 크롤링을 이어서 실행할 수 있게 합니다.
+JSON/CSV 파일은 크롤링이 끝난 뒤 JSONL을 한 번 읽으면서 만듭니다.
+"""
+
+import csv
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from kstartup_record import CSV_FIELDS, Announcement, Record, csv_row, to_dict
+
+
+# CSV 열 (공고 스키마를 이름순으로 정렬)
+EXPORT_FIELDS = CSV_FIELDS
+
+
+def _repair_tail(path: str):
+    """마지막 줄이 쓰다 만 상태로 남았으면 잘라냅니다"""
+    if not os.path.exists(path):
+        return
+    with open(path, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        size = f.tell()
+        if size == 0:
+            return
+        f.seek(size - 1)
+        if f.read(1) == b'\n':
+            return
+        # 마지막 개행 위치를 뒤에서부터 찾음
+        pos = size - 1
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            newline = chunk.rfind(b'\n')
+            if newline != -1:
+                f.truncate(pos - step + newline + 1)
+                return
+            pos -= step
+        f.truncate(0)
+
+
+class JsonlSink:
+    """상세 정보를 JSONL에 바로 추가하고 체크포인트를 관리하는 저장소"""
+
+    def __init__(self, path: str = 'kstartup_all.jsonl', fsync_every: int = 20, resume: bool = False):
+        """
+        Args:
+            path: JSONL 파일 경로 (체크포인트는 <path>.checkpoint.json)
+            fsync_every: 이 개수만큼 기록할 때마다 디스크에 동기화하고 체크포인트를 남깁니다
+            resume: True이면 기존 파일과 체크포인트에 이어서 기록합니다
+        """
+        self.path = path
+        self.checkpoint_path = path + '.checkpoint.json'
+        self.fsync_every = max(1, fsync_every)
+        self.checkpoint: Optional[Dict] = None
+        self.written = 0
+        self._pending = 0
+        self._position: Optional[Tuple[int, int, int]] = None
+
+        if resume:
+            self.checkpoint = self._load_checkpoint()
+        if self.checkpoint and not self.checkpoint.get('completed'):
+            # 체크포인트 뒤에 기록된 공고는 체크포인트 페이지부터 다시 수집하므로 잘라냄
+            # (offset이 없는 예전 체크포인트는 쓰다 만 마지막 줄만 잘라냄)
+            offset = self.checkpoint.get('offset')
+            if offset is not None and offset <= os.path.getsize(path):
+                os.truncate(path, offset)
+            else:
+                _repair_tail(path)
+            self._file = open(path, 'a', encoding='utf-8')
+            # 분류 코드를 여러 개 나누기 전의 체크포인트는 첫 번째 분류 코드로 봄
+            self.checkpoint.setdefault('category', 0)
+            print(f"이어서 크롤링합니다: {self.checkpoint['category'] + 1}번째 분류 코드의 "
+                  f"페이지 {self.checkpoint['page']}, {self.checkpoint['index'] + 1}번째 공고 이후부터")
+        else:
+            self.checkpoint = None
+            self._file = open(path, 'w', encoding='utf-8')
+            if os.path.exists(self.checkpoint_path):
+                os.remove(self.checkpoint_path)
+
+    def _load_checkpoint(self) -> Optional[Dict]:
+        if not os.path.exists(self.checkpoint_path) or not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def skips_category(self, category: int) -> bool:
+        """체크포인트 이전에 이미 끝낸 분류 코드인지 확인 (category는 분류 코드 목록의 순번)"""
+        return bool(self.checkpoint) and category < self.checkpoint['category']
+
+    def resume_page(self, start_page: int, category: int = 0) -> int:
+        """이어서 실행할 때 시작할 목록 페이지"""
+        if self.checkpoint and category == self.checkpoint['category']:
+            return max(start_page, self.checkpoint['page'])
+        return start_page
+
+    def should_skip(self, page_num: int, index: int, category: int = 0) -> bool:
+        """체크포인트 이전에 이미 기록한 공고인지 확인"""
+        if not self.checkpoint:
+            return False
+        return (category, page_num, index) <= (
+            self.checkpoint['category'], self.checkpoint['page'], self.checkpoint['index'])
+
+    def recorded_keys(self) -> Set[str]:
+        """이어서 실행할 때 이미 기록한 공고의 pbanc_sn (없으면 URL)
+
+        여러 분류 코드에 함께 올라온 공고를 이어서 실행한 뒤에도 한 번만 수집하도록
+        중복 확인 집합을 미리 채우는 데 씁니다.
+        """
+        if not self.checkpoint:
+            return set()
+        self._file.flush()
+        return {record.get('pbanc_sn') or record.get('url') for record in iter_jsonl(self.path)}
+
+    def write(self, record: Record, page_num: int, index: int, category: int = 0):
+        """공고 하나를 기록합니다 (index는 목록 페이지 안에서의 0부터 시작하는 순번)"""
+        self._file.write(json.dumps(to_dict(record), ensure_ascii=False) + '\n')
+        self.written += 1
+        self._pending += 1
+        self._position = (category, page_num, index)
+        if self._pending >= self.fsync_every:
+            self.flush()
+
+    def _write_checkpoint(self, data: Dict):
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def flush(self):
+        """기록한 내용을 디스크에 동기화한 뒤 체크포인트를 갱신합니다"""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+        if self._position:
+            category, page_num, index = self._position
+            # 추가 모드로만 쓰므로 파일 크기가 곧 체크포인트까지의 바이트 수
+            self._write_checkpoint({'category': category, 'page': page_num, 'index': index,
+                                    'written': self.written,
+                                    'offset': os.fstat(self._file.fileno()).st_size})
+
+    def close(self, completed: bool = True):
+        """파일을 닫습니다. completed이면 다음 --resume 실행은 처음부터 시작합니다"""
+        if self._file.closed:
+            return
+        self.flush()
+        self._file.close()
+        if completed:
+            self._write_checkpoint({'completed': True, 'written': self.written})
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """JSONL 파일을 한 줄씩 읽습니다 (깨진 줄은 건너뜀)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+class StreamingExport:
+    """JSON 배열과 CSV를 레코드 단위로 이어 쓰는 출력"""
+
+    def __init__(self, json_path: str, csv_path: str):
+        self.json_path = json_path
+        self.csv_path = csv_path
+        self.count = 0
+        self._json = open(json_path, 'w', encoding='utf-8')
+        self._json.write('[')
+        self._csv_file = open(csv_path, 'w', newline='', encoding='utf-8-sig')
+        self._csv = csv.writer(self._csv_file)
+        self._csv.writerow(EXPORT_FIELDS)
+
+    def write(self, record: Record):
+        item = json.dumps(to_dict(record), ensure_ascii=False, indent=2)
+        self._json.write(('\n' if self.count == 0 else ',\n') + '  ' + item.replace('\n', '\n  '))
+        self._csv.writerow(csv_row(record, EXPORT_FIELDS))
+        self.count += 1
+
+    def flush(self):
+        """지금까지 쓴 내용을 파일에 반영합니다 (크롤링 중에도 바로 확인할 수 있게)"""
+        self._json.flush()
+        self._csv_file.flush()
+
+    def close(self):
+        self._json.write('\n]' if self.count else ']')
+        self._json.close()
+        self._csv_file.close()
+
+
+def export_from_jsonl(jsonl_path: str,
+                      matches: Optional[Callable[[Dict], bool]] = None,
+                      all_prefix: str = 'kstartup_all',
+                      filtered_prefix: str = 'kstartup_filtered') -> Tuple[int, List[Announcement]]:
+    """JSONL을 한 번 읽으면서 전체/필터링 JSON과 CSV를 동시에 만듭니다
+
+    Returns:
+        (전체 공고 수, 필터링된 공고 목록) - 필터링된 공고만 미리보기용으로 메모리에 남깁니다
+    """
+    filtered = []
+    all_export = StreamingExport(f'{all_prefix}.json', f'{all_prefix}.csv')
+    filtered_export = StreamingExport(f'{filtered_prefix}.json', f'{filtered_prefix}.csv') if matches else None
+    try:
+        for record in iter_jsonl(jsonl_path):
+            all_export.write(record)
+            if filtered_export and matches(record):
+                filtered_export.write(record)
+                filtered.append(Announcement.from_dict(record))
+    finally:
+        all_export.close()
+        if filtered_export:
+            filtered_export.close()
+
+    print(f"\n{jsonl_path}에서 {all_export.json_path}, {all_export.csv_path}를 만들었습니다.")
+    if filtered_export:
+        print(f"{filtered_export.json_path}, {filtered_export.csv_path}를 만들었습니다.")
+    return all_export.count, filtered
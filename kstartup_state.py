@@ -0,0 +1,258 @@
+"""
+K-Startup 증분 크롤링 상태 저장 모듈
+pbanc_sn별로 마지막 수집 시각, 내용 해시, 마지막 수집 결과를 파일에 보관하여
+이미 수집한 최신 공고의 상세 페이지를 다시 방문하지 않도록 합니다.
+
+ChangeLog를 연결하면 이전 실행과 비교한 변경분(새 공고, 바뀐 필드, 사라진 공고)을
+JSONL로 기록합니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from kstartup_record import Announcement
+
+
+# 내용 해시에 포함하는 필드 (url, scraped_at 등 수집 시점 정보는 제외)
+HASHED_FIELDS = [
+    'title', 'support_field', 'age_range', 'target', 'business_years',
+    'region', 'application_period', 'organization', 'contact', 'content'
+]
+
+
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_value(value) -> str:
+    """공백 차이만 있는 값이 같은 값으로 취급되도록 연속 공백을 하나로 줄입니다"""
+    return WHITESPACE.sub(' ', str(value or '')).strip()
+
+
+def normalize_record(record: Dict) -> Dict:
+    """해시 대상 필드를 정규화한 사본을 만듭니다"""
+    normalized = dict(record)
+    for field in HASHED_FIELDS:
+        normalized[field] = normalize_value(record.get(field))
+    return normalized
+
+
+def content_hash(record: Dict) -> str:
+    """공고 내용의 해시를 계산합니다"""
+    payload = json.dumps(
+        [(field, normalize_value(record.get(field))) for field in HASHED_FIELDS],
+        ensure_ascii=False, separators=(',', ':')
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def changed_fields(previous: Dict, current: Dict) -> Dict[str, Dict[str, str]]:
+    """두 레코드에서 값이 달라진 필드 ({필드: {'old', 'new'}})"""
+    changes = {}
+    for field in HASHED_FIELDS:
+        old, new = normalize_value(previous.get(field)), normalize_value(current.get(field))
+        if old != new:
+            changes[field] = {'old': old, 'new': new}
+    return changes
+
+
+class ChangeLog:
+    """이번 실행의 변경분을 JSONL로 기록합니다 (실행마다 새로 씀)
+
+    한 줄이 공고 하나의 변경이며 change는 new / modified / disappeared 중 하나입니다.
+    modified에는 바뀐 필드의 이전 값과 새 값이, new/modified에는 전체 레코드가 함께 들어갑니다.
+    """
+
+    def __init__(self, path: str = 'kstartup_delta.jsonl'):
+        self.path = path
+        self.counts = {'new': 0, 'modified': 0, 'disappeared': 0}
+        self._file = open(path, 'w', encoding='utf-8')
+
+    def write(self, change: str, pbanc_sn: str, **fields):
+        entry = {
+            'change': change,
+            'pbanc_sn': pbanc_sn,
+            'detected_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        }
+        entry.update(fields)
+        self._file.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        # 알림 등 다른 프로세스가 실행 중에도 따라 읽을 수 있게 바로 내보냄
+        self._file.flush()
+        self.counts[change] += 1
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def print_summary(self):
+        print(f"\n변경분: 새 공고 {self.counts['new']}개, 변경 {self.counts['modified']}개, "
+              f"사라짐 {self.counts['disappeared']}개 ({self.path})")
+
+
+class CrawlState:
+    """pbanc_sn을 키로 하는 크롤링 상태 저장소"""
+
+    def __init__(self, path: str = 'kstartup_state.json', max_age_hours: float = 24.0,
+                 reuse: bool = True, change_log: Optional[ChangeLog] = None):
+        """
+        Args:
+            path: 상태 파일 경로
+            max_age_hours: 이 시간 안에 수집한 공고는 다시 방문하지 않습니다
+            reuse: False면 저장된 결과를 재사용하지 않고 페이징도 멈추지 않습니다 (변경 감지만 사용)
+            change_log: 주어지면 이전 실행과 달라진 공고를 기록합니다
+        """
+        self.path = path
+        self.max_age_seconds = max_age_hours * 3600
+        self.reuse = reuse
+        self.change_log = change_log
+        self.entries: Dict[str, Dict] = {}
+        self.reused = 0
+        self.updated = 0
+        # 이번 실행에서 목록에 나온 공고와 목록을 끝까지 읽었는지 여부 (사라진 공고 판단용)
+        self.listed = set()
+        self.reappeared = set()
+        self.exhausted_categories = set()
+        self.list_errors = 0
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('announcements', {})
+        except (OSError, ValueError) as e:
+            print(f"상태 파일을 읽지 못해 새로 시작합니다: {e}")
+            self.entries = {}
+
+    def save(self):
+        """상태 파일을 원자적으로 저장합니다 (임시 파일에 쓴 뒤 교체)"""
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'announcements': self.entries}, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def is_known(self, pbanc_sn: Optional[str]) -> bool:
+        return bool(pbanc_sn) and pbanc_sn in self.entries
+
+    def is_fresh(self, pbanc_sn: Optional[str], now: Optional[float] = None) -> bool:
+        """최근 max_age_hours 안에 수집한 공고인지 확인"""
+        if not self.is_known(pbanc_sn):
+            return False
+        now = now if now is not None else time.time()
+        return now - self.entries[pbanc_sn].get('last_scraped', 0) < self.max_age_seconds
+
+    def all_known(self, links: List[Dict]) -> bool:
+        """목록 페이지의 공고가 모두 이미 알려진 공고인지 확인 (페이징 조기 종료 조건)"""
+        return self.reuse and bool(links) and all(self.is_known(link.get('pbanc_sn')) for link in links)
+
+    def mark_listed(self, links: List[Dict]):
+        """목록 페이지에서 찾은 공고를 기록합니다"""
+        for link in links:
+            pbanc_sn = link.get('pbanc_sn')
+            if pbanc_sn:
+                self.listed.add(pbanc_sn)
+                # 사라졌던 공고가 다시 나타나면 새 공고로 기록
+                if self.entries.get(pbanc_sn, {}).pop('disappeared_at', None) is not None:
+                    self.reappeared.add(pbanc_sn)
+
+    def mark_list_end(self, pbanc_clss_cd: str):
+        """분류 코드의 목록을 마지막 페이지(또는 빈 페이지)까지 읽었음을 기록합니다"""
+        self.exhausted_categories.add(pbanc_clss_cd)
+
+    def mark_list_error(self):
+        """목록 페이지를 읽지 못했음을 기록합니다 (이번 실행에서는 사라진 공고를 판단하지 않음)"""
+        self.list_errors += 1
+
+    def cached_record(self, pbanc_sn: str) -> Optional[Announcement]:
+        """마지막으로 수집한 결과를 재사용합니다"""
+        entry = self.entries.get(pbanc_sn)
+        if not entry or 'record' not in entry:
+            return None
+        self.reused += 1
+        return Announcement.from_dict(entry['record'])
+
+    def reusable(self, pbanc_sn: Optional[str]) -> bool:
+        """저장된 결과를 그대로 써도 되는지 확인
+
+        사라졌다가 다시 나타난 공고는 다시 수집해 update()에서 새 공고로 기록되게 합니다.
+        """
+        return self.reuse and self.is_fresh(pbanc_sn) and pbanc_sn not in self.reappeared
+
+    def prefill(self, links: List[Dict]) -> List[Optional[Announcement]]:
+        """목록의 공고 중 최신 상태인 것은 저장된 결과로 채우고 나머지는 None으로 둡니다"""
+        return [
+            self.cached_record(link.get('pbanc_sn')) if self.reusable(link.get('pbanc_sn')) else None
+            for link in links
+        ]
+
+    def update(self, pbanc_sn: Optional[str], record: Dict) -> bool:
+        """수집 결과를 기록합니다
+
+        Returns:
+            내용 해시가 이전과 달라졌으면 True (새 공고 포함)
+        """
+        if not pbanc_sn or record.get('error'):
+            return False
+        self.listed.add(pbanc_sn)
+        normalized = normalize_record(record)
+        digest = content_hash(normalized)
+        previous = self.entries.get(pbanc_sn, {})
+        self.entries[pbanc_sn] = {
+            'last_scraped': time.time(),
+            'content_hash': digest,
+            'record': normalized,
+        }
+        self.updated += 1
+        reappeared = pbanc_sn in self.reappeared
+        self.reappeared.discard(pbanc_sn)
+        if previous.get('content_hash') == digest and not reappeared:
+            return False
+
+        if not previous or reappeared or 'disappeared_at' in previous:
+            if self.change_log:
+                self.change_log.write('new', pbanc_sn, record=normalized)
+            return True
+        # 해시 형식만 바뀐 경우처럼 필드 값이 그대로면 변경으로 보지 않음
+        changes = changed_fields(previous.get('record', {}), normalized)
+        if changes and self.change_log:
+            self.change_log.write('modified', pbanc_sn, changes=changes, record=normalized)
+        return bool(changes)
+
+    def finish_run(self, complete: bool, pbanc_clss_cds: List[str]) -> List[str]:
+        """목록에서 사라진 공고를 표시하고 변경분에 기록합니다
+
+        모든 분류 코드의 목록을 1페이지부터 마지막 페이지까지 오류 없이 읽은 실행(complete이면서
+        분류 코드마다 목록 끝에 도달)에서만 판단합니다. 조기 종료했거나 일부 페이지만 읽은 실행에서
+        목록에 없던 공고는 사라진 것이 아니라 읽지 않은 것일 수 있기 때문입니다.
+
+        Returns:
+            이번 실행에서 사라진 것으로 표시한 pbanc_sn 목록
+        """
+        exhausted = all(code in self.exhausted_categories for code in pbanc_clss_cds)
+        if not (complete and exhausted and not self.list_errors):
+            return []
+        now = time.time()
+        disappeared = []
+        for pbanc_sn, entry in self.entries.items():
+            if pbanc_sn in self.listed or 'disappeared_at' in entry:
+                continue
+            entry['disappeared_at'] = now
+            disappeared.append(pbanc_sn)
+            if self.change_log:
+                record = entry.get('record', {})
+                self.change_log.write(
+                    'disappeared', pbanc_sn, title=record.get('title', ''), url=record.get('url', ''),
+                    last_scraped=datetime.fromtimestamp(entry.get('last_scraped', now)).strftime('%Y-%m-%d %H:%M:%S'),
+                )
+        return disappeared
+
+    def print_summary(self):
+        print(f"\n증분 크롤링: 재사용 {self.reused}개, 새로 수집 {self.updated}개, "
+              f"저장된 공고 {len(self.entries)}개 ({self.path})")
@@ -0,0 +1,253 @@
+"""
+K-Startup 공고 SQLite 저장 모듈
+공고를 pbanc_sn 기준으로 일괄 upsert 하고, 지역/기관/마감일/수집 시각에 인덱스를 두어
+"이번 주에 마감되는 헬스케어 공고" 같은 조회를 파일 전체를 읽지 않고 처리합니다.
+필드가 바뀌면 history 테이블에 이전 값과 새 값을 남깁니다.
+"""
+
+import json
+import re
+import sqlite3
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from kstartup_record import Announcement
+from kstartup_sink import iter_jsonl
+
+
+# announcements 테이블에 저장하는 필드 (pbanc_sn 제외)
+STORED_FIELDS = [
+    'title', 'support_field', 'age_range', 'target', 'business_years',
+    'region', 'application_period', 'organization', 'contact', 'content',
+    'url', 'scraped_at'
+]
+
+# 바뀌어도 이력을 남기지 않는 필드
+UNTRACKED_FIELDS = {'scraped_at'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS announcements (
+    pbanc_sn TEXT PRIMARY KEY,
+    title TEXT,
+    support_field TEXT,
+    age_range TEXT,
+    target TEXT,
+    business_years TEXT,
+    region TEXT,
+    application_period TEXT,
+    organization TEXT,
+    contact TEXT,
+    content TEXT,
+    url TEXT,
+    scraped_at TEXT,
+    deadline TEXT,
+    first_seen_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_announcements_region ON announcements(region);
+CREATE INDEX IF NOT EXISTS idx_announcements_organization ON announcements(organization);
+CREATE INDEX IF NOT EXISTS idx_announcements_deadline ON announcements(deadline);
+CREATE INDEX IF NOT EXISTS idx_announcements_scraped_at ON announcements(scraped_at);
+
+CREATE TABLE IF NOT EXISTS announcement_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    pbanc_sn TEXT NOT NULL,
+    field TEXT NOT NULL,
+    old_value TEXT,
+    new_value TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_history_pbanc_sn ON announcement_history(pbanc_sn);
+"""
+
+DATE_PATTERN = re.compile(r'(\d{4})\s*[-./년]\s*(\d{1,2})\s*[-./월]\s*(\d{1,2})')
+
+
+def parse_deadline(application_period: Optional[str]) -> Optional[str]:
+    """접수기간 문자열에서 마감일(마지막 날짜)을 YYYY-MM-DD로 추출합니다
+
+    예: "2025-12-26 ~ 2026-01-15 18:00" -> "2026-01-15"
+    """
+    if not application_period:
+        return None
+    dates = DATE_PATTERN.findall(application_period)
+    if not dates:
+        return None
+    year, month, day = (int(x) for x in dates[-1])
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+class AnnouncementStore:
+    """공고를 SQLite(WAL 모드)에 저장하고 조회하는 클래스"""
+
+    def __init__(self, path: str = 'kstartup.db'):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.execute('PRAGMA synchronous=NORMAL')
+        self.conn.executescript(SCHEMA)
+
+    def _existing(self, pbanc_sns: List[str]) -> Dict[str, sqlite3.Row]:
+        existing = {}
+        # SQLite 변수 개수 제한을 피하기 위해 나누어 조회
+        for start in range(0, len(pbanc_sns), 500):
+            chunk = pbanc_sns[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(
+                f'SELECT * FROM announcements WHERE pbanc_sn IN ({placeholders})', chunk
+            )
+            existing.update((row['pbanc_sn'], row) for row in rows)
+        return existing
+
+    def upsert_many(self, records: Iterable[Dict]) -> Dict[str, int]:
+        """공고를 한 트랜잭션으로 upsert 합니다 (pbanc_sn이 없거나 오류인 기록은 제외)
+
+        Returns:
+            {'inserted': 새 공고 수, 'updated': 내용이 바뀐 공고 수, 'unchanged': 변경 없는 공고 수}
+        """
+        batch = {}
+        for record in records:
+            pbanc_sn = record.get('pbanc_sn')
+            if pbanc_sn and not record.get('error'):
+                batch[str(pbanc_sn)] = record
+        stats = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+        if not batch:
+            return stats
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        existing = self._existing(list(batch))
+        rows = []
+        history = []
+        for pbanc_sn, record in batch.items():
+            values = [record.get(field) or '' for field in STORED_FIELDS]
+            previous = existing.get(pbanc_sn)
+            if previous is None:
+                stats['inserted'] += 1
+            else:
+                changed = False
+                for field, value in zip(STORED_FIELDS, values):
+                    if field in UNTRACKED_FIELDS or (previous[field] or '') == value:
+                        continue
+                    history.append((pbanc_sn, field, previous[field], value, now))
+                    changed = True
+                stats['updated' if changed else 'unchanged'] += 1
+            rows.append([pbanc_sn] + values + [parse_deadline(record.get('application_period')), now])
+
+        columns = ['pbanc_sn'] + STORED_FIELDS + ['deadline', 'first_seen_at']
+        updates = ', '.join(f'{c} = excluded.{c}' for c in STORED_FIELDS + ['deadline'])
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT INTO announcements ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT(pbanc_sn) DO UPDATE SET {updates}",
+                rows
+            )
+            self.conn.executemany(
+                'INSERT INTO announcement_history (pbanc_sn, field, old_value, new_value, changed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                history
+            )
+        return stats
+
+    def closing_between(self, start: str, end: str, keyword: Optional[str] = None,
+                        region: Optional[str] = None) -> List[Dict]:
+        """마감일이 [start, end] 범위인 공고를 조회합니다 (마감일 인덱스 사용)
+
+        keyword는 제목/지원분야/대상에서, region은 지역 값에서 찾습니다.
+        """
+        sql = 'SELECT * FROM announcements WHERE deadline BETWEEN ? AND ?'
+        params: List = [start, end]
+        if region:
+            sql += ' AND region = ?'
+            params.append(region)
+        if keyword:
+            sql += ' AND (title LIKE ? OR support_field LIKE ? OR target LIKE ?)'
+            params.extend([f'%{keyword}%'] * 3)
+        sql += ' ORDER BY deadline'
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def closing_within(self, days: int = 7, keyword: Optional[str] = None,
+                       today: Optional[date] = None) -> List[Dict]:
+        """오늘부터 days일 안에 마감되는 공고"""
+        today = today or date.today()
+        return self.closing_between(today.isoformat(), (today + timedelta(days=days)).isoformat(), keyword)
+
+    def history(self, pbanc_sn: str) -> List[Dict]:
+        """공고의 필드 변경 이력"""
+        rows = self.conn.execute(
+            'SELECT field, old_value, new_value, changed_at FROM announcement_history '
+            'WHERE pbanc_sn = ? ORDER BY id', (pbanc_sn,)
+        )
+        return [dict(row) for row in rows]
+
+    def iter_all(self) -> Iterable[Dict]:
+        """저장된 모든 공고 (pbanc_sn 순)"""
+        for row in self.conn.execute('SELECT * FROM announcements ORDER BY pbanc_sn'):
+            yield dict(row)
+
+    def close(self):
+        self.conn.close()
+
+
+def load_announcements(source: str) -> List[Announcement]:
+    """저장된 공고를 읽습니다 (.jsonl, .json, SQLite .db/.sqlite)"""
+    if source.endswith('.jsonl'):
+        return [Announcement.from_dict(record) for record in iter_jsonl(source)]
+    if source.endswith(('.db', '.sqlite', '.sqlite3')):
+        store = AnnouncementStore(source)
+        try:
+            return [Announcement.from_dict(row) for row in store.iter_all()]
+        finally:
+            store.close()
+    with open(source, 'r', encoding='utf-8') as f:
+        return [Announcement.from_dict(record) for record in json.load(f)]
+
+
+def save_to_sqlite(data: Iterable[Dict], filename: str = 'kstartup.db', batch_size: int = 500):
+    """데이터를 SQLite 파일에 upsert 합니다 (이터레이터도 batch_size 단위로 나누어 처리)"""
+    store = AnnouncementStore(filename)
+    totals = {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    try:
+        batch = []
+        for record in data:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                for key, value in store.upsert_many(batch).items():
+                    totals[key] += value
+                batch = []
+        if batch:
+            for key, value in store.upsert_many(batch).items():
+                totals[key] += value
+    finally:
+        store.close()
+    print(f"데이터가 {filename}에 저장되었습니다. "
+          f"(신규 {totals['inserted']}개, 변경 {totals['updated']}개, 변경 없음 {totals['unchanged']}개)")
+
+
+def main():
+    """마감 임박 공고 조회 CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='SQLite에 저장된 K-Startup 공고 조회')
+    parser.add_argument('--db', default='kstartup.db', help='SQLite 파일 (기본값: kstartup.db)')
+    parser.add_argument('--days', type=int, default=7, help='오늘부터 며칠 안에 마감되는 공고 (기본값: 7)')
+    parser.add_argument('--keyword', default=None, help='제목/지원분야/대상에 포함될 키워드')
+    args = parser.parse_args()
+
+    store = AnnouncementStore(args.db)
+    try:
+        results = store.closing_within(args.days, args.keyword)
+    finally:
+        store.close()
+
+    print(f"{args.days}일 안에 마감되는 공고: {len(results)}개")
+    for ann in results:
+        print(f"  - [{ann['deadline']}] {ann['title']} ({ann['organization'] or 'N/A'})")
+        print(f"    {ann['url']}")
+
+
+if __name__ == '__main__':
+    main()
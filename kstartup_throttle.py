@@ -0,0 +1,338 @@
+"""
+K-Startup 요청 속도 조절 모듈
+모든 페이지 이동과 HTTP 요청을 하나의 스케줄러에 통과시켜 서버에 무리를 주지 않도록 합니다.
+
+- 토큰 버킷: 초당 요청 수 상한 (순간적인 몰림은 burst만큼 허용)
+- AIMD 동시성: 응답 시간이 괜찮으면 동시 요청 한도를 조금씩 늘리고,
+  타임아웃이나 5xx/429 응답이 오면 절반으로 줄입니다
+- 재시도: 지수 백오프 + 지터 (일시적인 오류만)
+- 서킷 브레이커: 연속 실패가 쌓이면 잠시 모든 요청을 멈춥니다
+"""
+
+import asyncio
+import random
+import socket
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+from kstartup_metrics import default_metrics
+
+
+# 다시 시도할 HTTP 상태 코드 (서버 과부하/일시 오류)
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# 기준 응답 시간보다 이만큼(초)까지 느린 것은 정상으로 봄 (아주 빠른 응답에서의 흔들림 무시)
+LATENCY_TOLERANCE = 0.05
+
+
+class ServerBusyError(Exception):
+    """서버가 과부하/일시 오류 상태 코드를 돌려준 경우"""
+
+    def __init__(self, status: int, url: str):
+        super().__init__(f"HTTP {status}: {url}")
+        self.status = status
+        self.url = url
+
+
+def is_retryable(error: Exception) -> bool:
+    """다시 시도해 볼 만한 일시적인 오류인지 판단합니다"""
+    status = getattr(error, 'status', None)
+    if status is not None:
+        return status in RETRYABLE_STATUSES
+    if isinstance(error, (TimeoutError, socket.timeout, ConnectionError)):
+        return True
+    # Playwright의 TimeoutError와 네트워크 오류 (net::ERR_CONNECTION_RESET 등)
+    return type(error).__name__ == 'TimeoutError' or 'net::ERR_' in str(error)
+
+
+class TokenBucket:
+    """초당 rate개의 토큰이 채워지는 버킷 (스레드 안전)
+
+    acquire는 토큰을 미리 예약하고 기다릴 시간만 돌려받으므로
+    동기/비동기 호출이 같은 버킷을 나누어 쓸 수 있습니다.
+    """
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """토큰 하나를 예약하고 기다려야 할 시간(초)을 돌려줍니다"""
+        if self.rate <= 0:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AimdLimiter:
+    """AIMD(가산 증가/승산 감소) 방식으로 동시 요청 한도를 조절하는 리미터
+
+    응답 시간이 기준 응답 시간(가장 빠른 이동 평균)의 latency_factor배 이내이면 한도를 한 창(window)에
+    약 1씩 늘리고, 과부하 신호가 오면 decrease배로 줄입니다.
+    """
+
+    def __init__(self, initial: int = 2, minimum: int = 1, maximum: int = 16,
+                 decrease: float = 0.5, latency_factor: float = 2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.in_flight = 0
+        self._latency_ewma: Optional[float] = None
+        self._baseline: Optional[float] = None
+        self._cond = threading.Condition()
+
+    def _has_slot(self) -> bool:
+        return self.in_flight < int(self.limit)
+
+    def acquire(self):
+        with self._cond:
+            while not self._has_slot():
+                self._cond.wait()
+            self.in_flight += 1
+
+    async def acquire_async(self):
+        # 이벤트 루프를 막지 않도록 짧게 양보하며 빈자리를 기다림
+        while True:
+            with self._cond:
+                if self._has_slot():
+                    self.in_flight += 1
+                    return
+            await asyncio.sleep(0.02)
+
+    def release(self):
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float):
+        with self._cond:
+            self._latency_ewma = latency if self._latency_ewma is None else 0.8 * self._latency_ewma + 0.2 * latency
+            if self._baseline is None or self._latency_ewma < self._baseline:
+                self._baseline = self._latency_ewma
+            else:
+                # 서버 상태가 바뀌어도 따라가도록 기준값을 천천히 올림
+                self._baseline = 0.99 * self._baseline + 0.01 * self._latency_ewma
+            healthy = max(self._baseline * self.latency_factor, self._baseline + LATENCY_TOLERANCE)
+            if self._latency_ewma <= healthy:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
+
+    def on_overload(self):
+        with self._cond:
+            self.limit = max(self.minimum, self.limit * self.decrease)
+
+
+class CircuitBreaker:
+    """연속 실패가 threshold번 쌓이면 cooldown초 동안 요청을 멈추게 하는 차단기
+
+    멈춘 시간이 지나면 요청 하나를 시험 삼아 보내고(half-open),
+    성공하면 닫히고 실패하면 다시 멈춥니다.
+    """
+
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0):
+        self.threshold = max(1, threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.trips = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def wait_time(self) -> float:
+        """요청을 보내기 전에 기다려야 할 시간 (닫혀 있으면 0)"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.threshold:
+                if self._opened_at is None or time.monotonic() >= self._opened_at + self.cooldown:
+                    self.trips += 1
+                    print(f"  연속 {self.failures}회 실패: {self.cooldown:g}초 동안 요청을 멈춥니다")
+                    default_metrics.increment('circuit_trips')
+                self._opened_at = time.monotonic()
+
+
+class PolitenessScheduler:
+    """토큰 버킷, AIMD 동시성, 재시도, 서킷 브레이커를 묶은 요청 스케줄러"""
+
+    def __init__(self, rate: float = 5.0, burst: int = 5, initial_concurrency: int = 2,
+                 max_concurrency: int = 16, max_retries: int = 3, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, breaker_threshold: int = 5, breaker_cooldown: float = 30.0):
+        """
+        Args:
+            rate: 초당 최대 요청 수 (0이면 제한 없음)
+            burst: 한꺼번에 보낼 수 있는 요청 수
+            initial_concurrency: 처음 동시 요청 한도
+            max_concurrency: 동시 요청 한도의 최댓값
+            max_retries: 일시적인 오류를 다시 시도할 최대 횟수
+            backoff_base: 첫 재시도 대기 시간의 상한 (초, 시도마다 2배)
+            backoff_max: 재시도 대기 시간의 최댓값 (초)
+            breaker_threshold: 요청을 멈추기 시작할 연속 실패 횟수
+            breaker_cooldown: 요청을 멈출 시간 (초)
+        """
+        self.configure(rate, burst, initial_concurrency, max_concurrency, max_retries,
+                       backoff_base, backoff_max, breaker_threshold, breaker_cooldown)
+
+    def configure(self, rate: float = 5.0, burst: int = 5, initial_concurrency: int = 2,
+                  max_concurrency: int = 16, max_retries: int = 3, backoff_base: float = 1.0,
+                  backoff_max: float = 30.0, breaker_threshold: int = 5, breaker_cooldown: float = 30.0):
+        """설정을 바꿉니다 (CLI 옵션 반영용, 집계는 초기화)"""
+        self.settings = {
+            'rate': rate, 'burst': burst, 'initial_concurrency': initial_concurrency,
+            'max_concurrency': max_concurrency, 'max_retries': max_retries,
+            'backoff_base': backoff_base, 'backoff_max': backoff_max,
+            'breaker_threshold': breaker_threshold, 'breaker_cooldown': breaker_cooldown,
+        }
+        self.bucket = TokenBucket(rate, burst)
+        self.limiter = AimdLimiter(initial_concurrency, maximum=max_concurrency)
+        self.breaker = CircuitBreaker(breaker_threshold, breaker_cooldown)
+        self.max_retries = max(0, max_retries)
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.requests = 0
+        self.retries = 0
+        self.failures = 0
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    def _on_error(self, error: Exception, attempt: int) -> bool:
+        """실패를 반영하고, 다시 시도해야 하면 True"""
+        retryable = is_retryable(error)
+        if retryable:
+            self.limiter.on_overload()
+            self.breaker.record_failure()
+        if not retryable or attempt >= self.max_retries:
+            self.failures += 1
+            return False
+        return True
+
+    def _on_success(self, latency: float):
+        self.limiter.on_success(latency)
+        self.breaker.record_success()
+
+    def _retry_delay(self, attempt: int, error: Exception) -> float:
+        self.retries += 1
+        default_metrics.increment('retries')
+        delay = self.backoff(attempt)
+        print(f"  일시적인 오류로 {delay:.1f}초 후 다시 시도합니다 ({attempt + 1}/{self.max_retries}): {error}")
+        return delay
+
+    def call(self, func: Callable, *args, **kwargs):
+        """func를 스케줄러 규칙에 따라 실행합니다 (일시적인 오류는 재시도, 마지막 오류는 그대로 발생)"""
+        attempt = 0
+        while True:
+            pause = self.breaker.wait_time()
+            if pause > 0:
+                time.sleep(pause)
+            self.limiter.acquire()
+            try:
+                self.bucket.acquire()
+                self.requests += 1
+                start = time.monotonic()
+                try:
+                    result = func(*args, **kwargs)
+                except Exception as e:
+                    if not self._on_error(e, attempt):
+                        raise
+                    error = e
+                else:
+                    self._on_success(time.monotonic() - start)
+                    return result
+            finally:
+                self.limiter.release()
+            time.sleep(self._retry_delay(attempt, error))
+            attempt += 1
+
+    async def call_async(self, func: Callable, *args, **kwargs):
+        """call의 비동기 버전 (func는 코루틴 함수)"""
+        attempt = 0
+        while True:
+            pause = self.breaker.wait_time()
+            if pause > 0:
+                await asyncio.sleep(pause)
+            await self.limiter.acquire_async()
+            try:
+                await self.bucket.acquire_async()
+                self.requests += 1
+                start = time.monotonic()
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    if not self._on_error(e, attempt):
+                        raise
+                    error = e
+                else:
+                    self._on_success(time.monotonic() - start)
+                    return result
+            finally:
+                self.limiter.release()
+            await asyncio.sleep(self._retry_delay(attempt, error))
+            attempt += 1
+
+    def navigate(self, page, url: str, **kwargs):
+        """page.goto를 스케줄러를 거쳐 실행합니다 (5xx/429 응답도 재시도 대상)"""
+        def goto():
+            response = page.goto(url, **kwargs)
+            if response is not None and response.status in RETRYABLE_STATUSES:
+                raise ServerBusyError(response.status, url)
+            return response
+        return self.call(goto)
+
+    async def navigate_async(self, page, url: str, **kwargs):
+        """navigate의 비동기 버전"""
+        async def goto():
+            response = await page.goto(url, **kwargs)
+            if response is not None and response.status in RETRYABLE_STATUSES:
+                raise ServerBusyError(response.status, url)
+            return response
+        return await self.call_async(goto)
+
+    def summary(self) -> Dict:
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'concurrency_limit': round(self.limiter.limit, 2),
+            'circuit_trips': self.breaker.trips,
+        }
+
+    def print_summary(self):
+        if not self.requests:
+            return
+        s = self.summary()
+        print(f"\n요청 스케줄러: 요청 {s['requests']}회, 재시도 {s['retries']}회, 최종 실패 {s['failures']}회, "
+              f"동시 요청 한도 {s['concurrency_limit']}, 요청 중단 {s['circuit_trips']}회")
+
+
+# 모든 페이지 이동과 HTTP 요청이 함께 쓰는 기본 스케줄러
+default_scheduler = PolitenessScheduler()
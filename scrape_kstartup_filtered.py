@@ -3,23 +3,61 @@ K-Startup 사업 공고 크롤링 및 필터링 스크립트
 여러 페이지를 크롤링하고, 회사 조건에 맞는 공고를 필터링합니다.
 """
 
-from playwright.sync_api import sync_playwright
+import argparse
 import json
-import csv
-from datetime import datetime
+import os
+from contextlib import nullcontext
 from typing import List, Dict, Optional
-import re
+
+from kstartup_attachments import AttachmentDownloader
+from kstartup_browser import connect_or_launch, set_attach
+from kstartup_capture import default_capture
+from kstartup_crawl import (
+    DEFAULT_CATEGORIES,
+    USER_AGENT,
+    ListPager,
+    collect_list_page,
+    mark_duplicates,
+    scrape_announcement_detail,
+)
+from kstartup_extract import install_extractor
+from kstartup_http import HttpClient, fetch_details_http
+from kstartup_matching import (
+    FilterResult,
+    KeywordAutomaton,
+    ProfileMatcher,
+    parse_company_years,
+    parse_years_range,
+    ranges_overlap,
+    search_text,
+)
+from kstartup_metrics import SlowPageTracer, default_metrics
+from kstartup_readiness import default_tracker
+from kstartup_recycle import PageRecycler, default_recycling
+from kstartup_record import to_dict, write_csv
+from kstartup_resources import ResourcePolicy, parse_csv_option
+from kstartup_search import update_search_index
+from kstartup_sink import JsonlSink, export_from_jsonl, iter_jsonl
+from kstartup_state import ChangeLog, CrawlState
+from kstartup_storage import load_announcements, save_to_sqlite
+from kstartup_throttle import default_scheduler
 
 
 class CompanyFilter:
-    """회사 조건에 맞는 공고를 필터링하는 클래스"""
+    """회사 조건에 맞는 공고를 필터링하는 클래스
+    
+    키워드와 업력 조건은 생성할 때 한 번만 컴파일합니다. 키워드는 Aho-Corasick
+    오토마톤으로 텍스트를 한 번 훑어 찾고, 공고의 업력 문자열은 숫자 범위로 바꾼 뒤
+    같은 문자열끼리 결과를 재사용합니다.
+    """
     
     def __init__(self, 
                  company_size: Optional[str] = None,
                  age_range: Optional[str] = None,
                  startup_experience: Optional[str] = None,
                  support_fields: List[str] = None,
-                 business_years: Optional[str] = None):
+                 business_years: Optional[str] = None,
+                 require_keywords: bool = False):
         """
         Args:
             company_size: 회사 규모 (예: "10명", "10명 이하")
@@ -27,366 +65,211 @@ class CompanyFilter:
             startup_experience: 창업인력 요구사항
             support_fields: 지원분야 리스트 (예: ["헬스케어", "건강", "임상", "AI"])
             business_years: 업력 (예: "5-7년", "5년 이상")
+            require_keywords: True이면 지원분야 키워드가 하나도 없는 공고를 제외합니다
+                (기본값은 완화된 조건: 키워드는 판정 근거로만 기록)
         """
         self.company_size = company_size
         self.age_range = age_range
         self.startup_experience = startup_experience
         self.support_fields = support_fields or []
         self.business_years = business_years
+        self.require_keywords = require_keywords
+        
+        self._automaton = KeywordAutomaton(self.support_fields)
+        self._years_range = parse_company_years(business_years)
     
-    def matches(self, announcement: Dict) -> bool:
-        """공고가 회사 조건에 맞는지 확인"""
-        # 지원분야 필터링 (헬스케어, 건강, 임상, AI 관련)
+    def filter_many(self, announcements: List[Dict]) -> List[FilterResult]:
+        """공고 목록 전체를 열 단위로 판정합니다 (결과는 입력 순서)"""
+        # 필요한 열만 한 번에 준비
+        years_texts = [ann.get('business_years') or '' for ann in announcements]
+        years_ranges = [parse_years_range(text) for text in years_texts]
         if self.support_fields:
-            title = announcement.get('title', '').lower()
-            support_field = announcement.get('support_field', '').lower()
-            content = announcement.get('content', '').lower()
-            target = announcement.get('target', '').lower()
+            keyword_hits = [self._automaton.find_keywords(search_text(ann)) for ann in announcements]
+        else:
+            keyword_hits = [[] for _ in announcements]
+        
+        results = []
+        for hits, years_text, years_range in zip(keyword_hits, years_texts, years_ranges):
+            matched = True
+            reasons = []
             
-            # 제목, 지원분야, 본문, 대상에 키워드가 포함되어 있는지 확인
-            text_to_check = f"{title} {support_field} {content} {target}"
+            # 지원분야 키워드
+            if hits:
+                reasons.append(f"키워드: {', '.join(hits)}")
+            elif self.support_fields and self.require_keywords:
+                matched = False
+                reasons.append("지원분야 키워드 없음")
             
-            # 키워드 매칭 (더 유연하게)
-            matched_keywords = []
-            for keyword in self.support_fields:
-                keyword_lower = keyword.lower()
-                if keyword_lower in text_to_check:
-                    matched_keywords.append(keyword)
+            # 업력: 공고의 업력 범위가 회사 업력 범위와 겹치면 통과
+            # ("전체"이거나 숫자 조건이 없는 공고는 통과)
+            if self._years_range and years_range is not None:
+                if ranges_overlap(years_range, self._years_range):
+                    reasons.append(f"업력 조건 일치: {years_text}")
+                else:
+                    matched = False
+                    reasons.append(f"업력 조건 불일치: {years_text}")
             
-            # 키워드 매칭 완화: 하나라도 매칭되면 통과
-            # (테스트를 위해 필터를 완화)
-            if not matched_keywords:
-                # 키워드가 없어도 일단 통과 (필터 완화)
-                pass
-            else:
-                # 키워드가 하나라도 있으면 통과
-                pass
-        
-        # 업력 필터링 (완화된 조건: 3-10년)
-        business_years_text = announcement.get('business_years', '').lower()
-        if business_years_text and "전체" not in business_years_text:
-            # "3년미만", "10년미만", "3년", "10년" 등 확인
-            # 3년 이상 10년 이하 범위에 포함되는지 확인
-            years_matches = re.findall(r'(\d+)년', business_years_text)
+            # 규모 필터링 (10명 남짓) - 보통 공고에 명시되지 않으므로 일단 통과
+            # 필요시 추가 필터링 가능
             
-            if years_matches:
-                years = [int(y) for y in years_matches]
-                # 3-10년 범위 확인 (더 넓은 범위)
-                if any(3 <= y <= 10 for y in years):
-                    pass  # OK
-                elif any("3년" in business_years_text or "4년" in business_years_text or 
-                        "5년" in business_years_text or "6년" in business_years_text or
-                        "7년" in business_years_text or "8년" in business_years_text or
-                        "9년" in business_years_text or "10년" in business_years_text for _ in [1]):
-                    pass  # OK
-                else:
-                    # 업력이 명시되어 있지만 범위 밖이면 제외
-                    # 단, "전체"나 조건이 없으면 통과
-                    if max(years) < 3 or min(years) > 10:
-                        # 범위 밖이지만 "미만" 같은 표현이 있으면 통과
-                        if "미만" not in business_years_text:
-                            return False
-        
-        # 규모 필터링 (10명 남짓) - 보통 공고에 명시되지 않으므로 일단 통과
-        # 필요시 추가 필터링 가능
-        
-        return True
+            results.append(FilterResult(matched, hits, reasons))
+        return results
+    
+    def evaluate(self, announcement: Dict) -> FilterResult:
+        """공고 하나를 판정하고 근거를 반환합니다"""
+        return self.filter_many([announcement])[0]
+    
+    def matches(self, announcement: Dict) -> bool:
+        """공고가 회사 조건에 맞는지 확인"""
+        return self.evaluate(announcement).matched
 
 
-def scrape_announcement_detail(page, url: str) -> Dict:
-    """공고 상세 페이지에서 정보를 추출합니다"""
-    try:
-        page.goto(url, wait_until='networkidle', timeout=30000)
-        page.wait_for_timeout(2000)
+def scrape_announcements_from_pages(start_page: int = 1, end_page: Optional[int] = None,
+                                    pbanc_clss_cds: Optional[List[str]] = None,
+                                    resource_policy: Optional[ResourcePolicy] = None,
+                                    http_client: Optional[HttpClient] = None,
+                                    http_workers: int = 8,
+                                    crawl_state: Optional[CrawlState] = None,
+                                    sink: Optional[JsonlSink] = None,
+                                    tracer: Optional[SlowPageTracer] = None,
+                                    downloader: Optional[AttachmentDownloader] = None) -> List[Dict]:
+    """여러 분류 코드의 목록 페이지에서 공고를 수집합니다
+    
+    분류 코드마다 첫 목록 페이지의 페이저에서 마지막 페이지 번호를 읽어 끝까지 수집하며,
+    end_page가 주어지면 그 페이지까지만 읽습니다. 여러 분류 코드에 함께 올라온 공고는
+    처음 나온 분류 코드에서 한 번만 수집합니다.
+    http_client가 주어지면 상세 페이지를 먼저 HTTP로 수집하고, 필드가 부족한
+    페이지만 브라우저로 다시 수집합니다.
+    crawl_state가 주어지면 최근에 수집한 공고는 저장된 결과를 재사용하고,
+    목록 페이지의 공고가 모두 이미 알려진 공고이면 그 분류 코드의 페이징을 멈춥니다.
+    sink가 주어지면 공고를 메모리에 모으지 않고 바로 JSONL에 기록하며
+    (반환값은 빈 리스트), 체크포인트 이전 공고는 건너뜁니다.
+    tracer가 주어지면 가장 느린 페이지들의 Playwright 트레이스를 남깁니다.
+    downloader가 주어지면 공고의 첨부파일을 크롤링과 동시에 받습니다.
+    """
+    all_announcements = []
+    pbanc_clss_cds = pbanc_clss_cds or DEFAULT_CATEGORIES
+    resource_policy = resource_policy or ResourcePolicy()
+    # 분류 코드 사이에서 공유하는 중복 확인 집합 (이어서 실행하면 이미 기록한 공고로 채움)
+    seen = sink.recorded_keys() if sink else set()
+    
+    def emit(record: Dict, page_num: int, index: int, category: int):
+        if downloader:
+            downloader.submit(record)
+        if sink:
+            sink.write(record, page_num, index, category)
+        else:
+            all_announcements.append(record)
+    
+    def trace(page_type: str, label: str):
+        return tracer.capture(page_type, label) if tracer else nullcontext()
+    
+    # 오프라인 재필터링 경로가 Playwright를 불러오지 않도록 여기서 import
+    from playwright.sync_api import sync_playwright
+    
+    with sync_playwright() as p:
+        browser = connect_or_launch(p)
         
-        # JavaScript를 사용하여 상세 정보 추출
-        detail = page.evaluate("""
-            () => {
-                const info = {
-                    title: '',
-                    support_field: '',
-                    age_range: '',
-                    target: '',
-                    business_years: '',
-                    region: '',
-                    application_period: '',
-                    organization: '',
-                    contact: '',
-                    content: ''
-                };
-                
-                // 제목
-                const titleEl = document.querySelector('h3');
-                if (titleEl) {
-                    info.title = titleEl.textContent.trim();
-                }
-                
-                // 정보 테이블에서 데이터 추출
-                const infoItems = document.querySelectorAll('li');
-                infoItems.forEach(item => {
-                    const label = item.querySelector('p:first-child')?.textContent.trim() || '';
-                    const value = item.querySelector('p:last-child')?.textContent.trim() || '';
-                    
-                    if (label.includes('지원분야')) {
-                        info.support_field = value;
-                    } else if (label.includes('대상연령')) {
-                        info.age_range = value;
-                    } else if (label.includes('대상')) {
-                        info.target = value;
-                    } else if (label.includes('창업업력') || label.includes('업력')) {
-                        info.business_years = value;
-                    } else if (label.includes('지역')) {
-                        info.region = value;
-                    } else if (label.includes('접수기간')) {
-                        info.application_period = value;
-                    } else if (label.includes('주관기관') || label.includes('기관명')) {
-                        info.organization = value;
-                    } else if (label.includes('연락처')) {
-                        info.contact = value;
-                    }
-                });
-                
-                // 본문 내용 일부 추출
-                const contentEl = document.querySelector('.ann_cont, .content, [class*="content"]');
-                if (contentEl) {
-                    info.content = contentEl.textContent.substring(0, 500).trim();
-                }
-                
-                return info;
-            }
-        """)
+        def open_context():
+            context = browser.new_context(user_agent=USER_AGENT)
+            resource_policy.install(context)
+            install_extractor(context)
+            default_capture.install(context)
+            if tracer:
+                tracer.start(context)
+            return context
         
-        detail['url'] = url
-        detail['scraped_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        def close_context(context):
+            if tracer:
+                tracer.stop()
+            context.close()
         
-        return detail
+        # 일정 횟수 이동하거나 메모리 한도를 넘으면 컨텍스트를 새로 만들어 렌더러 메모리를 비움
+        recycler = PageRecycler(browser, open_context, close_context)
         
-    except Exception as e:
-        print(f"  상세 정보 추출 실패: {e}")
-        return {
-            'title': '',
-            'url': url,
-            'error': str(e),
-            'scraped_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        }
-
-
-def scrape_announcements_from_pages(start_page: int = 1, end_page: int = 5, 
-                                    pbanc_clss_cd: str = 'PBC010') -> List[Dict]:
-    """여러 페이지에서 공고 목록을 수집합니다"""
-    all_announcements = []
-    
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        )
-        page = context.new_page()
+        def scrape_links(links: List[Dict], page_num: int, category: int):
+            # 이어서 실행하는 경우 체크포인트 이전 공고와 다른 분류 코드에서 이미 수집한 공고는 건너뜀
+            skipped = {i for i in range(len(links)) if sink and sink.should_skip(page_num, i, category)}
+            duplicates = mark_duplicates(links, seen) - skipped
+            skipped |= duplicates
+            
+            # 이미 수집한 최신 공고는 저장된 결과를 재사용
+            details = crawl_state.prefill(links) if crawl_state else [None] * len(links)
+            reused = {i for i, detail in enumerate(details) if detail is not None}
+            
+            # 목록 응답에 상세 필드까지 있었던 공고는 상세 페이지를 방문하지 않음
+            for i, link_info in enumerate(links):
+                if details[i] is None and link_info.get('detail'):
+                    details[i] = link_info['detail']
+            
+            # HTTP 수집 경로가 있으면 먼저 시도
+            if http_client:
+                pending = [i for i, detail in enumerate(details) if detail is None and i not in skipped]
+                fetched = fetch_details_http(
+                    http_client, [links[i]['url'] for i in pending], http_workers
+                )
+                for i, detail in zip(pending, fetched):
+                    details[i] = detail
+            
+            # 각 공고의 상세 정보 수집
+            for i, (link_info, detail) in enumerate(zip(links, details)):
+                if i in duplicates:
+                    print(f"  [{i + 1}/{len(links)}] {link_info['title'][:50]}... (다른 분류에서 수집됨)")
+                if i in skipped:
+                    continue
+                if i in reused:
+                    print(f"  [{i + 1}/{len(links)}] {link_info['title'][:50]}... (이미 수집됨)")
+                    emit(detail, page_num, i, category)
+                    continue
+                
+                print(f"  [{i + 1}/{len(links)}] {link_info['title'][:50]}...")
+                if detail is None:
+                    with trace('detail', str(link_info.get('pbanc_sn'))):
+                        detail = recycler.run(scrape_announcement_detail, link_info['url'])
+                detail['pbanc_sn'] = link_info.get('pbanc_sn')
+                emit(detail, page_num, i, category)
+                if crawl_state:
+                    crawl_state.update(detail['pbanc_sn'], detail)
         
         try:
-            for page_num in range(start_page, end_page + 1):
-                print(f"\n페이지 {page_num} 크롤링 중...")
-                url = f'https://www.k-startup.go.kr/web/contents/bizpbanc-ongoing.do?page={page_num}&pbancClssCd={pbanc_clss_cd}'
+            for category, pbanc_clss_cd in enumerate(pbanc_clss_cds):
+                if sink and sink.skips_category(category):
+                    continue
+                pager = ListPager(sink.resume_page(start_page, category) if sink else start_page, end_page)
                 
-                try:
-                    page.goto(url, wait_until='networkidle', timeout=30000)
-                    page.wait_for_timeout(5000)  # 더 긴 대기 시간
-                    
-                    # 페이지 스크롤하여 동적 콘텐츠 로드 유도
-                    page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                    page.wait_for_timeout(2000)
-                    page.evaluate("window.scrollTo(0, 0)")
-                    page.wait_for_timeout(2000)
-                    
-                    # 공고 목록이 로드될 때까지 대기 (여러 선택자 시도)
-                    selectors = [
-                        '.basic_item',
-                        '.list_item', 
-                        'a[href*="pbancSn"]',
-                        '[class*="item"]',
-                        '.link_box-list a',
-                        '.text_list a'
-                    ]
-                    
-                    loaded = False
-                    for selector in selectors:
-                        try:
-                            page.wait_for_selector(selector, timeout=3000, state='attached')
-                            loaded = True
-                            break
-                        except:
-                            continue
-                    
-                    if not loaded:
-                        # 추가 대기
-                        page.wait_for_timeout(3000)
-                    
-                    # 공고 링크 추출 (basic_item 클래스 사용)
-                    links = page.evaluate("""
-                        () => {
-                            const links = [];
-                            const seenUrls = new Set();
-                            
-                            // basic_item 클래스 내의 링크 찾기
-                            const items = document.querySelectorAll('.basic_item, .list_item, [class*="item"]');
-                            
-                            items.forEach(item => {
-                                // 각 아이템 내에서 링크 찾기
-                                const linkEl = item.querySelector('a');
-                                if (!linkEl) return;
-                                
-                                let href = linkEl.getAttribute('href') || '';
-                                
-                                // onclick에서 URL 추출
-                                if (!href || href.startsWith('javascript:')) {
-                                    const onclick = linkEl.getAttribute('onclick') || '';
-                                    const match = onclick.match(/['"]([^'"]*pbancSn=[^'"]*)['"]/);
-                                    if (match) {
-                                        href = match[1];
-                                    } else if (onclick.includes('pbancSn')) {
-                                        // onclick에서 직접 추출
-                                        const pbancMatch = onclick.match(/pbancSn=([^&'"]+)/);
-                                        if (pbancMatch) {
-                                            href = 'bizpbanc-ongoing.do?schM=view&pbancSn=' + pbancMatch[1];
-                                        }
-                                    }
-                                }
-                                
-                                if (!href || !href.includes('pbancSn=')) return;
-                                
-                                // 제목 추출 (링크 텍스트 또는 아이템 내의 제목 요소)
-                                let title = linkEl.textContent.trim();
-                                if (!title || title.length < 5) {
-                                    const titleEl = item.querySelector('.title, h3, h4, [class*="title"]');
-                                    if (titleEl) title = titleEl.textContent.trim();
-                                }
-                                
-                                if (!title || title.length < 5 || title.includes('더보기') || title.includes('목록')) {
-                                    return;
-                                }
-                                
-                                // URL 정규화
-                                let fullUrl = href;
-                                if (href.startsWith('/')) {
-                                    fullUrl = 'https://www.k-startup.go.kr' + href;
-                                } else if (!href.startsWith('http')) {
-                                    if (href.includes('bizpbanc-ongoing.do')) {
-                                        fullUrl = 'https://www.k-startup.go.kr/web/contents/' + href;
-                                    } else {
-                                        fullUrl = 'https://www.k-startup.go.kr/' + href;
-                                    }
-                                }
-                                
-                                if (seenUrls.has(fullUrl)) return;
-                                seenUrls.add(fullUrl);
-                                    
-                                // pbancSn 추출
-                                let pbancSn = null;
-                                const pbancMatch = href.match(/pbancSn=([^&'"]+)/);
-                                if (pbancMatch) {
-                                    pbancSn = pbancMatch[1];
-                                }
-                                
-                                links.push({
-                                    title: title,
-                                    url: fullUrl,
-                                    pbanc_sn: pbancSn
-                                });
-                            });
-                            
-                            // 방법 2: 모든 링크에서 직접 찾기 (우선 실행)
-                            const allLinks = document.querySelectorAll('a');
-                            allLinks.forEach(link => {
-                                let href = link.getAttribute('href') || '';
-                                const onclick = link.getAttribute('onclick') || '';
-                                
-                                // onclick에서 URL 추출
-                                if ((!href || href.startsWith('javascript:')) && onclick) {
-                                    const match = onclick.match(/['"]([^'"]*pbancSn=[^'"]*)['"]/);
-                                    if (match) {
-                                        href = match[1];
-                                    } else {
-                                        const pbancMatch = onclick.match(/pbancSn=([^&'"]+)/);
-                                        if (pbancMatch) {
-                                            href = '/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn=' + pbancMatch[1];
-                                        }
-                                    }
-                                }
-                                
-                                if (!href || !href.includes('pbancSn=')) return;
-                                
-                                // 제목 추출
-                                let title = link.textContent.trim();
-                                
-                                // 부모 요소에서 제목 찾기
-                                if (!title || title.length < 5) {
-                                    let parent = link.parentElement;
-                                    for (let i = 0; i < 3 && parent; i++) {
-                                        const titleEl = parent.querySelector('.title, h3, h4, h5, [class*="title"], [class*="subject"]');
-                                        if (titleEl) {
-                                            title = titleEl.textContent.trim();
-                                            break;
-                                        }
-                                        parent = parent.parentElement;
-                                    }
-                                }
-                                
-                                if (!title || title.length < 5 || 
-                                    title.includes('더보기') || title.includes('목록') ||
-                                    title.includes('이전') || title.includes('다음') ||
-                                    title.includes('페이스북') || title.includes('트위터')) {
-                                    return;
-                                }
-                                
-                                // URL 정규화
-                                let fullUrl = href;
-                                if (href.startsWith('/')) {
-                                    fullUrl = 'https://www.k-startup.go.kr' + href;
-                                } else if (!href.startsWith('http')) {
-                                    if (href.includes('bizpbanc-ongoing.do')) {
-                                        fullUrl = 'https://www.k-startup.go.kr/web/contents/' + href.replace(/^\\//, '');
-                                    } else {
-                                        fullUrl = 'https://www.k-startup.go.kr/' + href;
-                                    }
-                                }
-                                
-                                if (seenUrls.has(fullUrl)) return;
-                                seenUrls.add(fullUrl);
-                                
-                                // pbancSn 추출
-                                let pbancSn = null;
-                                const pbancMatch = href.match(/pbancSn=([^&'"]+)/);
-                                if (pbancMatch) {
-                                    pbancSn = pbancMatch[1];
-                                }
-                                
-                                links.push({
-                                    title: title,
-                                    url: fullUrl,
-                                    pbanc_sn: pbancSn
-                                });
-                            });
-                            
-                            return links;
-                        }
-                    """)
+                for page_num in pager.pages():
+                    print(f"\n[{pbanc_clss_cd}] 페이지 {pager.label(page_num)} 크롤링 중...")
                     
-                    print(f"  발견된 공고: {len(links)}개")
-                    
-                    # 각 공고의 상세 정보 수집
-                    for i, link_info in enumerate(links, 1):
-                        print(f"  [{i}/{len(links)}] {link_info['title'][:50]}...")
-                        detail = scrape_announcement_detail(page, link_info['url'])
-                        detail['pbanc_sn'] = link_info.get('pbanc_sn')
-                        all_announcements.append(detail)
+                    try:
+                        with trace('list', f'{pbanc_clss_cd}-page{page_num}'):
+                            links, page_count = recycler.run(collect_list_page, page_num, pbanc_clss_cd)
+                        pager.update(page_num, links, page_count)
                         
-                except Exception as e:
-                    print(f"페이지 {page_num} 처리 중 오류: {e}")
-                    continue
+                        print(f"  발견된 공고: {len(links)}개")
+                        if crawl_state:
+                            crawl_state.mark_listed(links)
+                        
+                        scrape_links(links, page_num, category)
+                        
+                        if crawl_state:
+                            crawl_state.save()
+                            if crawl_state.all_known(links):
+                                print("  목록의 공고가 모두 이미 수집된 공고입니다. 이 분류 코드의 페이징을 중단합니다.")
+                                break
+                            
+                    except Exception as e:
+                        print(f"페이지 {page_num} 처리 중 오류: {e}")
+                        if crawl_state:
+                            crawl_state.mark_list_error()
+                        continue
+                
+                if crawl_state and pager.exhausted:
+                    crawl_state.mark_list_end(pbanc_clss_cd)
         
         except Exception as e:
             print(f"크롤링 중 오류 발생: {e}")
         finally:
+            recycler.close()
             browser.close()
     
     return all_announcements
@@ -394,19 +277,62 @@ def scrape_announcements_from_pages(start_page: int = 1, end_page: int = 5,
 
 def filter_announcements(announcements: List[Dict], company_filter: CompanyFilter) -> List[Dict]:
     """공고 목록을 필터링합니다"""
-    filtered = []
-    
-    for ann in announcements:
-        if company_filter.matches(ann):
-            filtered.append(ann)
-    
+    with default_metrics.time('filter', 'company'):
+        results = company_filter.filter_many(announcements)
+    filtered = [ann for ann, result in zip(announcements, results) if result.matched]
+    default_metrics.increment('announcements', len(announcements), result='evaluated')
+    default_metrics.increment('announcements', len(filtered), result='matched')
     return filtered
 
 
+# --offline에서 원본을 지정하지 않았을 때 찾아보는 파일 (앞쪽 우선)
+OFFLINE_SOURCES = ['kstartup_all.jsonl', 'kstartup_all.json', 'kstartup.db']
+
+
+def find_offline_source() -> Optional[str]:
+    for source in OFFLINE_SOURCES:
+        if os.path.exists(source):
+            return source
+    return None
+
+
+def load_profiles(filename: str) -> Dict[str, CompanyFilter]:
+    """회사 프로필 JSON 파일을 읽습니다
+    
+    형식: {"프로필 이름": {"support_fields": [...], "business_years": "3-10년", ...}, ...}
+    각 항목의 키는 CompanyFilter 생성자 인자와 같습니다.
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        specs = json.load(f)
+    return {name: CompanyFilter(**spec) for name, spec in specs.items()}
+
+
+def match_profiles(announcements: List[Dict], profiles: Dict[str, CompanyFilter],
+                   prefix: str = 'kstartup_filtered') -> Dict[str, List[Dict]]:
+    """여러 회사 프로필을 한 번에 매칭하고 프로필별 결과를 저장합니다"""
+    matcher = ProfileMatcher(profiles)
+    optional = matcher.optional_profiles
+    if optional:
+        # 키워드가 필수가 아닌 프로필은 업력으로만 후보가 좁혀져 공고 대부분과 매칭됨
+        scope = '모든 프로필이' if len(optional) == len(profiles) else f"프로필 {len(optional)}개({', '.join(optional)})가"
+        print(f"  주의: {scope} require_keywords 없이 키워드를 판정 근거로만 사용하므로 "
+              f"업력 조건으로만 걸러집니다. 키워드로 좁히려면 \"require_keywords\": true를 지정하세요.")
+    with default_metrics.time('filter', 'profiles'):
+        matches = matcher.match(announcements)
+    results = {}
+    for name, matched in matches.items():
+        results[name] = [ann for ann, _ in matched]
+        print(f"  - {name}: {len(matched)}개")
+        if matched:
+            save_to_json(results[name], f'{prefix}_{name}.json')
+            save_to_csv(results[name], f'{prefix}_{name}.csv')
+    return results
+
+
 def save_to_json(data: List[Dict], filename: str = 'kstartup_filtered.json'):
     """데이터를 JSON 파일로 저장"""
-    with open(filename, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    with default_metrics.time('save', 'json'), open(filename, 'w', encoding='utf-8') as f:
+        json.dump([to_dict(record) for record in data], f, ensure_ascii=False, indent=2)
     print(f"\n데이터가 {filename}에 저장되었습니다.")
 
 
@@ -416,47 +342,335 @@ def save_to_csv(data: List[Dict], filename: str = 'kstartup_filtered.csv'):
         print("저장할 데이터가 없습니다.")
         return
     
-    # 모든 필드명 수집
-    fieldnames = set()
-    for item in data:
-        fieldnames.update(item.keys())
-    
-    fieldnames = sorted(list(fieldnames))
-    
-    with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(data)
+    # 열은 공고 스키마로 고정되어 있으므로 행을 한 번만 훑으며 씀
+    with default_metrics.time('save', 'csv'), open(filename, 'w', newline='', encoding='utf-8-sig') as f:
+        write_csv(f, data)
     print(f"데이터가 {filename}에 저장되었습니다.")
 
 
-def main():
-    """메인 함수"""
-    print("=" * 70)
-    print("K-Startup 사업 공고 크롤링 및 필터링")
+def print_filtered_preview(filtered: List[Dict]):
+    """조건에 맞는 공고 목록을 출력합니다"""
+    print("\n" + "=" * 70)
+    print("조건에 맞는 공고 목록:")
     print("=" * 70)
+    for i, ann in enumerate(filtered, 1):
+        print(f"\n{i}. {ann.get('title', '제목 없음')}")
+        print(f"   지원분야: {ann.get('support_field', 'N/A')}")
+        print(f"   업력: {ann.get('business_years', 'N/A')}")
+        print(f"   대상: {ann.get('target', 'N/A')}")
+        print(f"   지역: {ann.get('region', 'N/A')}")
+        print(f"   접수기간: {ann.get('application_period', 'N/A')}")
+        print(f"   URL: {ann.get('url', 'N/A')}")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """명령행 인자를 해석합니다"""
+    parser = argparse.ArgumentParser(description='K-Startup 사업 공고 크롤링 및 필터링')
+    parser.add_argument('--start-page', type=int, default=1, help='크롤링 시작 페이지 (기본값: 1)')
+    parser.add_argument('--end-page', type=int, default=None,
+                        help='크롤링 마지막 페이지. 지정하지 않으면 목록 페이저에서 읽은 마지막 페이지까지 '
+                             '수집하고, 지정하면 그 페이지를 넘지 않습니다')
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help='상세 페이지 동시 수집 수. 2 이상이면 비동기 페이지 풀을 사용합니다 (기본값: 1)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='2 이상이면 목록 페이지를 여러 프로세스에 나누어 크롤링합니다. '
+                             '각 프로세스가 브라우저를 하나씩 띄웁니다 (기본값: 1)')
+    parser.add_argument('--pipeline', action='store_true',
+                        help='목록 수집, 상세 수집, 필터/저장을 겹쳐 실행합니다. 조건에 맞는 공고는 찾는 즉시 '
+                             'kstartup_filtered.json/csv에 기록됩니다 (상세 워커 수는 --concurrency, JSONL 기록 사용)')
+    parser.add_argument('--pipeline-buffer', type=int, default=32,
+                        help='파이프라인에서 동시에 처리 중인 공고의 최대 수 (기본값: 32)')
+    parser.add_argument('--categories', default=','.join(DEFAULT_CATEGORIES),
+                        help='한 번에 크롤링할 공고 분류 코드 (쉼표 구분, 기본값: PBC010). '
+                             '여러 분류 코드에 올라온 공고는 상세 페이지를 한 번만 수집합니다')
+    parser.add_argument('--detail-backend', choices=['browser', 'http'], default='browser',
+                        help='상세 페이지 수집 방식. http는 브라우저 없이 HTML을 직접 파싱하고, '
+                             '필드가 부족한 페이지만 브라우저로 수집합니다 (기본값: browser)')
+    parser.add_argument('--http-workers', type=int, default=8,
+                        help='HTTP 수집 시 동시 요청 수 (기본값: 8)')
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='초당 최대 요청 수 (페이지 이동과 HTTP 요청 합계, 0이면 제한 없음, 기본값: 5)')
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help='타임아웃/5xx 응답을 다시 시도할 최대 횟수 (기본값: 3)')
+    parser.add_argument('--breaker-cooldown', type=float, default=30.0,
+                        help='연속 실패가 쌓였을 때 요청을 멈출 시간 (초, 기본값: 30)')
+    parser.add_argument('--recycle-after', type=int, default=200,
+                        help='브라우저 컨텍스트 하나로 이동할 최대 페이지 수. 넘으면 컨텍스트를 새로 만듭니다 '
+                             '(0이면 사용 안 함, 기본값: 200)')
+    parser.add_argument('--max-browser-mb', type=float, default=0.0,
+                        help='브라우저/렌더러 프로세스 RSS 합계가 이 값(MB)을 넘으면 컨텍스트를 새로 만듭니다 '
+                             '(0이면 측정만 함)')
+    parser.add_argument('--incremental', action='store_true',
+                        help='상태 파일을 사용해 이미 수집한 공고는 건너뛰고, 새 공고가 없는 페이지에서 페이징을 멈춥니다')
+    parser.add_argument('--state-file', default='kstartup_state.json',
+                        help='증분 크롤링 상태 파일 (기본값: kstartup_state.json)')
+    parser.add_argument('--max-age-hours', type=float, default=24.0,
+                        help='이 시간 안에 수집한 공고는 다시 방문하지 않습니다 (기본값: 24)')
+    parser.add_argument('--delta', nargs='?', const='kstartup_delta.jsonl', default=None, metavar='PATH',
+                        help='상태 파일과 비교해 새 공고/바뀐 필드/사라진 공고만 이 JSONL에 기록합니다 '
+                             '(경로 미지정 시 kstartup_delta.jsonl)')
+    parser.add_argument('--jsonl', default=None,
+                        help='공고를 추출하는 즉시 이 JSONL 파일에 기록하고, 끝난 뒤 JSON/CSV를 만듭니다')
+    parser.add_argument('--resume', action='store_true',
+                        help='JSONL 체크포인트에서 중단된 크롤링을 이어서 실행합니다 '
+                             '(--jsonl 미지정 시 kstartup_all.jsonl)')
+    parser.add_argument('--fsync-every', type=int, default=20,
+                        help='JSONL을 디스크에 동기화하고 체크포인트를 남기는 간격 (기본값: 20개)')
+    parser.add_argument('--attachments', default=None, metavar='DIR',
+                        help='공고 첨부파일(공고문 PDF/HWP 등)을 이 디렉터리에 받습니다 (예: attachments)')
+    parser.add_argument('--attachment-workers', type=int, default=4,
+                        help='동시에 받을 첨부파일 수 (기본값: 4)')
+    parser.add_argument('--sqlite', default=None,
+                        help='수집한 공고를 이 SQLite 파일에 upsert 합니다 (예: kstartup.db)')
+    parser.add_argument('--search-index', default=None,
+                        help='수집한 공고를 이 전문 검색 색인에 반영합니다 (예: kstartup_search.db)')
+    parser.add_argument('--profiles', default=None,
+                        help='여러 회사 프로필 JSON 파일. 지정하면 프로필별로 한 번에 매칭하여 '
+                             'kstartup_filtered_<이름>.json/csv를 저장합니다')
+    parser.add_argument('--offline', nargs='?', const='auto', default=None, metavar='SOURCE',
+                        help='브라우저를 실행하지 않고 저장된 공고(.jsonl/.json/.db)를 다시 필터링합니다. '
+                             f'SOURCE를 생략하면 {", ".join(OFFLINE_SOURCES)} 순서로 찾습니다')
+    parser.add_argument('--keywords', default=None,
+                        help='지원분야 키워드 (쉼표 구분, 기본값: 헬스,건강,임상,AI,의료,의약,바이오,치료,진단,의학)')
+    parser.add_argument('--business-years', default=None,
+                        help='회사 업력 조건 (예: "3-10년", "5년 이상", 기본값: 3-10년)')
+    parser.add_argument('--require-keywords', action='store_true',
+                        help='지원분야 키워드가 하나도 없는 공고를 제외합니다')
+    parser.add_argument('--allow-types', default=None,
+                        help='허용할 리소스 유형 (쉼표 구분, 기본값: document,script,xhr,fetch)')
+    parser.add_argument('--allow-hosts', default=None,
+                        help='허용할 호스트 (쉼표 구분, 하위 도메인 포함, '
+                             '기본값: k-startup.go.kr과 KSTARTUP_BASE_URL의 호스트)')
+    parser.add_argument('--load-all-resources', action='store_true',
+                        help='리소스 차단 없이 모든 요청을 허용합니다')
+    parser.add_argument('--dom-only', action='store_true',
+                        help='배경 요청의 JSON 응답을 사용하지 않고 항상 렌더링된 DOM에서 추출합니다')
+    parser.add_argument('--metrics-prefix', default='kstartup_metrics',
+                        help='단계별 계측 결과 파일 이름 (<이름>.json, <이름>.prom, 기본값: kstartup_metrics)')
+    parser.add_argument('--attach-browser', action='store_true',
+                        help='kstartup_browser.py serve로 띄운 상주 브라우저가 있으면 연결해 사용합니다 '
+                             '(--processes 워커는 항상 자기 브라우저를 실행)')
+    parser.add_argument('--trace-slowest', type=int, default=0, metavar='N',
+                        help='가장 느린 페이지 N개의 Playwright 트레이스를 남깁니다 (순차 실행에만 적용)')
+    parser.add_argument('--trace-dir', default='traces',
+                        help='트레이스 저장 디렉터리 (기본값: traces)')
+    args = parser.parse_args(argv)
+    
+    # 분산 실행은 워커 결과를 모두 모은 뒤 한 번에 기록하므로 이어서 실행, 결과 재사용,
+    # HTTP 상세 수집을 지원하지 않음
+    if args.processes > 1 and not args.pipeline:
+        unsupported = [option for option, used in (
+            ('--resume', args.resume),
+            ('--incremental', args.incremental),
+            ('--detail-backend http', args.detail_backend == 'http'),
+        ) if used]
+        if unsupported:
+            parser.error(f"--processes는 {', '.join(unsupported)}와 함께 쓸 수 없습니다")
+    return args
+
+
+def build_company_filter(args: argparse.Namespace) -> CompanyFilter:
+    """명령행 인자로 회사 조건을 만듭니다 (지정하지 않은 항목은 기본 조건)"""
+    keywords = parse_csv_option(args.keywords)
     
     # 회사 조건 설정 (테스트용 - 완화된 조건)
     print("\n회사 조건 (테스트용 - 완화된 조건):")
     print("  - 규모: 10명 남짓 (필터링 완화)")
-    print("  - 지원분야: 헬스케어, 건강, 임상, AI, 의료, 바이오, 헬스 관련 (키워드만 확인)")
-    print("  - 업력: 5-7년 (범위 확대: 3-10년까지 허용)")
+    if keywords:
+        print(f"  - 지원분야: {', '.join(keywords)}")
+    else:
+        print("  - 지원분야: 헬스케어, 건강, 임상, AI, 의료, 바이오, 헬스 관련 (키워드만 확인)")
+    if args.business_years:
+        print(f"  - 업력: {args.business_years}")
+    else:
+        print("  - 업력: 5-7년 (범위 확대: 3-10년까지 허용)")
     
     # 필터 조건 완화: 지원분야는 키워드만 확인하고, 업력 범위도 넓게
-    company_filter = CompanyFilter(
+    return CompanyFilter(
         company_size="10명",
-        support_fields=["헬스", "건강", "임상", "AI", "의료", "의약", "바이오", "치료", "진단", "의학"],  # 더 많은 키워드
-        business_years="3-10년"  # 범위 확대
+        support_fields=keywords or ["헬스", "건강", "임상", "AI", "의료", "의약", "바이오", "치료", "진단", "의학"],  # 더 많은 키워드
+        business_years=args.business_years or "3-10년",  # 범위 확대
+        require_keywords=args.require_keywords
+    )
+
+
+def run_offline(args: argparse.Namespace, company_filter: CompanyFilter):
+    """저장된 공고를 다시 필터링합니다 (브라우저를 실행하지 않음)"""
+    source = find_offline_source() if args.offline == 'auto' else args.offline
+    if not source or not os.path.exists(source):
+        print(f"\n저장된 공고를 찾을 수 없습니다: {source or ', '.join(OFFLINE_SOURCES)}")
+        return
+    
+    announcements = load_announcements(source)
+    print(f"\n{source}에서 {len(announcements)}개의 공고를 불러왔습니다.")
+    
+    if args.profiles:
+        profiles = load_profiles(args.profiles)
+        print(f"\n{len(profiles)}개 회사 프로필 매칭 중...")
+        match_profiles(announcements, profiles)
+    
+    print("\n조건에 맞는 공고 필터링 중...")
+    filtered = filter_announcements(announcements, company_filter)
+    print(f"필터링 결과: {len(filtered)}개의 공고가 조건에 맞습니다.")
+    
+    save_to_json(filtered, 'kstartup_filtered.json')
+    save_to_csv(filtered, 'kstartup_filtered.csv')
+    if filtered:
+        print_filtered_preview(filtered)
+
+
+def run_crawl(args: argparse.Namespace, company_filter: CompanyFilter):
+    """공고를 크롤링한 뒤 필터링해 저장합니다"""
+    resource_policy = ResourcePolicy(
+        allowed_types=parse_csv_option(args.allow_types),
+        allowed_hosts=parse_csv_option(args.allow_hosts),
+        enabled=not args.load_all_resources,
+    )
+    
+    if args.attach_browser:
+        set_attach(True)
+    
+    # 모든 페이지 이동과 HTTP 요청이 거치는 스케줄러 설정 (동시 요청 한도는 응답 상태에 따라 조절)
+    default_scheduler.configure(
+        rate=args.rate, burst=max(1, int(args.rate)), initial_concurrency=2,
+        max_concurrency=max(args.concurrency, args.http_workers), max_retries=args.max_retries,
+        breaker_cooldown=args.breaker_cooldown,
     )
+    # 긴 크롤링에서 렌더러 메모리가 계속 늘지 않도록 컨텍스트를 주기적으로 새로 만듦
+    default_recycling.configure(max_navigations=args.recycle_after, max_rss_mb=args.max_browser_mb)
+    
+    # --delta만 주면 상태 파일은 변경 감지에만 쓰고 공고는 모두 다시 수집함
+    change_log = ChangeLog(args.delta) if args.delta else None
+    crawl_state = None
+    if args.incremental or change_log:
+        crawl_state = CrawlState(args.state_file, args.max_age_hours, reuse=args.incremental, change_log=change_log)
+    default_capture.enabled = not args.dom_only
+    
+    http_client = None
+    if args.detail_backend == 'http':
+        http_client = HttpClient(max_connections=args.http_workers, user_agent=USER_AGENT)
+    
+    sink = None
+    if args.jsonl or args.resume or args.pipeline:
+        sink = JsonlSink(args.jsonl or 'kstartup_all.jsonl', fsync_every=args.fsync_every, resume=args.resume)
+    
+    tracer = SlowPageTracer(args.trace_slowest, args.trace_dir) if args.trace_slowest else None
+    
+    downloader = None
+    if args.attachments:
+        downloader = AttachmentDownloader(args.attachments, args.attachment_workers, user_agent=USER_AGENT)
+    
+    # 크롤링 실행 (분류 코드마다 목록 끝까지, --end-page가 있으면 그 페이지까지)
+    categories = parse_csv_option(args.categories) or DEFAULT_CATEGORIES
+    print(f"\n공고 크롤링 시작 (분류 코드: {', '.join(categories)})...")
+    completed = False
+    pipeline_filtered = None
+    try:
+        if args.pipeline:
+            from kstartup_pipeline import crawl_pipelined
+            _, pipeline_filtered = crawl_pipelined(
+                start_page=args.start_page, end_page=args.end_page, sink=sink, pbanc_clss_cds=categories,
+                concurrency=args.concurrency, max_in_flight=args.pipeline_buffer,
+                resource_policy=resource_policy, http_client=http_client, crawl_state=crawl_state,
+                matches=company_filter.matches, downloader=downloader
+            )
+            announcements = []
+        elif args.processes > 1:
+            from kstartup_sharded import scrape_announcements_sharded
+            announcements = scrape_announcements_sharded(
+                start_page=args.start_page, end_page=args.end_page,
+                pbanc_clss_cds=categories, processes=args.processes,
+                resource_policy=resource_policy, scheduler_settings=default_scheduler.settings,
+                recycle_settings=default_recycling.settings
+            )
+            # 워커 결과는 모두 모인 뒤 한 번에 기록 (--resume은 parse_args에서 막으므로 위치는 순번만 남김)
+            for index, record in enumerate(announcements):
+                if sink:
+                    sink.write(record, 0, index)
+                if downloader:
+                    downloader.submit(record)
+                if crawl_state and record.get('pbanc_sn') and not record.get('error'):
+                    crawl_state.update(record['pbanc_sn'], record)
+            if crawl_state:
+                crawl_state.save()
+        elif args.concurrency > 1:
+            from kstartup_async import scrape_announcements_concurrently
+            announcements = scrape_announcements_concurrently(
+                start_page=args.start_page, end_page=args.end_page, pbanc_clss_cds=categories,
+                concurrency=args.concurrency, resource_policy=resource_policy, http_client=http_client,
+                crawl_state=crawl_state, sink=sink, downloader=downloader
+            )
+        else:
+            announcements = scrape_announcements_from_pages(
+                start_page=args.start_page, end_page=args.end_page, pbanc_clss_cds=categories,
+                resource_policy=resource_policy, http_client=http_client, http_workers=args.http_workers,
+                crawl_state=crawl_state, sink=sink, tracer=tracer, downloader=downloader
+            )
+        completed = True
+    finally:
+        if tracer:
+            tracer.print_summary()
+        if http_client:
+            http_client.close()
+        if downloader:
+            # 남은 첨부파일을 마저 받음 (중단된 경우에도 받다 만 파일은 다음 실행에서 이어 받음)
+            downloader.close()
+        if sink:
+            # 중단된 경우 체크포인트를 남겨 --resume으로 이어서 실행할 수 있게 함
+            sink.close(completed=completed)
+        if crawl_state:
+            # 모든 분류 코드를 1페이지부터 끝까지 읽은 실행에서만 목록에 없던 공고를 사라진 것으로 표시
+            crawl_state.finish_run(completed and args.start_page == 1 and not (sink and sink.checkpoint), categories)
+            crawl_state.save()
+        if change_log:
+            change_log.close()
+    
+    if sink:
+        print(f"\n이번 실행에서 {sink.written}개의 공고를 {sink.path}에 기록했습니다.")
+    else:
+        print(f"\n총 {len(announcements)}개의 공고를 수집했습니다.")
+    default_tracker.print_summary()
+    resource_policy.print_summary()
+    default_capture.print_summary()
+    if downloader:
+        downloader.print_summary()
+    default_scheduler.print_summary()
+    default_recycling.print_summary()
+    if crawl_state:
+        crawl_state.print_summary()
+    if change_log:
+        change_log.print_summary()
     
-    # 크롤링 실행 (1~5페이지)
-    print("\n공고 크롤링 시작...")
-    announcements = scrape_announcements_from_pages(start_page=1, end_page=5)
+    if args.sqlite:
+        with default_metrics.time('save', 'sqlite'):
+            save_to_sqlite(iter_jsonl(sink.path) if sink else announcements, args.sqlite)
+    if args.search_index:
+        with default_metrics.time('save', 'search_index'):
+            update_search_index(iter_jsonl(sink.path) if sink else announcements, args.search_index)
     
-    print(f"\n총 {len(announcements)}개의 공고를 수집했습니다.")
+    if args.profiles:
+        profiles = load_profiles(args.profiles)
+        print(f"\n{len(profiles)}개 회사 프로필 매칭 중...")
+        match_profiles(list(iter_jsonl(sink.path)) if sink else announcements, profiles)
     
     # 필터링
     print("\n조건에 맞는 공고 필터링 중...")
+    if sink:
+        # JSONL을 한 번 읽으면서 전체/필터링 결과를 함께 저장
+        # (파이프라인은 필터링 결과를 크롤링 중에 이미 기록했으므로, 이어서 실행한 경우가 아니면 전체 결과만)
+        with default_metrics.time('save', 'jsonl_export'):
+            if pipeline_filtered is not None and not sink.checkpoint:
+                total, _ = export_from_jsonl(sink.path)
+                filtered = pipeline_filtered
+            else:
+                total, filtered = export_from_jsonl(sink.path, company_filter.matches)
+        default_metrics.increment('announcements', total, result='evaluated')
+        default_metrics.increment('announcements', len(filtered), result='matched')
+        print(f"필터링 결과: 전체 {total}개 중 {len(filtered)}개의 공고가 조건에 맞습니다.")
+        if filtered:
+            print_filtered_preview(filtered)
+        return
+    
     filtered = filter_announcements(announcements, company_filter)
     
     print(f"필터링 결과: {len(filtered)}개의 공고가 조건에 맞습니다.")
@@ -467,17 +681,7 @@ def main():
         save_to_csv(filtered, 'kstartup_filtered.csv')
         
         # 결과 미리보기
-        print("\n" + "=" * 70)
-        print("조건에 맞는 공고 목록:")
-        print("=" * 70)
-        for i, ann in enumerate(filtered, 1):
-            print(f"\n{i}. {ann.get('title', '제목 없음')}")
-            print(f"   지원분야: {ann.get('support_field', 'N/A')}")
-            print(f"   업력: {ann.get('business_years', 'N/A')}")
-            print(f"   대상: {ann.get('target', 'N/A')}")
-            print(f"   지역: {ann.get('region', 'N/A')}")
-            print(f"   접수기간: {ann.get('application_period', 'N/A')}")
-            print(f"   URL: {ann.get('url', 'N/A')}")
+        print_filtered_preview(filtered)
         
         # 전체 데이터도 저장 (필터링 전)
         save_to_json(announcements, 'kstartup_all.json')
@@ -492,6 +696,25 @@ def main():
             print("전체 공고 데이터는 kstartup_all.json, kstartup_all.csv에 저장되었습니다.")
 
 
+def main():
+    """메인 함수"""
+    args = parse_args()
+    
+    print("=" * 70)
+    print("K-Startup 사업 공고 크롤링 및 필터링")
+    print("=" * 70)
+    
+    company_filter = build_company_filter(args)
+    
+    if args.offline:
+        run_offline(args, company_filter)
+    else:
+        run_crawl(args, company_filter)
+    
+    default_metrics.print_summary()
+    default_metrics.write(args.metrics_prefix)
+
+
 if __name__ == '__main__':
     main()
 
@@ -0,0 +1,130 @@
+"""배경 요청 JSON 수집(목록 응답 신뢰 규칙, 상세 필드 확인) 테스트"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from kstartup_capture import (
+    ResponseCapture,
+    find_announcements,
+    has_detail_fields,
+    matches_list_query,
+    to_record,
+)
+from kstartup_crawl import links_from_records
+
+
+LIST_URL = 'https://www.k-startup.go.kr/web/contents/bizpbancList.json'
+
+
+class FakeRequest:
+    def __init__(self, url, post_data=None, resource_type='xhr'):
+        self.url = url
+        self.post_data = post_data
+        self.resource_type = resource_type
+
+
+class FakeResponse:
+    def __init__(self, page, request, payload, content_type='application/json;charset=UTF-8'):
+        self.request = request
+        self.url = request.url
+        self.headers = {'content-type': content_type}
+        self.frame = SimpleNamespace(page=page)
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+def api_item(pbanc_sn, detail=False):
+    item = {'pbancSn': pbanc_sn, 'bizPbancNm': f'공고 {pbanc_sn}', 'pbancNtrpNm': '창업진흥원',
+            'pbancRcptBgngDt': '20261101', 'pbancRcptEndDt': '20261120'}
+    if detail:
+        item.update({'pbancCtnt': '<p>사업화 자금 지원</p>', 'aplyTrgtCtnt': '창업기업', 'bizEnyy': '7년미만'})
+    return item
+
+
+def test_to_record_maps_api_fields():
+    record = to_record(api_item('170001', detail=True))
+    assert record.pbanc_sn == '170001'
+    assert record.title == '공고 170001'
+    assert record.organization == '창업진흥원'
+    assert record.application_period == '2026-11-01 ~ 2026-11-20'
+    assert record.content == '사업화 자금 지원'
+    assert has_detail_fields(record)
+
+
+def test_list_only_fields_do_not_skip_detail_visit():
+    record = to_record(api_item('170001'))
+    assert not has_detail_fields(record)
+
+    links = links_from_records([record, to_record(api_item('170002', detail=True))])
+    assert [link['pbanc_sn'] for link in links] == ['170001', '170002']
+    assert 'detail' not in links[0]
+    assert links[1]['detail'].pbanc_sn == '170002'
+
+    capture = ResponseCapture()
+    url = 'https://www.k-startup.go.kr/web/contents/bizpbanc-ongoing.do?schM=view&pbancSn=170001'
+    assert capture.detail_record([record], url) is None
+    assert capture.captured['detail'] == 0
+
+
+def test_find_announcements_in_nested_payload():
+    payload = {'result': {'list': [api_item('1'), api_item('2'), {'etc': 1}], 'total': 2}}
+    assert [item['pbancSn'] for item in find_announcements(payload)] == ['1', '2']
+
+
+@pytest.mark.parametrize('request_, expected', [
+    (FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC010'), True),
+    (FakeRequest(f'{LIST_URL}?page=3&pbancClssCd=PBC010'), False),
+    (FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC020'), False),
+    # 분류 코드를 확인할 수 없는 요청은 믿지 않음
+    (FakeRequest(f'{LIST_URL}?page=2'), False),
+    (FakeRequest(LIST_URL, post_data='pageIndex=2&pbanc_clss_cd=PBC010'), True),
+    (FakeRequest(LIST_URL, post_data=json.dumps({'currentPage': 2, 'pbancClssCd': 'PBC010'})), True),
+    (FakeRequest(LIST_URL, post_data=json.dumps({'currentPage': 1, 'pbancClssCd': 'PBC010'})), False),
+])
+def test_matches_list_query(request_, expected):
+    assert matches_list_query(request_, 2, 'PBC010') is expected
+
+
+def test_take_list_rejects_wrong_page_and_category():
+    page = object()
+    capture = ResponseCapture()
+    responses = [
+        FakeResponse(page, FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC010'), [api_item('1'), api_item('2')]),
+        FakeResponse(page, FakeRequest(f'{LIST_URL}?page=1&pbancClssCd=PBC010'), [api_item('9')]),
+        FakeResponse(page, FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC020'), [api_item('8')]),
+        # JSON이 아니거나 문서 요청이면 잡지 않음
+        FakeResponse(page, FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC010'), [api_item('7')], 'text/html'),
+        FakeResponse(page, FakeRequest(f'{LIST_URL}?page=2&pbancClssCd=PBC010', resource_type='document'),
+                     [api_item('6')]),
+    ]
+    for response in responses:
+        capture._on_response(response)
+
+    matched, other = capture.take_list(page, 2, 'PBC010')
+    assert [r.pbanc_sn for r in matched] == ['1', '2']
+    assert [r.pbanc_sn for r in other] == ['9', '8']
+    assert [r.pbanc_sn for r in capture.list_records(matched)] == ['1', '2']
+    assert capture.captured['list'] == 1
+    assert capture.take_list(page, 2, 'PBC010') == ([], [])
+    assert capture.list_records([]) is None
+
+
+def test_confirm_list_requires_same_announcements_as_dom():
+    capture = ResponseCapture()
+    widget = [to_record(api_item(sn, detail=True)) for sn in ('3', '1', '2')]
+    links = [{'pbanc_sn': sn} for sn in ('1', '2', '3')]
+
+    # 인기/최근 공고 위젯처럼 일부만 겹치면 버림
+    assert capture.confirm_list(widget[:2], links) is None
+    assert capture.confirm_list(widget + [to_record(api_item('4'))], links) is None
+    assert capture.confirm_list(widget, links + [{'pbanc_sn': None}]) is None
+    assert capture.confirm_list(widget, []) is None
+    assert capture.captured['list'] == 0
+
+    # 같은 공고들이면 DOM 순서대로 사용
+    assert [r.pbanc_sn for r in capture.confirm_list(widget, links)] == ['1', '2', '3']
+    assert capture.captured['list'] == 1
@@ -0,0 +1,91 @@
+"""목록 페이지 범위(ListPager)와 분류 코드 사이 중복 확인 테스트"""
+
+from kstartup_crawl import AUTO_MAX_PAGES, ListPager, link_key, mark_duplicates
+
+
+def links(*pbanc_sns):
+    return [{'pbanc_sn': sn, 'url': f'https://example.com/{sn}'} for sn in pbanc_sns]
+
+
+def crawl(pager, site_pages, page_counts=None):
+    """pager가 고른 페이지를 읽는 순서 (site_pages: 페이지 번호 -> 공고 목록)"""
+    visited = []
+    for page_num in pager.pages():
+        visited.append(page_num)
+        page_count = (page_counts or {}).get(page_num)
+        pager.update(page_num, site_pages.get(page_num, []), page_count)
+    return visited
+
+
+def test_known_page_count_stops_at_last_page():
+    pager = ListPager()
+    site = {n: links(str(n)) for n in range(1, 6)}
+    assert crawl(pager, site, {n: 5 for n in range(1, 6)}) == [1, 2, 3, 4, 5]
+    assert pager.exhausted
+    assert pager.last_page == 5
+    assert pager.label(3) == '3/5'
+
+
+def test_pager_blocks_extend_range():
+    # '마지막' 링크 없이 10페이지 단위로 번호를 보여 주는 페이저: 1~9페이지에서는 10,
+    # 10페이지에서는 '다음' 링크의 11, 11페이지부터는 13이 마지막으로 보임
+    pager = ListPager()
+    site = {n: links(str(n)) for n in range(1, 14)}
+    counts = {n: (10 if n < 10 else 11 if n == 10 else 13) for n in range(1, 14)}
+    assert crawl(pager, site, counts) == list(range(1, 14))
+    assert pager.last_page == 13
+
+
+def test_end_page_caps_page_count():
+    pager = ListPager(start_page=2, end_page=4)
+    site = {n: links(str(n)) for n in range(1, 20)}
+    assert crawl(pager, site, {n: 19 for n in range(1, 20)}) == [2, 3, 4]
+    assert pager.last_page == 4
+    assert not pager.exhausted
+
+
+def test_unknown_page_count_stops_at_empty_page():
+    pager = ListPager()
+    assert pager.last_page == AUTO_MAX_PAGES
+    assert pager.label(3) == '3'
+    site = {n: links(str(n)) for n in range(1, 4)}
+    assert crawl(pager, site) == [1, 2, 3, 4]
+    assert pager.exhausted
+    assert pager.page_count is None
+
+
+def test_unknown_page_count_respects_end_page():
+    pager = ListPager(end_page=2)
+    site = {n: links(str(n)) for n in range(1, 10)}
+    assert crawl(pager, site) == [1, 2]
+    assert pager.label(1) == '1/2'
+
+
+def test_page_count_never_shrinks():
+    pager = ListPager()
+    pager.update(1, links('1'), 12)
+    pager.update(2, links('2'), None)
+    pager.update(3, links('3'), 10)
+    assert pager.page_count == 12
+    assert not pager.exhausted
+
+
+def test_mark_duplicates_across_categories():
+    seen = set()
+    first = links('1', '2', '3')
+    assert mark_duplicates(first, seen) == set()
+
+    # 두 번째 분류 코드에 함께 올라온 공고는 순번만 표시 (목록 순서와 체크포인트 위치는 유지)
+    second = links('4', '2', '5', '1')
+    assert mark_duplicates(second, seen) == {1, 3}
+    assert seen == {'1', '2', '3', '4', '5'}
+
+    # 같은 페이지 안에서 반복된 공고도 한 번만
+    assert mark_duplicates(links('6', '6'), seen) == {1}
+
+
+def test_link_key_falls_back_to_url():
+    assert link_key({'pbanc_sn': '1', 'url': 'u'}) == '1'
+    assert link_key({'pbanc_sn': None, 'url': 'u'}) == 'u'
+    seen = set()
+    assert mark_duplicates([{'url': 'u'}, {'pbanc_sn': None, 'url': 'u'}], seen) == {1}
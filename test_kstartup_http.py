@@ -0,0 +1,71 @@
+"""HTTP 상세 페이지 수집을 가상 사이트(kstartup_fixture_server.py)로 확인하는 테스트"""
+
+import pytest
+
+from kstartup_fixture_server import LIST_PATH, SYNTHETIC_FIRST_SN, SyntheticSite, start_synthetic_server
+from kstartup_http import HttpClient, HttpStatusError, fetch_detail_http, fetch_details_http
+
+
+@pytest.fixture
+def site():
+    return SyntheticSite(count=30, per_page=10)
+
+
+@pytest.fixture
+def base_url(site):
+    server = start_synthetic_server(site)
+    yield f'http://127.0.0.1:{server.server_address[1]}'
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client():
+    client = HttpClient(max_connections=2, timeout=5.0)
+    yield client
+    client.close()
+
+
+def detail_url(base_url, index):
+    return f'{base_url}{LIST_PATH}?schM=view&pbancSn={SYNTHETIC_FIRST_SN + index}'
+
+
+def test_get_text_reuses_connection(base_url, client):
+    first = client.get_text(f'{base_url}{LIST_PATH}?page=1')
+    second = client.get_text(f'{base_url}{LIST_PATH}?page=2')
+    assert f'pbancSn={SYNTHETIC_FIRST_SN}&amp;' in first
+    assert f'pbancSn={SYNTHETIC_FIRST_SN + 10}&amp;' in second
+    (pool,) = client._pools.values()
+    assert pool.qsize() == 1
+
+
+def test_get_text_raises_on_missing_page(base_url, client):
+    with pytest.raises(HttpStatusError) as excinfo:
+        client.get_text(f'{base_url}/missing')
+    assert excinfo.value.status == 404
+
+
+def test_fetch_detail_http_matches_site(site, base_url, client):
+    url = detail_url(base_url, 3)
+    record = fetch_detail_http(client, url)
+    expected = site.announcement(3)
+
+    assert record is not None
+    assert record.url == url
+    for field in ('title', 'support_field', 'age_range', 'target', 'business_years', 'region',
+                  'application_period', 'organization', 'contact'):
+        assert getattr(record, field) == expected[field], field
+    # 본문은 브라우저 추출과 같이 앞 500자까지만
+    assert record.content == expected['content'][:500].strip()
+
+
+def test_fetch_detail_http_returns_none_for_fallback(base_url, client):
+    assert fetch_detail_http(client, detail_url(base_url, 999)) is None
+
+
+def test_fetch_details_http_keeps_order(site, base_url, client):
+    indexes = [5, 0, 29, 999, 12]
+    records = fetch_details_http(client, [detail_url(base_url, i) for i in indexes], max_workers=4)
+    assert [r.title if r else None for r in records] == [
+        site.announcement(i)['title'] if i < site.count else None for i in indexes
+    ]
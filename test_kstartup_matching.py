@@ -0,0 +1,95 @@
+"""CompanyFilter 키워드/업력 판정과 ProfileMatcher 테스트"""
+
+import math
+
+import pytest
+
+from kstartup_fixture_server import SyntheticSite
+from kstartup_matching import ANY_YEARS, KeywordAutomaton, ProfileMatcher, parse_years_range
+from scrape_kstartup_filtered import CompanyFilter
+
+
+@pytest.mark.parametrize('text, expected', [
+    (None, None),
+    ('', None),
+    ('해당없음', None),
+    ('전체', ANY_YEARS),
+    ('1년미만,3년미만,전체', ANY_YEARS),
+    ('3년미만', (0.0, 3.0)),
+    ('3년 이하', (0.0, 4.0)),
+    ('7년이상', (7.0, math.inf)),
+    ('3년 초과', (4.0, math.inf)),
+    ('5년', (5.0, 6.0)),
+    ('3-7년', (3.0, 8.0)),
+    ('3년~7년', (3.0, 8.0)),
+    ('1년미만,3년미만,7년미만', (0.0, 7.0)),
+    ('3년미만,7년이상', (0.0, math.inf)),
+])
+def test_parse_years_range(text, expected):
+    assert parse_years_range(text) == expected
+
+
+def test_keyword_automaton_finds_overlapping_keywords():
+    automaton = KeywordAutomaton(['헬스', '헬스케어', 'AI', '케어'])
+    assert automaton.find_keywords('디지털 헬스케어 ai 플랫폼') == ['헬스', '헬스케어', 'AI', '케어']
+    assert automaton.find_keywords('핀테크') == []
+
+
+def test_company_filter_years_and_keywords():
+    company_filter = CompanyFilter(support_fields=['헬스케어', 'AI'], business_years='5-7년')
+    strict = CompanyFilter(support_fields=['헬스케어', 'AI'], business_years='5-7년', require_keywords=True)
+    announcements = [
+        {'title': 'AI 헬스케어 실증', 'business_years': '7년미만'},
+        {'title': '제조 혁신', 'business_years': '전체'},
+        {'title': 'AI 스타트업', 'business_years': '3년미만'},
+        {'title': '업력 미기재 헬스케어', 'business_years': ''},
+    ]
+
+    results = company_filter.filter_many(announcements)
+    assert [r.matched for r in results] == [True, True, False, True]
+    assert results[0].keywords == ['헬스케어', 'AI']
+    assert results[2].reasons[-1] == '업력 조건 불일치: 3년미만'
+    assert [r.matched for r in strict.filter_many(announcements)] == [True, False, False, True]
+    assert company_filter.evaluate(announcements[0]) == results[0]
+
+
+PROFILES = {
+    'healthcare': CompanyFilter(support_fields=['헬스케어', '바이오', 'AI'], business_years='5-7년'),
+    'healthcare_strict': CompanyFilter(support_fields=['헬스케어', '바이오'], business_years='5-7년',
+                                       require_keywords=True),
+    'ai_any_years': CompanyFilter(support_fields=['ai', '인공지능'], require_keywords=True),
+    'early': CompanyFilter(business_years='1년'),
+    'late': CompanyFilter(business_years='10년 이상'),
+    'everything': CompanyFilter(),
+    'fintech_strict': CompanyFilter(support_fields=['핀테크', '블록체인'], business_years='3년 이하',
+                                    require_keywords=True),
+}
+
+EDGE_ANNOUNCEMENTS = [
+    {'title': 'AI 바이오 융합 지원', 'business_years': '3-7년'},
+    {'title': '업력 조건이 없는 공고', 'business_years': ''},
+    {'title': '숫자 없는 업력', 'business_years': '예비창업자'},
+    {'title': '블록체인 핀테크', 'content': '인공지능', 'business_years': '3년 초과'},
+    {'title': '장기 기업', 'business_years': '60년 이상'},
+    {'title': '', 'target': '헬스케어 기업', 'business_years': '7년미만'},
+]
+
+
+def test_profile_matcher_matches_filter_many():
+    site = SyntheticSite(count=300, seed=7)
+    announcements = [site.announcement(index) for index in range(site.count)] + EDGE_ANNOUNCEMENTS
+
+    matched = ProfileMatcher(PROFILES).match(announcements)
+
+    for name, company_filter in PROFILES.items():
+        expected = [
+            (ann, result)
+            for ann, result in zip(announcements, company_filter.filter_many(announcements))
+            if result.matched
+        ]
+        assert matched[name] == expected, name
+
+
+def test_optional_profiles():
+    matcher = ProfileMatcher(PROFILES)
+    assert matcher.optional_profiles == ['healthcare', 'early', 'late', 'everything']
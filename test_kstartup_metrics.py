@@ -0,0 +1,51 @@
+"""단계별 계측(고정 크기 표본, 히스토그램 버킷, Prometheus 출력) 테스트"""
+
+import pytest
+
+from kstartup_metrics import BUCKETS, DurationSeries, Metrics, percentiles
+
+
+def test_percentiles_nearest_rank():
+    assert percentiles([]) == {'count': 0}
+    stats = percentiles([float(v) for v in range(1, 101)])
+    assert stats == {'count': 100, 'p50': 50.0, 'p90': 90.0, 'p99': 99.0, 'max': 100.0}
+
+
+def test_series_memory_is_bounded():
+    series = DurationSeries(size=100)
+    for i in range(10000):
+        series.add(i / 1000)
+    assert len(series.samples) == 100
+    assert series.count == 10000
+    assert series.total == pytest.approx(sum(i / 1000 for i in range(10000)))
+    assert series.max == pytest.approx(9.999)
+    # 버킷은 표본이 아니라 모든 관측값으로 셈
+    assert series.buckets == [sum(1 for i in range(10000) if i / 1000 <= bound) for bound in BUCKETS]
+
+
+def test_summary_uses_exact_totals():
+    metrics = Metrics()
+    for i in range(5000):
+        metrics.observe('navigate', 'detail', 0.2 if i % 10 else 2.0)
+    stats = metrics.summary()['stages']['navigate']['detail']
+    assert stats['count'] == 5000
+    assert stats['max'] == 2000.0
+    assert stats['total_ms'] == pytest.approx(4500 * 200.0 + 500 * 2000.0)
+    assert stats['p50'] == 200.0
+
+
+def test_prometheus_histogram():
+    metrics = Metrics()
+    for seconds in (0.005, 0.3, 0.3, 40.0):
+        metrics.observe('wait', 'list', seconds)
+    metrics.increment('pages', page_type='list', result='ok')
+    text = metrics.to_prometheus()
+
+    labels = 'page_type="list",stage="wait"'
+    assert f'kstartup_stage_duration_seconds_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'kstartup_stage_duration_seconds_bucket{{{labels},le="0.5"}} 3' in text
+    assert f'kstartup_stage_duration_seconds_bucket{{{labels},le="30.0"}} 3' in text
+    assert f'kstartup_stage_duration_seconds_bucket{{{labels},le="+Inf"}} 4' in text
+    assert f'kstartup_stage_duration_seconds_count{{{labels}}} 4' in text
+    assert f'kstartup_stage_duration_seconds_sum{{{labels}}} 40.605000' in text
+    assert 'kstartup_pages_total{page_type="list",result="ok"} 1' in text
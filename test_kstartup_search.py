@@ -0,0 +1,75 @@
+"""한국어 n-gram 토큰화와 BM25 검색 색인 테스트"""
+
+import pytest
+
+from kstartup_search import SearchIndex, tokenize
+
+
+def test_tokenize_korean_ngrams():
+    assert tokenize('헬스케어') == ['헬스', '스케', '케어', '헬스케', '스케어']
+    assert tokenize('AI 임상') == ['ai', '임상']
+    assert tokenize('창업, 3년') == ['창업', '3년']
+
+
+def test_tokenize_normalizes_and_keeps_single_characters():
+    # NFKC 정규화 (전각 영문/숫자)와 소문자 변환
+    assert tokenize('ＡＩ') == ['ai']
+    assert tokenize('및 의') == ['및', '의']
+    assert tokenize('') == []
+    assert tokenize(None) == []
+
+
+def announcement(pbanc_sn, title, content='', **fields):
+    record = {'pbanc_sn': pbanc_sn, 'title': title, 'content': content,
+              'url': f'https://example.com/{pbanc_sn}'}
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex(':memory:')
+    index.add_many([
+        announcement('1', '헬스케어 스타트업 임상 지원', '디지털 헬스케어 기업의 임상 시험을 지원합니다.'),
+        announcement('2', '제조 혁신 바우처', '제조 기업의 공정 개선을 지원합니다. 헬스케어 기기 제조 포함.'),
+        announcement('3', '핀테크 창업 지원', '금융 서비스 스타트업을 지원합니다.'),
+        announcement('4', '글로벌 진출 지원', '해외 진출 기업을 지원합니다.', support_field='헬스케어'),
+    ])
+    yield index
+    index.close()
+
+
+def test_bm25_ranking_order(index):
+    results = index.search('헬스케어 임상')
+    # 제목(가중치 2)과 본문에 두 단어가 모두 있는 공고가 먼저
+    assert [r['pbanc_sn'] for r in results] == ['1', '4', '2']
+    assert results[0]['title'] == '헬스케어 스타트업 임상 지원'
+    assert results[0]['score'] > results[1]['score'] > results[2]['score']
+
+
+def test_rare_terms_outweigh_common_terms(index):
+    # "지원"은 모든 공고에 있어 idf가 낮고, "핀테크"가 순위를 정함
+    assert index.search('지원 핀테크')[0]['pbanc_sn'] == '3'
+    assert index.search('없는단어') == []
+    assert [r['pbanc_sn'] for r in index.search('헬스케어', limit=1)] == ['1']
+
+
+def test_incremental_updates(index):
+    assert index.doc_count == 4
+    stats = index.add_many([
+        announcement('1', '헬스케어 스타트업 임상 지원', '디지털 헬스케어 기업의 임상 시험을 지원합니다.'),
+        announcement('3', '핀테크 블록체인 창업 지원', '금융 서비스 스타트업을 지원합니다.'),
+        announcement('5', '블록체인 실증 사업'),
+        announcement('6', '오류 공고', error='timeout'),
+    ])
+    assert stats == {'added': 1, 'updated': 1, 'skipped': 1}
+    assert index.doc_count == 5
+    assert {r['pbanc_sn'] for r in index.search('블록체인')} == {'3', '5'}
+
+
+def test_empty_index_returns_nothing():
+    index = SearchIndex(':memory:')
+    try:
+        assert index.search('헬스케어') == []
+    finally:
+        index.close()
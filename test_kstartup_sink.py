@@ -0,0 +1,123 @@
+"""JsonlSink 이어서 기록하기와 체크포인트 테스트"""
+
+import json
+
+from kstartup_sink import JsonlSink, _repair_tail, iter_jsonl
+
+
+def record(pbanc_sn):
+    return {'pbanc_sn': pbanc_sn, 'title': f'공고 {pbanc_sn}'}
+
+
+def test_repair_tail_truncates_partial_line(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    path.write_bytes(b'{"a": 1}\n{"b": 2}\n{"c": ')
+    _repair_tail(str(path))
+    assert path.read_bytes() == b'{"a": 1}\n{"b": 2}\n'
+
+
+def test_repair_tail_keeps_complete_file(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    path.write_bytes(b'{"a": 1}\n')
+    _repair_tail(str(path))
+    assert path.read_bytes() == b'{"a": 1}\n'
+
+
+def test_repair_tail_without_newline_empties_file(tmp_path):
+    path = tmp_path / 'out.jsonl'
+    path.write_bytes(b'{"a": ' + b'x' * 10000)
+    _repair_tail(str(path))
+    assert path.read_bytes() == b''
+
+
+def test_resume_after_crash(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    sink = JsonlSink(path, fsync_every=2)
+    sink.write(record('1'), page_num=1, index=0)
+    sink.write(record('2'), page_num=1, index=1)
+    sink.write(record('3'), page_num=2, index=0)
+    sink.close(completed=False)
+    # 마지막 줄을 쓰다가 죽은 것처럼 만듦
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('{"pbanc_sn": "4", "ti')
+
+    sink = JsonlSink(path, resume=True)
+    assert sink.resume_page(1) == 2
+    assert sink.should_skip(2, 0)
+    assert not sink.should_skip(2, 1)
+    sink.write(record('4'), page_num=2, index=1)
+    sink.close()
+
+    assert [r['pbanc_sn'] for r in iter_jsonl(path)] == ['1', '2', '3', '4']
+
+
+def test_resume_drops_records_after_checkpoint(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    sink = JsonlSink(path, fsync_every=2)
+    sink.write(record('1'), page_num=1, index=0)
+    sink.write(record('2'), page_num=1, index=1)
+    # 다음 체크포인트를 남기기 전에 죽었지만 줄은 이미 파일에 들어간 경우
+    sink.write(record('3'), page_num=2, index=0)
+    sink._file.close()
+    assert len(list(iter_jsonl(path))) == 3
+
+    sink = JsonlSink(path, resume=True)
+    assert [r['pbanc_sn'] for r in iter_jsonl(path)] == ['1', '2']
+    assert sink.resume_page(1) == 1
+    assert not sink.should_skip(2, 0)
+    sink.write(record('3'), page_num=2, index=0)
+    sink.close()
+
+    assert [r['pbanc_sn'] for r in iter_jsonl(path)] == ['1', '2', '3']
+
+
+def test_completed_run_starts_over(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    sink = JsonlSink(path)
+    sink.write(record('1'), page_num=1, index=0)
+    sink.close()
+    with open(path + '.checkpoint.json', encoding='utf-8') as f:
+        assert json.load(f) == {'completed': True, 'written': 1}
+
+    sink = JsonlSink(path, resume=True)
+    assert sink.checkpoint is None
+    assert not sink.should_skip(1, 0)
+    sink.close()
+    assert list(iter_jsonl(path)) == []
+
+
+def test_checkpoint_ordering(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    sink = JsonlSink(path)
+    sink.write(record('1'), page_num=3, index=4, category=1)
+    sink.close(completed=False)
+
+    sink = JsonlSink(path, resume=True)
+    try:
+        assert sink.skips_category(0)
+        assert not sink.skips_category(1)
+        assert sink.resume_page(1, category=1) == 3
+        assert sink.resume_page(1, category=2) == 1
+        # (분류 코드 순번, 페이지, 인덱스) 순서로 비교
+        assert sink.should_skip(99, 99, category=0)
+        assert sink.should_skip(2, 99, category=1)
+        assert sink.should_skip(3, 4, category=1)
+        assert not sink.should_skip(3, 5, category=1)
+        assert not sink.should_skip(4, 0, category=1)
+        assert not sink.should_skip(1, 0, category=2)
+    finally:
+        sink.close()
+
+
+def test_recorded_keys_after_resume(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    sink = JsonlSink(path)
+    sink.write(record('1'), page_num=1, index=0)
+    sink.write({'url': 'https://example.com/2'}, page_num=1, index=1)
+    sink.close(completed=False)
+
+    sink = JsonlSink(path, resume=True)
+    try:
+        assert sink.recorded_keys() == {'1', 'https://example.com/2'}
+    finally:
+        sink.close()
@@ -0,0 +1,142 @@
+"""CrawlState 증분 크롤링과 변경 감지(new / modified / disappeared) 테스트"""
+
+import pytest
+
+from kstartup_sink import iter_jsonl
+from kstartup_state import ChangeLog, CrawlState
+
+
+CATEGORIES = ['PBC010']
+
+
+def announcement(pbanc_sn, title=None):
+    return {'pbanc_sn': pbanc_sn, 'title': title or f'공고 {pbanc_sn}', 'content': '본문'}
+
+
+def links(*pbanc_sns):
+    return [{'pbanc_sn': pbanc_sn, 'url': f'https://example.com/{pbanc_sn}'} for pbanc_sn in pbanc_sns]
+
+
+def test_fresh_records_are_reused(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state = CrawlState(path)
+    assert state.update('1', announcement('1'))
+    state.save()
+
+    state = CrawlState(path)
+    assert state.is_fresh('1')
+    assert not state.is_known('2')
+    assert [r.title if r else None for r in state.prefill(links('1', '2'))] == ['공고 1', None]
+    assert state.reused == 1
+
+
+def test_stale_records_are_scraped_again(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state = CrawlState(path)
+    state.update('1', announcement('1'))
+    state.save()
+
+    state = CrawlState(path, max_age_hours=0)
+    assert state.is_known('1')
+    assert state.prefill(links('1')) == [None]
+
+
+def test_all_known_stops_paging_only_when_reusing(tmp_path):
+    path = str(tmp_path / 'state.json')
+    state = CrawlState(path)
+    state.update('1', announcement('1'))
+    state.update('2', announcement('2'))
+
+    assert state.all_known(links('1', '2'))
+    assert not state.all_known(links('1', '3'))
+    assert not state.all_known([])
+    state.reuse = False
+    assert not state.all_known(links('1', '2'))
+
+
+def test_unchanged_record_is_not_updated(tmp_path):
+    state = CrawlState(str(tmp_path / 'state.json'))
+    assert state.update('1', announcement('1'))
+    assert not state.update('1', announcement('1'))
+    assert state.update('1', announcement('1', '공고 1 (마감 연장)'))
+    assert not state.update(None, announcement('x'))
+    assert not state.update('2', {'error': 'timeout'})
+
+
+def test_unreadable_state_file_starts_over(tmp_path):
+    path = tmp_path / 'state.json'
+    path.write_text('{', encoding='utf-8')
+    assert CrawlState(str(path)).entries == {}
+
+
+@pytest.fixture
+def run(tmp_path):
+    """같은 상태 파일로 크롤링을 한 번 실행하고 변경분을 돌려주는 함수"""
+    state_path = str(tmp_path / 'state.json')
+    delta_path = str(tmp_path / 'delta.jsonl')
+
+    def run_once(records, complete=True, list_end=True):
+        change_log = ChangeLog(delta_path)
+        state = CrawlState(state_path, change_log=change_log)
+        state.mark_listed(links(*records))
+        reused = [r for r in state.prefill(links(*records)) if r is not None]
+        for pbanc_sn, record in records.items():
+            if not state.reusable(pbanc_sn):
+                state.update(pbanc_sn, record)
+        if list_end:
+            state.mark_list_end(CATEGORIES[0])
+        disappeared = state.finish_run(complete, CATEGORIES)
+        state.save()
+        change_log.close()
+        changes = {(entry['change'], entry['pbanc_sn']): entry for entry in iter_jsonl(delta_path)}
+        return changes, disappeared, reused
+
+    return run_once
+
+
+def test_first_run_records_new(run):
+    changes, disappeared, reused = run({'1': announcement('1'), '2': announcement('2')})
+    assert set(changes) == {('new', '1'), ('new', '2')}
+    assert disappeared == []
+    assert reused == []
+
+
+def test_modified_and_disappeared(tmp_path, run):
+    run({'1': announcement('1'), '2': announcement('2')})
+
+    change_log = ChangeLog(str(tmp_path / 'delta.jsonl'))
+    state = CrawlState(str(tmp_path / 'state.json'), max_age_hours=0, change_log=change_log)
+    state.mark_listed(links('1', '3'))
+    assert state.update('1', announcement('1', '공고 1 (마감 연장)'))
+    assert state.update('3', announcement('3'))
+    state.mark_list_end(CATEGORIES[0])
+    assert state.finish_run(True, CATEGORIES) == ['2']
+    change_log.close()
+
+    changes = {(entry['change'], entry['pbanc_sn']): entry for entry in iter_jsonl(change_log.path)}
+    assert set(changes) == {('modified', '1'), ('new', '3'), ('disappeared', '2')}
+    assert changes[('modified', '1')]['changes'] == {'title': {'old': '공고 1', 'new': '공고 1 (마감 연장)'}}
+    assert changes[('disappeared', '2')]['title'] == '공고 2'
+
+
+def test_whitespace_only_change_is_not_modified(tmp_path, run):
+    run({'1': announcement('1')})
+    state = CrawlState(str(tmp_path / 'state.json'), max_age_hours=0)
+    assert not state.update('1', announcement('1', '  공고   1 '))
+
+
+@pytest.mark.parametrize('complete, list_end', [(False, True), (True, False)])
+def test_partial_run_does_not_mark_disappeared(run, complete, list_end):
+    run({'1': announcement('1'), '2': announcement('2')})
+    changes, disappeared, _ = run({'1': announcement('1')}, complete=complete, list_end=list_end)
+    assert disappeared == []
+    assert changes == {}
+
+
+def test_reappeared_record_is_scraped_again(run):
+    run({'1': announcement('1'), '2': announcement('2')})
+    run({'1': announcement('1')})
+    changes, disappeared, reused = run({'1': announcement('1'), '2': announcement('2')})
+    assert set(changes) == {('new', '2')}
+    assert [r.title for r in reused] == ['공고 1']
+    assert disappeared == []
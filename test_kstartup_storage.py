@@ -0,0 +1,105 @@
+"""SQLite 저장소(upsert, 변경 이력, 마감일) 테스트"""
+
+from datetime import date
+
+import pytest
+
+from kstartup_storage import AnnouncementStore, parse_deadline, save_to_sqlite
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2025-12-26 ~ 2026-01-15 18:00', '2026-01-15'),
+    ('2026-11-04 ~ 2026-12-04 18:00', '2026-12-04'),
+    ('2026.03.02 ~ 2026.3.9', '2026-03-09'),
+    ('2026년 4월 1일 ~ 2026년 4월 30일', '2026-04-30'),
+    ('2026-02-30 ~ 2026-02-31', None),
+    ('상시 모집', None),
+    ('', None),
+    (None, None),
+])
+def test_parse_deadline(text, expected):
+    assert parse_deadline(text) == expected
+
+
+def announcement(pbanc_sn, **fields):
+    record = {
+        'pbanc_sn': pbanc_sn,
+        'title': f'공고 {pbanc_sn}',
+        'support_field': '사업화',
+        'region': '서울',
+        'application_period': '2026-11-01 ~ 2026-11-20 18:00',
+        'url': f'https://example.com/{pbanc_sn}',
+        'scraped_at': '2026-11-01 09:00:00',
+    }
+    record.update(fields)
+    return record
+
+
+@pytest.fixture
+def store():
+    store = AnnouncementStore(':memory:')
+    yield store
+    store.close()
+
+
+def test_upsert_is_idempotent(store):
+    records = [announcement('1'), announcement('2')]
+    assert store.upsert_many(records) == {'inserted': 2, 'updated': 0, 'unchanged': 0}
+    # 수집 시각만 바뀐 경우는 변경으로 보지 않음
+    records = [announcement('1', scraped_at='2026-11-02 09:00:00'), announcement('2')]
+    assert store.upsert_many(records) == {'inserted': 0, 'updated': 0, 'unchanged': 2}
+
+    rows = list(store.iter_all())
+    assert [row['pbanc_sn'] for row in rows] == ['1', '2']
+    assert rows[0]['scraped_at'] == '2026-11-02 09:00:00'
+    assert rows[0]['deadline'] == '2026-11-20'
+    assert store.history('1') == []
+
+
+def test_upsert_skips_failed_and_keyless_records(store):
+    stats = store.upsert_many([announcement('1', error='timeout'), {'title': 'pbanc_sn 없음'}])
+    assert stats == {'inserted': 0, 'updated': 0, 'unchanged': 0}
+    assert list(store.iter_all()) == []
+
+
+def test_changed_fields_are_recorded_in_history(store):
+    store.upsert_many([announcement('1')])
+    first_seen = next(store.iter_all())['first_seen_at']
+
+    stats = store.upsert_many([announcement('1', title='공고 1 (연장)',
+                                             application_period='2026-11-01 ~ 2026-11-30 18:00')])
+    assert stats == {'inserted': 0, 'updated': 1, 'unchanged': 0}
+
+    history = store.history('1')
+    assert [(h['field'], h['old_value'], h['new_value']) for h in history] == [
+        ('title', '공고 1', '공고 1 (연장)'),
+        ('application_period', '2026-11-01 ~ 2026-11-20 18:00', '2026-11-01 ~ 2026-11-30 18:00'),
+    ]
+    row = next(store.iter_all())
+    assert row['deadline'] == '2026-11-30'
+    assert row['first_seen_at'] == first_seen
+
+
+def test_closing_within(store):
+    store.upsert_many([
+        announcement('1', title='헬스케어 실증', application_period='2026-11-01 ~ 2026-11-05'),
+        announcement('2', title='제조 혁신', application_period='2026-11-01 ~ 2026-11-06'),
+        announcement('3', title='헬스케어 해외 진출', application_period='2026-11-01 ~ 2026-12-31'),
+        announcement('4', title='상시 헬스케어', application_period='상시'),
+    ])
+    today = date(2026, 11, 1)
+    assert [r['pbanc_sn'] for r in store.closing_within(7, today=today)] == ['1', '2']
+    assert [r['pbanc_sn'] for r in store.closing_within(7, keyword='헬스케어', today=today)] == ['1']
+
+
+def test_save_to_sqlite_batches(tmp_path, capsys):
+    path = str(tmp_path / 'kstartup.db')
+    save_to_sqlite((announcement(str(n)) for n in range(7)), path, batch_size=3)
+    save_to_sqlite([announcement('0', title='바뀐 제목')], path)
+    assert '신규 0개, 변경 1개' in capsys.readouterr().out
+
+    store = AnnouncementStore(path)
+    try:
+        assert len(list(store.iter_all())) == 7
+    finally:
+        store.close()
@@ -0,0 +1,209 @@
+"""요청 스케줄러(토큰 버킷, AIMD, 서킷 브레이커, 재시도) 테스트"""
+
+import asyncio
+
+import pytest
+
+import kstartup_throttle
+from kstartup_throttle import (
+    AimdLimiter,
+    CircuitBreaker,
+    PolitenessScheduler,
+    ServerBusyError,
+    TokenBucket,
+    is_retryable,
+)
+
+
+class FakeClock:
+    """time.monotonic/time.sleep 대신 쓰는 시계 (sleep은 시간만 앞으로 돌림)"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(kstartup_throttle, 'time', clock)
+    return clock
+
+
+def test_token_bucket_burst_and_refill(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    # 1초 뒤 토큰 2개가 채워져 예약해 둔 두 개를 갚음
+    clock.now += 1.0
+    assert bucket.reserve() == pytest.approx(0.5)
+
+    # 오래 쉬어도 burst 이상은 쌓이지 않음
+    clock.now += 100.0
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_token_bucket_acquire_sleeps(clock):
+    bucket = TokenBucket(rate=4.0, burst=1)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.25)]
+
+
+def test_token_bucket_without_rate_never_waits(clock):
+    bucket = TokenBucket(rate=0)
+    assert all(bucket.reserve() == 0.0 for _ in range(100))
+
+
+def test_aimd_additive_increase():
+    limiter = AimdLimiter(initial=2, maximum=4)
+    limiter.on_success(0.1)
+    assert limiter.limit == pytest.approx(2.5)
+    limiter.on_success(0.1)
+    assert limiter.limit == pytest.approx(2.9)
+    for _ in range(100):
+        limiter.on_success(0.1)
+    assert limiter.limit == 4
+
+
+def test_aimd_no_increase_when_latency_degrades():
+    limiter = AimdLimiter(initial=2, maximum=16)
+    for _ in range(5):
+        limiter.on_success(0.1)
+    limit = limiter.limit
+    for _ in range(5):
+        limiter.on_success(5.0)
+    assert limiter.limit == limit
+
+
+def test_aimd_multiplicative_decrease():
+    limiter = AimdLimiter(initial=8, minimum=1, maximum=16)
+    limiter.on_overload()
+    assert limiter.limit == 4
+    limiter.on_overload()
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 1
+
+
+def test_breaker_opens_and_half_opens(clock, capsys):
+    breaker = CircuitBreaker(threshold=2, cooldown=10.0)
+    breaker.record_failure()
+    assert breaker.wait_time() == 0.0
+    breaker.record_failure()
+    assert breaker.wait_time() == pytest.approx(10.0)
+    assert breaker.trips == 1
+
+    clock.now += 4.0
+    assert breaker.wait_time() == pytest.approx(6.0)
+
+    # 멈춘 시간이 지나면 시험 요청을 보낼 수 있고(half-open), 실패하면 다시 멈춤
+    clock.now += 6.0
+    assert breaker.wait_time() == 0.0
+    breaker.record_failure()
+    assert breaker.wait_time() == pytest.approx(10.0)
+    assert breaker.trips == 2
+
+    clock.now += 10.0
+    breaker.record_success()
+    assert breaker.failures == 0
+    assert breaker.wait_time() == 0.0
+
+
+def test_is_retryable():
+    assert is_retryable(ServerBusyError(503, 'u'))
+    assert is_retryable(ServerBusyError(429, 'u'))
+    assert not is_retryable(ServerBusyError(404, 'u'))
+    assert is_retryable(TimeoutError())
+    assert is_retryable(ConnectionResetError())
+    assert is_retryable(Exception('net::ERR_CONNECTION_RESET at https://example.com'))
+    assert not is_retryable(ValueError('bad'))
+
+
+def scheduler(**kwargs):
+    settings = dict(rate=0, initial_concurrency=8, max_retries=2, backoff_base=1.0,
+                    breaker_threshold=100)
+    settings.update(kwargs)
+    return PolitenessScheduler(**settings)
+
+
+def test_call_retries_then_gives_up(clock, monkeypatch, capsys):
+    monkeypatch.setattr(kstartup_throttle.random, 'uniform', lambda low, high: high)
+    calls = []
+
+    def busy():
+        calls.append(clock.now)
+        raise ServerBusyError(503, 'https://example.com')
+
+    s = scheduler()
+    with pytest.raises(ServerBusyError):
+        s.call(busy)
+    assert len(calls) == 3
+    # 지수 백오프 (full jitter의 상한)
+    assert clock.sleeps == [1.0, 2.0]
+    assert (s.requests, s.retries, s.failures) == (3, 2, 1)
+    assert s.limiter.limit == 1
+    assert s.limiter.in_flight == 0
+
+
+def test_call_does_not_retry_permanent_errors(clock):
+    calls = []
+
+    def broken():
+        calls.append(1)
+        raise ValueError('bad')
+
+    s = scheduler()
+    with pytest.raises(ValueError):
+        s.call(broken)
+    assert len(calls) == 1
+    assert clock.sleeps == []
+    assert s.limiter.limit == 8
+
+
+def test_call_recovers_after_transient_error(clock, capsys):
+    results = iter([TimeoutError('slow'), 'ok'])
+
+    def flaky():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    s = scheduler(backoff_base=0)
+    assert s.call(flaky) == 'ok'
+    assert (s.requests, s.retries, s.failures) == (2, 1, 0)
+    assert s.breaker.failures == 0
+
+
+def test_call_waits_for_open_breaker(clock, capsys):
+    s = scheduler(breaker_threshold=1, breaker_cooldown=30.0, max_retries=0)
+    with pytest.raises(ServerBusyError):
+        s.call(lambda: (_ for _ in ()).throw(ServerBusyError(503, 'u')))
+    assert s.call(lambda: 'ok') == 'ok'
+    assert clock.sleeps == [pytest.approx(30.0)]
+
+
+def test_call_async_gives_up_after_max_retries(capsys):
+    calls = []
+
+    async def busy():
+        calls.append(1)
+        raise ServerBusyError(502, 'https://example.com')
+
+    s = scheduler(backoff_base=0)
+    with pytest.raises(ServerBusyError):
+        asyncio.run(s.call_async(busy))
+    assert len(calls) == 3
+    assert s.failures == 1
+    assert s.limiter.in_flight == 0